@@ -0,0 +1,69 @@
+"""
+Memory used by a cached collection, as parsed dicts and as a CompactCollection.
+
+    python benchmarks/measure_memory.py                  # 100k requests
+    python benchmarks/measure_memory.py --items 10000
+
+The collection is generated by synthetic.make_collection and parsed from its
+JSON text, as the server does, and the allocations of each form are measured
+with tracemalloc. The round trip of the compact form is checked as well.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from synthetic import make_collection  # noqa: E402
+from code2postman_mcp.utils.compact import CompactCollection  # noqa: E402
+
+DEFAULT_ITEMS = 100_000
+
+
+def allocated(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """Return the built value and the bytes still allocated once it is built"""
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size
+
+
+def timed(function: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    value = function()
+    return value, (time.perf_counter() - start) * 1000
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=DEFAULT_ITEMS, help="Requests of the synthetic collection")
+    args = parser.parse_args(argv)
+
+    text = json.dumps(make_collection(args.items))
+    _, parsed_bytes = allocated(lambda: json.loads(text))
+    # The parsed dicts are dropped once compacted, so only the compact form is left allocated
+    _, compact_bytes = allocated(lambda: CompactCollection(json.loads(text)))
+
+    data, parse_ms = timed(lambda: json.loads(text))
+    compact, compact_ms = timed(lambda: CompactCollection(data))
+    expanded, expand_ms = timed(compact.to_dict)
+    if json.dumps(expanded) != text:
+        print("Round trip changed the collection")
+        return 1
+
+    print(f"{args.items} requests, {len(text) / 2**20:.1f} MB of JSON")
+    print(f"  parsed dicts        {parsed_bytes / 2**20:8.1f} MB  (parse {parse_ms:8.1f} ms)")
+    print(f"  CompactCollection   {compact_bytes / 2**20:8.1f} MB  (compact {compact_ms:8.1f} ms, "
+          f"expand {expand_ms:8.1f} ms)")
+    print(f"  ratio               {compact_bytes / parsed_bytes:8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
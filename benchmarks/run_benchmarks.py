@@ -0,0 +1,295 @@
+"""
+Benchmarks of the file and collection tools on synthetic data.
+
+    python benchmarks/run_benchmarks.py                       # full run
+    python benchmarks/run_benchmarks.py --quick               # smallest sizes only
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<commit>.json
+
+Results are written as JSON to benchmarks/results/<commit>.json (or --output)
+so that runs on different commits can be compared with --compare. Tool logs
+are limited to errors while timing (see --log-level), and collection tools are timed with a
+warm collection cache unless the case name says "cold". File and tree cases drop the response
+cache before every run, except the one named "cached response".
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from synthetic import make_repo, make_request, write_collection  # noqa: E402
+import code2postman_mcp.tools.handle_files as handle_files  # noqa: E402
+import code2postman_mcp.tools.handle_postman as handle_postman  # noqa: E402
+from code2postman_mcp.utils.collection_cache import collection_cache  # noqa: E402
+from code2postman_mcp.utils.files import count_lines  # noqa: E402
+from code2postman_mcp.utils.log import configure_logging  # noqa: E402
+from code2postman_mcp.utils.response_cache import response_cache  # noqa: E402
+
+REPO_SIZES = (1_000, 10_000, 100_000)
+COLLECTION_SIZES = (100, 10_000, 100_000)
+DEFAULT_REPEAT = 5
+# Ratio to the baseline above which a case is reported as a regression
+REGRESSION_THRESHOLD = 1.25
+# Lines of the file read by the read_file and count_lines cases
+READ_FILE_LINES = 10_000
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+INITIALIZE = {
+    "jsonrpc": "2.0", "id": 1, "method": "initialize",
+    "params": {"protocolVersion": "2025-03-26", "capabilities": {}, "clientInfo": {"name": "bench", "version": "0"}},
+}
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+@dataclass
+class Case:
+    name: str
+    size: int
+    run: Callable[[], Awaitable]
+    # Untimed preparation before every run
+    setup: Optional[Callable[[], Awaitable]] = None
+
+
+def _sync(function, *args) -> Callable[[], Awaitable]:
+    async def run():
+        return function(*args)
+    return run
+
+
+async def time_case(case: Case, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        if case.setup is not None:
+            await case.setup()
+        start = time.perf_counter()
+        await case.run()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "name": case.name,
+        "size": case.size,
+        "repeat": repeat,
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def startup_cases(workdir: str) -> List[Case]:
+    """Spawn the stdio server and wait for its answer to `initialize`, as MCP clients do"""
+    environment = {**os.environ, "PYTHONPATH": SRC_DIR, "CODE2POSTMAN_LOG_LEVEL": "ERROR", "CODE2POSTMAN_LOG_FILE": ""}
+
+    async def handshake():
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", "from code2postman_mcp.server import main; main()",
+            cwd=workdir, env=environment, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        process.stdin.write((json.dumps(INITIALIZE) + "\n").encode())
+        await process.stdin.drain()
+        await process.stdout.readline()
+        process.stdin.close()
+        await process.wait()
+
+    return [Case("server startup (initialize handshake)", 1, handshake)]
+
+
+def file_cases(workdir: str, size: int) -> List[Case]:
+    root = make_repo(os.path.join(workdir, f"repo_{size}"), size)
+    sources = [os.path.join(directory, name) for directory, _, names in os.walk(root)
+               for name in names if name.endswith(".py")]
+
+    def count_all():
+        return sum(count_lines(path) for path in sources)
+
+    async def uncached():
+        response_cache.invalidate_path(root)
+
+    return [
+        Case("get_tree_directory_from_path", size,
+             lambda: handle_files.get_tree_directory_from_path(root, "python"), setup=uncached),
+        Case("get_tree_directory_from_path (auto)", size,
+             lambda: handle_files.get_tree_directory_from_path(root, "auto"), setup=uncached),
+        Case("get_tree_directory_from_path (cached response)", size,
+             lambda: handle_files.get_tree_directory_from_path(root, "python")),
+        Case("count_lines (every file)", size, _sync(count_all)),
+    ]
+
+
+def single_file_cases(workdir: str) -> List[Case]:
+    path = os.path.join(workdir, "large_file.py")
+    with open(path, "w") as file:
+        for index in range(READ_FILE_LINES):
+            file.write(f"value_{index} = {index}  # line {index}\n")
+    async def uncached():
+        response_cache.invalidate_path(path)
+
+    return [
+        Case("read_file", READ_FILE_LINES, lambda: handle_files.read_file(path), setup=uncached),
+        Case("read_file (100 line range)", READ_FILE_LINES, lambda: handle_files.read_file(path, 5_000, 5_099),
+             setup=uncached),
+        Case("count_lines", READ_FILE_LINES, _sync(count_lines, path)),
+    ]
+
+
+def collection_cases(workdir: str, size: int) -> List[Case]:
+    path = write_collection(os.path.join(workdir, f"collection_{size}.json"), size)
+    hp = handle_postman
+    counter = iter(range(10**9))
+
+    async def cold():
+        collection_cache.invalidate(path)
+        response_cache.invalidate_path(path)
+
+    async def add_deletable():
+        await hp.add_postman_collection_item(path, make_request(-1) | {"name": "Deletable"})
+
+    async def record_change():
+        await hp.update_postman_collection_variable(path, "token", f"t{next(counter)}")
+
+    async def record_and_undo():
+        await record_change()
+        await hp.undo_postman_change(path)
+
+    return [
+        Case("read_postman_collection (cold)", size, lambda: hp.read_postman_collection(path), setup=cold),
+        Case("read_postman_collection", size, lambda: hp.read_postman_collection(path)),
+        Case("validate_postman_collection", size, lambda: hp.validate_postman_collection(path)),
+        Case("add_postman_collection_item", size,
+             lambda: hp.add_postman_collection_item(path, make_request(next(counter)))),
+        Case("add_postman_collection_info", size,
+             lambda: hp.add_postman_collection_info(path, {"description": f"revision {next(counter)}"})),
+        Case("add_postman_collection_event", size, lambda: hp.add_postman_collection_event(path, {
+            "listen": "test", "script": {"type": "text/javascript", "exec": ["pm.response.to.have.status(200)"]},
+        })),
+        Case("add_postman_collection_variable", size,
+             lambda: hp.add_postman_collection_variable(path, {"key": f"var_{next(counter)}", "value": "x"})),
+        Case("add_postman_collection_auth", size, lambda: hp.add_postman_collection_auth(path, {
+            "type": "bearer", "bearer": [{"key": "token", "value": "{{token}}", "type": "string"}],
+        })),
+        Case("add_postman_collection_protocol_behavior", size,
+             lambda: hp.add_postman_collection_protocol_behavior(path, {"followRedirects": True})),
+        Case("update_postman_collection_variable", size, record_change),
+        Case("set_postman_collection_variables (100 keys)", size, lambda: hp.set_postman_collection_variables(
+            path, {f"bulk_{index}": str(next(counter)) for index in range(100)})),
+        Case("add_postman_collection_folder", size,
+             lambda: hp.add_postman_collection_folder(path, f"New folder {next(counter)}")),
+        Case("add_item_to_folder", size,
+             lambda: hp.add_item_to_folder(path, "Folder 0", make_request(next(counter)))),
+        Case("delete_postman_collection_item", size,
+             lambda: hp.delete_postman_collection_item(path, "Deletable"), setup=add_deletable),
+        Case("undo_postman_change", size, lambda: hp.undo_postman_change(path), setup=record_change),
+        Case("redo_postman_change", size, lambda: hp.redo_postman_change(path), setup=record_and_undo),
+    ]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: List[dict], baseline_path: str, threshold: float) -> List[str]:
+    """Print the median ratio of every case to the baseline; returns the regressions"""
+    with open(baseline_path, "r") as file:
+        baseline = {(entry["name"], entry["size"]): entry for entry in json.load(file)["results"]}
+    regressions = []
+    print(f"\nComparison with {baseline_path} (median, regression above x{threshold}):")
+    for entry in results:
+        previous = baseline.get((entry["name"], entry["size"]))
+        if previous is None or previous["median_ms"] <= 0:
+            continue
+        ratio = entry["median_ms"] / previous["median_ms"]
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions.append(f"{entry['name']} [{entry['size']}]")
+        print(f"  {entry['name']:<48} {entry['size']:>8}  {previous['median_ms']:>10.3f} -> "
+              f"{entry['median_ms']:>10.3f} ms  x{ratio:.2f}{flag}")
+    return regressions
+
+
+async def run(repo_sizes: List[int], collection_sizes: List[int], repeat: int, only: Optional[str]) -> List[dict]:
+    results = []
+    with tempfile.TemporaryDirectory(prefix="code2postman-bench-") as workdir:
+        groups = [lambda: startup_cases(workdir), lambda: single_file_cases(workdir)]
+        groups += [lambda size=size: file_cases(workdir, size) for size in repo_sizes]
+        groups += [lambda size=size: collection_cases(workdir, size) for size in collection_sizes]
+        for build in groups:
+            for case in build():
+                if only and only not in case.name:
+                    continue
+                result = await time_case(case, repeat)
+                results.append(result)
+                print(f"{case.name:<50} {case.size:>8}  median {result['median_ms']:>10.3f} ms  "
+                      f"min {result['min_ms']:>10.3f} ms", flush=True)
+    return results
+
+
+def parse_sizes(text: str) -> List[int]:
+    return [int(size) for size in text.split(",") if size.strip()]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repo-sizes", type=parse_sizes, default=list(REPO_SIZES),
+                        help="Comma-separated numbers of files of the synthetic repositories")
+    parser.add_argument("--collection-sizes", type=parse_sizes, default=list(COLLECTION_SIZES),
+                        help="Comma-separated numbers of requests of the synthetic collections")
+    parser.add_argument("--quick", action="store_true", help="Only run the smallest sizes")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per case")
+    parser.add_argument("--only", help="Only run the cases whose name contains this text")
+    parser.add_argument("--output", help="Path of the JSON results (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Median ratio above which a case counts as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on regressions")
+    parser.add_argument("--log-level", default="ERROR",
+                        help="Level of the server logging setup while timing, to measure the logging overhead")
+    parser.add_argument("--log-file", default="", help="File sink of the server logging setup (default: none)")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.repo_sizes = args.repo_sizes[:1]
+        args.collection_sizes = args.collection_sizes[:1]
+
+    configure_logging(args.log_level, args.log_file)
+
+    commit = git_commit()
+    results = asyncio.run(run(args.repo_sizes, args.collection_sizes, args.repeat, args.only))
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "log_level": args.log_level,
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            if args.fail_on_regression:
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
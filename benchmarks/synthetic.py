@@ -0,0 +1,77 @@
+"""
+Generators of synthetic source trees and Postman collections for the benchmarks.
+Everything is derived from the requested size, so runs are reproducible.
+"""
+import os
+import json
+from typing import List
+
+# Files per directory in generated trees
+FILES_PER_DIR = 50
+# Requests per folder in generated collections
+ITEMS_PER_FOLDER = 100
+
+_PY_SOURCE = '''from fastapi import APIRouter
+
+router = APIRouter()
+
+
+@router.get("/resource_{index}")
+async def get_resource_{index}(resource_id: int):
+    """Return resource {index}"""
+    return {{"id": resource_id, "index": {index}}}
+'''
+
+
+def make_repo(root: str, file_count: int) -> str:
+    """
+    Write a Python project of `file_count` source files under `root`, nested
+    two levels deep, with a few excluded directories mixed in. Returns `root`.
+    """
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, "pyproject.toml"), "w") as file:
+        file.write('[project]\nname = "synthetic"\n')
+    for index in range(file_count):
+        package = index // (FILES_PER_DIR * FILES_PER_DIR)
+        module = (index // FILES_PER_DIR) % FILES_PER_DIR
+        directory = os.path.join(root, f"pkg_{package}", f"mod_{module}")
+        if index % FILES_PER_DIR == 0:
+            os.makedirs(directory, exist_ok=True)
+            os.makedirs(os.path.join(directory, "__pycache__"), exist_ok=True)
+        with open(os.path.join(directory, f"file_{index}.py"), "w") as file:
+            file.write(_PY_SOURCE.format(index=index))
+    return root
+
+
+def make_request(index: int) -> dict:
+    request = {
+        "method": "POST" if index % 3 == 0 else "GET",
+        "header": [{"key": "Authorization", "value": "Bearer {{token}}"}],
+        "url": f"{{{{base_url}}}}/resources/{index}",
+    }
+    if index % 3 == 0:
+        request["body"] = {"mode": "raw", "raw": json.dumps({"index": index, "name": f"resource {index}"})}
+    return {"name": f"Request {index}", "request": request}
+
+
+def make_collection(item_count: int) -> dict:
+    """A collection of `item_count` requests grouped in top-level folders"""
+    folders: List[dict] = []
+    for index in range(item_count):
+        if index % ITEMS_PER_FOLDER == 0:
+            folders.append({"name": f"Folder {index // ITEMS_PER_FOLDER}", "item": []})
+        folders[-1]["item"].append(make_request(index))
+    return {
+        "info": {
+            "name": f"Synthetic {item_count}",
+            "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json",
+        },
+        "variable": [{"key": "base_url", "value": "https://api.example.com"}, {"key": "token", "value": "t"}],
+        "item": folders,
+    }
+
+
+def write_collection(file_path: str, item_count: int) -> str:
+    with open(file_path, "w") as file:
+        json.dump(make_collection(item_count), file, indent=2)
+    return file_path
@@ -176,4 +176,40 @@ EXCLUDED_ITEMS = {
             r"^.*\.tar\.gz$",
         ],
     },
-} 
\ No newline at end of file
+}
+
+# Value of the `language` parameter that detects the languages of a project
+AUTO_LANGUAGE = "auto"
+
+# Marker files (regex patterns) and source file extensions used to detect
+# the languages present in a project
+LANGUAGE_MARKERS = {
+    Language.PYTHON: {
+        "files": [r"^pyproject\.toml$", r"^setup\.py$", r"^setup\.cfg$", r"^requirements.*\.txt$", r"^Pipfile$"],
+        "extensions": [".py", ".pyi"],
+    },
+    Language.JAVASCRIPT: {
+        "files": [r"^package\.json$", r"^tsconfig\.json$"],
+        "extensions": [".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx"],
+    },
+    Language.JAVA: {
+        "files": [r"^pom\.xml$", r"^build\.gradle(\.kts)?$", r"^settings\.gradle(\.kts)?$"],
+        "extensions": [".java", ".kt", ".scala"],
+    },
+    Language.GOLANG: {
+        "files": [r"^go\.mod$"],
+        "extensions": [".go"],
+    },
+    Language.RUBY: {
+        "files": [r"^Gemfile$", r"^.*\.gemspec$", r"^Rakefile$"],
+        "extensions": [".rb"],
+    },
+    Language.RUST: {
+        "files": [r"^Cargo\.toml$"],
+        "extensions": [".rs"],
+    },
+    Language.CSHARP: {
+        "files": [r"^.*\.csproj$", r"^.*\.sln$"],
+        "extensions": [".cs"],
+    },
+}
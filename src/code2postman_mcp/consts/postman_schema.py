@@ -0,0 +1,326 @@
+# Postman Collection Format v2.1.0, bundled so that validation works offline.
+# Source: https://schema.getpostman.com/json/collection/v2.1.0/collection.json
+# Only the structural keywords are kept (titles, long descriptions and examples
+# are dropped); every collection valid against the original schema is valid
+# against this one.
+POSTMAN_SCHEMA_URL = "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
+
+_STRING = {"type": "string"}
+_BOOLEAN = {"type": "boolean"}
+
+POSTMAN_COLLECTION_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "$id": POSTMAN_SCHEMA_URL,
+    "type": "object",
+    "properties": {
+        "info": {"$ref": "#/definitions/info"},
+        "item": {"type": "array", "items": {"$ref": "#/definitions/items"}},
+        "event": {"$ref": "#/definitions/event-list"},
+        "variable": {"$ref": "#/definitions/variable-list"},
+        "auth": {"oneOf": [{"type": "null"}, {"$ref": "#/definitions/auth"}]},
+        "protocolProfileBehavior": {"$ref": "#/definitions/protocolProfileBehavior"},
+    },
+    "required": ["info", "item"],
+    "definitions": {
+        "auth-attribute": {
+            "type": "object",
+            "properties": {"key": _STRING, "value": {}, "type": _STRING},
+            "required": ["key"],
+        },
+        "auth": {
+            "type": "object",
+            "properties": {
+                "type": {
+                    "type": "string",
+                    "enum": ["apikey", "awsv4", "basic", "bearer", "digest", "edgegrid", "hawk",
+                             "noauth", "oauth1", "oauth2", "ntlm", "jwt", "asap", "akamai"],
+                },
+                "noauth": {},
+                **{
+                    scheme: {"type": "array", "items": {"$ref": "#/definitions/auth-attribute"}}
+                    for scheme in ("apikey", "awsv4", "basic", "bearer", "digest", "edgegrid", "hawk",
+                                   "ntlm", "oauth1", "oauth2", "jwt", "asap", "akamai")
+                },
+            },
+            "required": ["type"],
+        },
+        "certificate": {
+            "type": "object",
+            "properties": {
+                "name": _STRING,
+                "matches": {"type": "array", "items": _STRING},
+                "key": {"type": "object", "properties": {"src": {}}},
+                "cert": {"type": "object", "properties": {"src": {}}},
+                "passphrase": _STRING,
+            },
+        },
+        "cookie": {
+            "type": "object",
+            "properties": {
+                "domain": _STRING,
+                "expires": {"type": ["string", "number", "null"]},
+                "maxAge": _STRING,
+                "hostOnly": _BOOLEAN,
+                "httpOnly": _BOOLEAN,
+                "name": _STRING,
+                "path": _STRING,
+                "secure": _BOOLEAN,
+                "session": _BOOLEAN,
+                "value": _STRING,
+                "extensions": {"type": "array"},
+            },
+            "required": ["domain", "path"],
+        },
+        "description": {
+            "oneOf": [
+                {
+                    "type": "object",
+                    "properties": {"content": _STRING, "type": _STRING, "version": {}},
+                },
+                {"type": "string"},
+                {"type": "null"},
+            ],
+        },
+        "event": {
+            "type": "object",
+            "properties": {
+                "id": _STRING,
+                "listen": _STRING,
+                "script": {"$ref": "#/definitions/script"},
+                "disabled": _BOOLEAN,
+            },
+            "required": ["listen"],
+        },
+        "event-list": {"type": "array", "items": {"$ref": "#/definitions/event"}},
+        "header": {
+            "type": "object",
+            "properties": {
+                "key": _STRING,
+                "value": _STRING,
+                "disabled": _BOOLEAN,
+                "description": {"$ref": "#/definitions/description"},
+            },
+            "required": ["key", "value"],
+        },
+        "header-list": {"type": "array", "items": {"$ref": "#/definitions/header"}},
+        "info": {
+            "type": "object",
+            "properties": {
+                "name": _STRING,
+                "_postman_id": _STRING,
+                "description": {"$ref": "#/definitions/description"},
+                "version": {"$ref": "#/definitions/version"},
+                "schema": _STRING,
+            },
+            "required": ["name", "schema"],
+        },
+        "items": {"anyOf": [{"$ref": "#/definitions/item"}, {"$ref": "#/definitions/item-group"}]},
+        "item": {
+            "type": "object",
+            "properties": {
+                "id": _STRING,
+                "name": _STRING,
+                "description": {"$ref": "#/definitions/description"},
+                "variable": {"$ref": "#/definitions/variable-list"},
+                "event": {"$ref": "#/definitions/event-list"},
+                "request": {"$ref": "#/definitions/request"},
+                "response": {"type": "array", "items": {"$ref": "#/definitions/response"}},
+                "protocolProfileBehavior": {"$ref": "#/definitions/protocolProfileBehavior"},
+            },
+            "required": ["request"],
+        },
+        "item-group": {
+            "type": "object",
+            "properties": {
+                "name": _STRING,
+                "description": {"$ref": "#/definitions/description"},
+                "variable": {"$ref": "#/definitions/variable-list"},
+                "item": {"type": "array", "items": {"$ref": "#/definitions/items"}},
+                "event": {"$ref": "#/definitions/event-list"},
+                "auth": {"oneOf": [{"type": "null"}, {"$ref": "#/definitions/auth"}]},
+                "protocolProfileBehavior": {"$ref": "#/definitions/protocolProfileBehavior"},
+            },
+            "required": ["item"],
+        },
+        "protocolProfileBehavior": {"type": "object"},
+        "proxy-config": {
+            "type": "object",
+            "properties": {
+                "match": _STRING,
+                "host": _STRING,
+                "port": {"type": "integer", "minimum": 0},
+                "tunnel": _BOOLEAN,
+                "disabled": _BOOLEAN,
+            },
+        },
+        "query-param": {
+            "type": "object",
+            "properties": {
+                "key": {"type": ["string", "null"]},
+                "value": {"type": ["string", "null"]},
+                "disabled": _BOOLEAN,
+                "description": {"$ref": "#/definitions/description"},
+            },
+        },
+        "request": {
+            "oneOf": [
+                {
+                    "type": "object",
+                    "properties": {
+                        "url": {"$ref": "#/definitions/url"},
+                        "auth": {"oneOf": [{"type": "null"}, {"$ref": "#/definitions/auth"}]},
+                        "proxy": {"$ref": "#/definitions/proxy-config"},
+                        "certificate": {"$ref": "#/definitions/certificate"},
+                        "method": _STRING,
+                        "description": {"$ref": "#/definitions/description"},
+                        "header": {"oneOf": [{"$ref": "#/definitions/header-list"}, {"type": "string"}]},
+                        "body": {
+                            "oneOf": [
+                                {
+                                    "type": "object",
+                                    "properties": {
+                                        "mode": {
+                                            "type": "string",
+                                            "enum": ["raw", "urlencoded", "formdata", "file", "graphql"],
+                                        },
+                                        "raw": _STRING,
+                                        "graphql": {"type": "object"},
+                                        "urlencoded": {
+                                            "type": "array",
+                                            "items": {
+                                                "type": "object",
+                                                "properties": {
+                                                    "key": _STRING,
+                                                    "value": _STRING,
+                                                    "disabled": _BOOLEAN,
+                                                    "description": {"$ref": "#/definitions/description"},
+                                                },
+                                                "required": ["key"],
+                                            },
+                                        },
+                                        "formdata": {
+                                            "type": "array",
+                                            "items": {
+                                                "type": "object",
+                                                "properties": {
+                                                    "key": _STRING,
+                                                    "value": _STRING,
+                                                    "src": {"type": ["array", "string", "null"]},
+                                                    "disabled": _BOOLEAN,
+                                                    "type": {"type": "string", "enum": ["text", "file"]},
+                                                    "contentType": _STRING,
+                                                    "description": {"$ref": "#/definitions/description"},
+                                                },
+                                                "required": ["key"],
+                                            },
+                                        },
+                                        "file": {
+                                            "type": "object",
+                                            "properties": {"src": {"type": ["string", "null"]}, "content": _STRING},
+                                        },
+                                        "options": {"type": "object"},
+                                        "disabled": _BOOLEAN,
+                                    },
+                                },
+                                {"type": "null"},
+                            ],
+                        },
+                    },
+                },
+                {"type": "string"},
+            ],
+        },
+        "response": {
+            "type": "object",
+            "properties": {
+                "id": _STRING,
+                "originalRequest": {"$ref": "#/definitions/request"},
+                "responseTime": {"type": ["null", "string", "number"]},
+                "timings": {"type": ["object", "null"]},
+                "header": {
+                    "oneOf": [
+                        {"type": "array", "items": {"oneOf": [{"$ref": "#/definitions/header"}, {"type": "string"}]}},
+                        {"type": "string"},
+                        {"type": "null"},
+                    ],
+                },
+                "cookie": {"type": "array", "items": {"$ref": "#/definitions/cookie"}},
+                "body": {"type": ["null", "string"]},
+                "status": _STRING,
+                "code": {"type": "integer"},
+            },
+        },
+        "script": {
+            "type": "object",
+            "properties": {
+                "id": _STRING,
+                "type": _STRING,
+                "exec": {"oneOf": [{"type": "array", "items": _STRING}, {"type": "string"}]},
+                "src": {"$ref": "#/definitions/url"},
+                "name": _STRING,
+            },
+        },
+        "url": {
+            "oneOf": [
+                {
+                    "type": "object",
+                    "properties": {
+                        "raw": _STRING,
+                        "protocol": _STRING,
+                        "host": {"oneOf": [{"type": "string"}, {"type": "array", "items": _STRING}]},
+                        "path": {
+                            "oneOf": [
+                                {"type": "string"},
+                                {
+                                    "type": "array",
+                                    "items": {
+                                        "oneOf": [
+                                            {"type": "string"},
+                                            {"type": "object", "properties": {"type": _STRING, "value": _STRING}},
+                                        ],
+                                    },
+                                },
+                            ],
+                        },
+                        "port": _STRING,
+                        "query": {"type": "array", "items": {"$ref": "#/definitions/query-param"}},
+                        "hash": _STRING,
+                        "variable": {"type": "array", "items": {"$ref": "#/definitions/variable"}},
+                    },
+                },
+                {"type": "string"},
+            ],
+        },
+        "variable": {
+            "type": "object",
+            "properties": {
+                "id": _STRING,
+                "key": _STRING,
+                "value": {},
+                "type": {"type": "string", "enum": ["string", "boolean", "any", "number", "secret", "default"]},
+                "name": _STRING,
+                "description": {"$ref": "#/definitions/description"},
+                "system": _BOOLEAN,
+                "disabled": _BOOLEAN,
+            },
+            "anyOf": [{"required": ["key"]}, {"required": ["id"]}],
+        },
+        "variable-list": {"type": "array", "items": {"$ref": "#/definitions/variable"}},
+        "version": {
+            "oneOf": [
+                {
+                    "type": "object",
+                    "properties": {
+                        "major": {"type": "integer", "minimum": 0},
+                        "minor": {"type": "integer", "minimum": 0},
+                        "patch": {"type": "integer", "minimum": 0},
+                        "identifier": {"type": "string", "maxLength": 10},
+                        "meta": {},
+                    },
+                    "required": ["major", "minor", "patch"],
+                },
+                {"type": "string"},
+            ],
+        },
+    },
+}
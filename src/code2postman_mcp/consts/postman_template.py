@@ -4,6 +4,7 @@ POSTMAN_TEMPLATE = """
         "name": "{project_name}",
         "description": "{project_description}",
         "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
-    }}
+    }},
+    "item": []
 }}
 """
\ No newline at end of file
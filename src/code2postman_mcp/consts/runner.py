@@ -0,0 +1,6 @@
+# Default number of requests in flight at once
+DEFAULT_CONCURRENCY = 10
+# Default number of requests in flight to the same host
+DEFAULT_PER_HOST_LIMIT = 6
+# Default timeout of a request, in seconds
+DEFAULT_TIMEOUT_SECONDS = 30.0
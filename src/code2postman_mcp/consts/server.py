@@ -0,0 +1,10 @@
+# Transports the server can run with
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+DEFAULT_TRANSPORT = "stdio"
+# The HTTP transports only listen on the local machine unless told otherwise
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+
+TRANSPORT_ENV = "CODE2POSTMAN_TRANSPORT"
+HOST_ENV = "CODE2POSTMAN_HOST"
+PORT_ENV = "CODE2POSTMAN_PORT"
@@ -0,0 +1,37 @@
+"""
+Pluggable writers that export a Postman collection to other formats.
+
+Register a new format with `register_exporter(MyExporter)`, where `MyExporter`
+subclasses `Exporter` and sets its `name` and `suffix`.
+"""
+from typing import Dict, List, Type
+from code2postman_mcp.exporters.base import Exporter, RequestParts
+from code2postman_mcp.exporters.curl import CurlExporter
+from code2postman_mcp.exporters.har import HarExporter
+from code2postman_mcp.exporters.http_file import HttpFileExporter
+from code2postman_mcp.exporters.openapi import OpenApiExporter
+
+_EXPORTERS: Dict[str, Type[Exporter]] = {}
+
+
+def register_exporter(exporter: Type[Exporter]) -> None:
+    if not exporter.name:
+        raise ValueError("Exporters must define a name")
+    _EXPORTERS[exporter.name] = exporter
+
+
+def get_exporter(name: str) -> Type[Exporter]:
+    exporter = _EXPORTERS.get(name)
+    if exporter is None:
+        raise ValueError(f"Unknown export format: {name}. Available formats: {available_formats()}")
+    return exporter
+
+
+def available_formats() -> List[str]:
+    return list(_EXPORTERS)
+
+
+for _exporter in (OpenApiExporter, HarExporter, CurlExporter, HttpFileExporter):
+    register_exporter(_exporter)
+
+__all__ = ["Exporter", "RequestParts", "register_exporter", "get_exporter", "available_formats"]
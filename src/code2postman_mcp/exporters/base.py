@@ -0,0 +1,55 @@
+"""
+Base class and shared helpers for the collection exporters.
+"""
+from abc import ABC, abstractmethod
+from typing import IO, Dict, Optional
+from code2postman_mcp.utils.request_parts import (
+    RequestParts,
+    collection_variables,
+    iter_request_items,
+    url_to_string,
+)
+from code2postman_mcp.utils.variables import compile_template
+
+
+def substitute_variables(text: str, variables: Dict[str, str]) -> str:
+    """Replace the {{name}} placeholders whose value is known, leaving the others as they are"""
+    return compile_template(text).render(variables)
+
+
+class Exporter(ABC):
+    """
+    Base class of the collection exporters. An export is a single pass over the
+    requests of the collection: `begin`, `write_request` for each request in
+    document order, then `end`. Output is written to `stream` as it is produced.
+    """
+
+    #: Format name used by the export tool
+    name = ""
+    #: Suffix appended to the collection file stem for the output file
+    suffix = ""
+
+    def __init__(self, stream: IO[str], collection: dict):
+        self.stream = stream
+        self.collection = collection
+        self.variables = collection_variables(collection)
+
+    def begin(self) -> None:
+        pass
+
+    @abstractmethod
+    def write_request(self, request: RequestParts) -> Optional[bool]:
+        """Write one request; return False if the format cannot represent it and it was skipped"""
+
+    def end(self) -> None:
+        pass
+
+    def export(self) -> int:
+        """Run the whole export, returning the number of requests written"""
+        count = 0
+        self.begin()
+        for folders, item in iter_request_items(self.collection.get("item", [])):
+            if self.write_request(RequestParts(folders, item)) is not False:
+                count += 1
+        self.end()
+        return count
@@ -0,0 +1,30 @@
+"""
+Export a collection as a shell script of curl commands.
+"""
+import shlex
+from code2postman_mcp.exporters.base import Exporter, RequestParts, substitute_variables
+
+
+def _comment(text: str) -> str:
+    """A shell comment line; line breaks in the text would end the comment and start a command"""
+    return "# " + text.replace("\r", " ").replace("\n", " ") + "\n"
+
+
+class CurlExporter(Exporter):
+    name = "curl"
+    suffix = ".sh"
+
+    def begin(self) -> None:
+        title = self.collection.get("info", {}).get("name", "")
+        self.stream.write("#!/bin/sh\n" + _comment(str(title)) + "\n")
+
+    def write_request(self, request: RequestParts) -> None:
+        url = substitute_variables(request.url, self.variables)
+        parts = [f"curl -X {shlex.quote(request.method)} {shlex.quote(url)}"]
+        for key, value in request.headers:
+            parts.append(f"-H {shlex.quote(substitute_variables(f'{key}: {value}', self.variables))}")
+        if request.body is not None:
+            parts.append(f"--data-raw {shlex.quote(substitute_variables(request.body, self.variables))}")
+        self.stream.write(_comment(request.title))
+        self.stream.write(" \\\n  ".join(parts))
+        self.stream.write("\n\n")
@@ -0,0 +1,56 @@
+"""
+Export a collection as an HTTP Archive (HAR 1.2) holding one entry per request.
+Entries are serialized and written one at a time.
+"""
+import json
+from urllib.parse import parse_qsl, urlsplit
+from code2postman_mcp.exporters.base import Exporter, RequestParts, substitute_variables
+
+
+class HarExporter(Exporter):
+    name = "har"
+    suffix = ".har"
+
+    def begin(self) -> None:
+        self._first = True
+        self.stream.write('{"log": {"version": "1.2", "creator": {"name": "code2postman-mcp", "version": "0.1.2"}, '
+                          '"entries": [\n')
+
+    def write_request(self, request: RequestParts) -> None:
+        url = substitute_variables(request.url, self.variables)
+        headers = [{"name": key, "value": substitute_variables(value, self.variables)}
+                   for key, value in request.headers]
+        entry = {
+            "startedDateTime": "1970-01-01T00:00:00.000Z",
+            "time": 0,
+            "comment": request.title,
+            "request": {
+                "method": request.method,
+                "url": url,
+                "httpVersion": "HTTP/1.1",
+                "cookies": [],
+                "headers": headers,
+                "queryString": [{"name": k, "value": v}
+                                for k, v in parse_qsl(urlsplit(url).query, keep_blank_values=True)],
+                "headersSize": -1,
+                "bodySize": -1,
+            },
+            "response": {
+                "status": 0, "statusText": "", "httpVersion": "HTTP/1.1", "cookies": [], "headers": [],
+                "content": {"size": 0, "mimeType": ""}, "redirectURL": "", "headersSize": -1, "bodySize": -1,
+            },
+            "cache": {},
+            "timings": {"send": 0, "wait": 0, "receive": 0},
+        }
+        if request.body is not None:
+            entry["request"]["postData"] = {
+                "mimeType": request.content_type or "text/plain",
+                "text": substitute_variables(request.body, self.variables),
+            }
+        if not self._first:
+            self.stream.write(",\n")
+        self._first = False
+        self.stream.write(json.dumps(entry))
+
+    def end(self) -> None:
+        self.stream.write("\n]}}\n")
@@ -0,0 +1,26 @@
+"""
+Export a collection as an `.http` file, as read by the REST clients of VS Code
+and JetBrains IDEs. Both understand the {{name}} placeholders of Postman, so
+collection variables are declared once at the top instead of being substituted.
+"""
+from code2postman_mcp.exporters.base import Exporter, RequestParts
+
+
+class HttpFileExporter(Exporter):
+    name = "http"
+    suffix = ".http"
+
+    def begin(self) -> None:
+        for key, value in self.variables.items():
+            self.stream.write(f"@{key} = {value}\n")
+        if self.variables:
+            self.stream.write("\n")
+
+    def write_request(self, request: RequestParts) -> None:
+        self.stream.write(f"### {request.title}\n")
+        self.stream.write(f"{request.method} {request.url}\n")
+        for key, value in request.headers:
+            self.stream.write(f"{key}: {value}\n")
+        if request.body is not None:
+            self.stream.write(f"\n{request.body}\n")
+        self.stream.write("\n")
@@ -0,0 +1,110 @@
+"""
+Export a collection as an OpenAPI 3 document.
+
+OpenAPI groups operations by path, so this writer keeps the (small) operation
+objects in memory until the end of the walk; request bodies are reduced to a
+single example per operation.
+"""
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from code2postman_mcp.exporters.base import Exporter, RequestParts, substitute_variables
+
+_LEADING_VARIABLE = re.compile(r"^\{\{\s*([^{}]+?)\s*\}\}")
+_PATH_PARAMETER = re.compile(r"^(?::(\w+)|\{\{\s*(\w+)\s*\}\})$")
+_METHODS = {"GET", "PUT", "POST", "DELETE", "OPTIONS", "HEAD", "PATCH", "TRACE"}
+
+
+class OpenApiExporter(Exporter):
+    name = "openapi"
+    suffix = ".openapi.json"
+
+    def begin(self) -> None:
+        self._paths: Dict[str, Dict[str, dict]] = {}
+        self._servers: List[str] = []
+        self._operation_ids: Dict[str, int] = {}
+
+    def _split_url(self, raw: str) -> Tuple[Optional[str], str, str]:
+        """Return (server, path, query) of a request URL"""
+        match = _LEADING_VARIABLE.match(raw)
+        if match:
+            server = substitute_variables(match.group(0), self.variables)
+            rest = raw[match.end():]
+        else:
+            parts = urlsplit(raw if "://" in raw else f"http://{raw}")
+            server = f"{parts.scheme}://{parts.netloc}" if parts.netloc else None
+            rest = raw[raw.index(parts.netloc) + len(parts.netloc):] if parts.netloc else raw
+        path, _, query = rest.partition("?")
+        return server, "/" + path.split("#")[0].lstrip("/"), query
+
+    def _operation_id(self, name: str) -> str:
+        base = re.sub(r"\W+", "_", name).strip("_") or "operation"
+        count = self._operation_ids.get(base, 0) + 1
+        self._operation_ids[base] = count
+        return base if count == 1 else f"{base}_{count}"
+
+    def write_request(self, request: RequestParts) -> bool:
+        if request.method not in _METHODS:
+            return False
+        server, path, query = self._split_url(request.url)
+        if server and server not in self._servers:
+            self._servers.append(server)
+
+        parameters = []
+        segments = []
+        for segment in path.split("/"):
+            match = _PATH_PARAMETER.match(segment)
+            if match:
+                name = match.group(1) or match.group(2)
+                segments.append(f"{{{name}}}")
+                parameters.append({"name": name, "in": "path", "required": True, "schema": {"type": "string"}})
+            else:
+                segments.append(segment)
+        path = "/".join(segments) or "/"
+        for key, value in parse_qsl(query, keep_blank_values=True):
+            parameters.append({"name": key, "in": "query", "schema": {"type": "string"}, "example": value})
+        for key, value in request.headers:
+            if key.lower() not in ("content-type", "accept", "authorization"):
+                parameters.append({"name": key, "in": "header", "schema": {"type": "string"}, "example": value})
+
+        operation = {"operationId": self._operation_id(request.name), "summary": request.name}
+        if request.folders:
+            operation["tags"] = [request.folders[0]]
+        if request.description:
+            operation["description"] = request.description
+        if parameters:
+            operation["parameters"] = parameters
+        if request.body is not None:
+            example = request.body
+            if request.content_type == "application/json":
+                try:
+                    example = json.loads(request.body)
+                except ValueError:
+                    pass
+            operation["requestBody"] = {"content": {request.content_type or "text/plain": {"example": example}}}
+        operation["responses"] = {"default": {"description": "Response"}}
+        operations = self._paths.setdefault(path, {})
+        if request.method.lower() in operations:
+            # OpenAPI holds a single operation per path and method
+            return False
+        operations[request.method.lower()] = operation
+        return True
+
+    def end(self) -> None:
+        info = self.collection.get("info", {})
+        description = info.get("description")
+        document = {
+            "openapi": "3.0.3",
+            "info": {
+                "title": info.get("name", ""),
+                "version": str(info.get("version", "1.0.0")),
+            },
+        }
+        if isinstance(description, str) and description:
+            document["info"]["description"] = description
+        if self._servers:
+            document["servers"] = [{"url": url} for url in self._servers]
+        document["paths"] = self._paths
+        json.dump(document, self.stream, indent=2)
+        self.stream.write("\n")
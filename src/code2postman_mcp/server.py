@@ -1,49 +1,135 @@
+import os
+import argparse
+from typing import List
 from mcp.server.fastmcp import FastMCP
-import code2postman_mcp.tools.handle_postman as handle_postman
-import code2postman_mcp.tools.handle_files as handle_files
+from code2postman_mcp.consts.server import (
+    DEFAULT_HOST, DEFAULT_PORT, DEFAULT_TRANSPORT, HOST_ENV, PORT_ENV, TRANSPORT_ENV, TRANSPORTS,
+)
+from code2postman_mcp.utils.metrics import instrument
+from code2postman_mcp.utils.log import configure_logging
 from loguru import logger
-import sys
-
-# Configure loguru logger
-logger.remove()
-logger.add(sys.stderr, format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>")
-logger.add("logs/code2postman.log", rotation="10 MB", format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}")
 
 mcp = FastMCP("code2postman-mcp")
 
+def _tool(func):
+    """Register a tool, wrapped so that its calls are recorded in the server metrics"""
+    mcp.tool()(instrument(func))
+
 def register_tools():
     """Register all the tools that will be used in the MCP"""
+    # Tool modules are imported here, not when the server module is imported;
+    # their heavy subsystems (exporters, HTTP runner, watchers) load on first use
+    import code2postman_mcp.tools.handle_postman as handle_postman
+    import code2postman_mcp.tools.handle_files as handle_files
+    import code2postman_mcp.tools.handle_environment as handle_environment
+    import code2postman_mcp.tools.handle_export as handle_export
+    import code2postman_mcp.tools.handle_runner as handle_runner
+    import code2postman_mcp.tools.handle_resources as handle_resources
+    import code2postman_mcp.tools.handle_metrics as handle_metrics
     
     logger.info("Registering Postman Collection tools")
     ## Postman Collection
-    mcp.tool()(handle_postman.create_postman_collection)
-    mcp.tool()(handle_postman.add_postman_collection_item)
-    mcp.tool()(handle_postman.read_postman_collection)
-    mcp.tool()(handle_postman.add_postman_collection_info)
-    mcp.tool()(handle_postman.add_postman_collection_event)
-    mcp.tool()(handle_postman.add_postman_collection_variable)
-    mcp.tool()(handle_postman.add_postman_collection_auth)
-    mcp.tool()(handle_postman.add_postman_collection_protocol_behavior)
-    mcp.tool()(handle_postman.delete_postman_collection_item)
-    mcp.tool()(handle_postman.update_postman_collection_variable)
-    mcp.tool()(handle_postman.add_postman_collection_folder)
-    mcp.tool()(handle_postman.add_item_to_folder)
+    _tool(handle_postman.create_postman_collection)
+    _tool(handle_postman.add_postman_collection_item)
+    _tool(handle_postman.read_postman_collection)
+    _tool(handle_postman.get_postman_collection_revision)
+    _tool(handle_postman.read_postman_collection_if_changed)
+    _tool(handle_postman.validate_postman_collection)
+    _tool(handle_postman.add_postman_collection_info)
+    _tool(handle_postman.add_postman_collection_event)
+    _tool(handle_postman.add_postman_collection_variable)
+    _tool(handle_postman.add_postman_collection_auth)
+    _tool(handle_postman.add_postman_collection_protocol_behavior)
+    _tool(handle_postman.delete_postman_collection_item)
+    _tool(handle_postman.update_postman_collection_variable)
+    _tool(handle_postman.set_postman_collection_variables)
+    _tool(handle_postman.add_postman_collection_folder)
+    _tool(handle_postman.add_item_to_folder)
+    _tool(handle_postman.undo_postman_change)
+    _tool(handle_postman.redo_postman_change)
+    _tool(handle_postman.diff_postman_collections)
+    _tool(handle_postman.merge_postman_collections)
+    _tool(handle_postman.shard_postman_collection)
+    _tool(handle_postman.assemble_postman_collection)
+    _tool(handle_postman.store_postman_payloads)
+    
+    logger.info("Registering Postman Environment tools")
+    ## Postman Environment
+    _tool(handle_environment.create_postman_environment)
+    _tool(handle_environment.read_postman_environment)
+    _tool(handle_environment.update_postman_environment_variable)
+    _tool(handle_environment.set_postman_environment_variables)
+    _tool(handle_environment.activate_postman_environment)
+    _tool(handle_environment.get_active_postman_environment)
+    
+    logger.info("Registering Export tools")
+    ## Export
+    _tool(handle_export.export_postman_collection)
+    
+    logger.info("Registering Runner tools")
+    ## Runner
+    _tool(handle_runner.run_postman_collection)
+    _tool(handle_runner.load_test_postman_collection)
+    _tool(handle_runner.preview_postman_request)
     
     logger.info("Registering File handling tools")
     ## Files
-    mcp.tool()(handle_files.get_tree_directory_from_path)
-    mcp.tool()(handle_files.read_file)
+    _tool(handle_files.get_tree_directory_from_path)
+    _tool(handle_files.read_tree_page)
+    _tool(handle_files.read_file)
+    
+    logger.info("Registering Metrics tools")
+    ## Metrics
+    _tool(handle_metrics.get_server_metrics)
+    
+    logger.info("Registering Postman Collection resources")
+    ## Resources
+    handle_resources.register_resources(mcp)
     
     logger.success("All tools registered successfully")
 
-def main():
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """Command line options, defaulting to their environment variables"""
+    parser = argparse.ArgumentParser(prog="code2postman-mcp", description="Run the Code2Postman MCP server")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=os.environ.get(TRANSPORT_ENV, DEFAULT_TRANSPORT),
+                        help=f"stdio for a server per client, sse or streamable-http for one server shared "
+                             f"by many clients (default: {DEFAULT_TRANSPORT}, or {TRANSPORT_ENV})")
+    parser.add_argument("--host", default=os.environ.get(HOST_ENV, DEFAULT_HOST),
+                        help=f"Address the HTTP transports listen on (default: {DEFAULT_HOST}, or {HOST_ENV})")
+    parser.add_argument("--port", type=int, default=os.environ.get(PORT_ENV, str(DEFAULT_PORT)),
+                        help=f"Port the HTTP transports listen on (default: {DEFAULT_PORT}, or {PORT_ENV})")
+    parser.add_argument("--workers", type=int,
+                        help="Threads running the blocking work of the tools, shared by all clients "
+                             "(default: CODE2POSTMAN_IO_WORKERS, or CPU count + 4)")
+    args = parser.parse_args(argv)
+    if args.transport not in TRANSPORTS:
+        parser.error(f"invalid transport {args.transport!r}, choose from {', '.join(TRANSPORTS)}")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    return args
+
+def main(argv: List[str] = None):
     """Run the MCP server"""
+    args = parse_args(argv)
+    # Sinks are set up here rather than on import, so importing the server
+    # (tests, benchmarks, embedding) neither creates log files nor starts the writer thread
+    configure_logging()
+    if args.workers is not None:
+        from code2postman_mcp.utils.executor import IO_WORKERS_ENV
+        # Read when the pool is first used
+        os.environ[IO_WORKERS_ENV] = str(args.workers)
     logger.info("Starting MCP server")
     register_tools()
-    logger.info("Running server with stdio transport")
-    mcp.run(transport="stdio")
+    if args.transport == "stdio":
+        logger.info("Running server with stdio transport")
+    else:
+        # One process serves every client, so they share its caches, indexes and I/O pool
+        mcp.settings.host = args.host
+        mcp.settings.port = args.port
+        path = mcp.settings.sse_path if args.transport == "sse" else mcp.settings.streamable_http_path
+        logger.info(f"Running server with {args.transport} transport on http://{args.host}:{args.port}{path}")
+    mcp.run(transport=args.transport)
     return mcp
 
 if __name__ == "__main__":
-    logger.info("Initializing Code2Postman MCP application")
     main()
\ No newline at end of file
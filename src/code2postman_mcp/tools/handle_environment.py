@@ -0,0 +1,181 @@
+import os
+import uuid
+from code2postman_mcp.tools.handle_postman import validate_dict, validate_string
+from code2postman_mcp.utils.environments import Environment, environment_store
+from code2postman_mcp.utils.executor import locks_paths, run_blocking
+from code2postman_mcp.utils.variables import resolvers
+from loguru import logger
+
+
+def _validate_values(values: dict) -> dict:
+    """Validate a mapping of variable names to string values"""
+    values = validate_dict(values, "values")
+    for key, value in values.items():
+        validate_string(key, "variable key")
+        validate_string(value, f"value of variable '{key}'")
+    return values
+
+
+async def _load_environment(file_path: str) -> Environment:
+    if not os.path.isfile(file_path):
+        logger.error(f"Environment file not found: {file_path}")
+        raise FileNotFoundError(f"{file_path} does not exist")
+    return await run_blocking(environment_store.get, file_path)
+
+
+async def _save_environment(environment: Environment, changes: dict) -> None:
+    """Write the environment and apply the changed enabled values to the resolvers built from it"""
+    old_key = environment.key
+    await run_blocking(environment_store.save, environment)
+    # Disabled variables are not part of the resolvers' environment layer
+    changes = {key: value for key, value in changes.items() if environment.is_enabled(key)}
+    if changes:
+        resolvers.environment_changed(old_key, environment.key, changes)
+
+
+def _summary(environment: Environment) -> dict:
+    return {"file_path": environment.file_path, "name": environment.name, "variables": environment.values()}
+
+
+@locks_paths("file_path")
+async def create_postman_environment(file_path: str, name: str, values: dict = None) -> dict:
+    """
+    Create a Postman environment file. Extension of the file must be .json
+
+    Args:
+        file_path: The path to the environment file to create (string)
+        name: The name of the environment (string)
+        values: Optional initial variables, mapping names to values (dict)
+    Returns:
+        The created Postman environment (dict)
+    """
+    logger.info(f"Creating Postman environment: {name} at {file_path}")
+
+    file_path = validate_string(file_path, "file_path")
+    name = validate_string(name, "name")
+    values = _validate_values(values) if values is not None else {}
+
+    if not file_path.endswith(".json"):
+        logger.error(f"Invalid file extension for {file_path}, must be .json")
+        raise ValueError(f"{file_path} is not a JSON file")
+
+    environment = Environment(file_path, {
+        "id": str(uuid.uuid4()),
+        "name": name,
+        "values": [],
+        "_postman_variable_scope": "environment",
+    })
+    environment.upsert(values)
+    await run_blocking(environment_store.save, environment)
+
+    logger.success(f"Created Postman environment at {file_path}")
+    return environment.data
+
+
+@locks_paths("file_path")
+async def read_postman_environment(file_path: str) -> dict:
+    """
+    Read a Postman environment file
+
+    Args:
+        file_path: The path to the Postman environment file (string)
+    Returns:
+        The Postman environment (dict)
+    """
+    logger.info(f"Reading Postman environment: {file_path}")
+    file_path = validate_string(file_path, "file_path")
+    return (await _load_environment(file_path)).data
+
+
+@locks_paths("file_path")
+async def update_postman_environment_variable(file_path: str, key: str, new_value: str) -> dict:
+    """
+    Update an existing variable of a Postman environment by key
+
+    Args:
+        file_path: The path to the Postman environment file (string)
+        key: The key of the variable to update (string)
+        new_value: The new value for the variable (string)
+    Returns:
+        The updated Postman environment (dict)
+    """
+    logger.info(f"Updating variable '{key}' in environment: {file_path}")
+
+    file_path = validate_string(file_path, "file_path")
+    key = validate_string(key, "key")
+    new_value = validate_string(new_value, "new_value")
+
+    environment = await _load_environment(file_path)
+    if environment.get(key) is None:
+        logger.warning(f"Variable not found: {key}")
+        raise ValueError(f"Variable '{key}' not found in environment")
+
+    environment.upsert({key: new_value})
+    await _save_environment(environment, {key: new_value})
+
+    logger.success(f"Successfully saved environment after updating variable")
+    return environment.data
+
+
+@locks_paths("file_path")
+async def set_postman_environment_variables(file_path: str, values: dict) -> dict:
+    """
+    Set several variables of a Postman environment at once. Existing variables are
+    updated in place, new ones are appended in the given order, and the file is written once.
+
+    Args:
+        file_path: The path to the Postman environment file (string)
+        values: The variables to set, mapping names to values (dict)
+    Returns:
+        The keys that were added and updated (dict)
+    """
+    logger.info(f"Setting {len(values) if isinstance(values, dict) else 0} variables in environment: {file_path}")
+
+    file_path = validate_string(file_path, "file_path")
+    values = _validate_values(values)
+
+    environment = await _load_environment(file_path)
+    added, updated = environment.upsert(values)
+    await _save_environment(environment, values)
+
+    logger.success(f"Added {len(added)} and updated {len(updated)} variables in {file_path}")
+    return {"added": added, "updated": updated}
+
+
+async def activate_postman_environment(file_path: str = None) -> dict:
+    """
+    Make an environment the active one: the runner and preview tools use its variables
+    when no environment_file is given. The environment is kept in memory, so switching
+    back and forth does not read the files again. Call without file_path to deactivate.
+
+    Args:
+        file_path: The path to the Postman environment file, or nothing to deactivate (string)
+    Returns:
+        The active environment with its enabled variables, or {"active": None} (dict)
+    """
+    if file_path is None:
+        logger.info("Deactivating the active Postman environment")
+        environment_store.activate(None)
+        return {"active": None}
+
+    logger.info(f"Activating Postman environment: {file_path}")
+    file_path = validate_string(file_path, "file_path")
+    if not os.path.isfile(file_path):
+        logger.error(f"Environment file not found: {file_path}")
+        raise FileNotFoundError(f"{file_path} does not exist")
+    environment = await run_blocking(environment_store.activate, file_path)
+
+    logger.success(f"Active environment: {environment.name}")
+    return {"active": _summary(environment)}
+
+
+async def get_active_postman_environment() -> dict:
+    """
+    Get the active Postman environment
+
+    Returns:
+        The active environment with its enabled variables, or {"active": None} (dict)
+    """
+    # Parsing the file again after it changed runs on the I/O thread pool
+    environment = await run_blocking(environment_store.active)
+    return {"active": _summary(environment) if environment is not None else None}
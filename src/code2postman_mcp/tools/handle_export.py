@@ -0,0 +1,76 @@
+import os
+import asyncio
+import tempfile
+from typing import List
+from code2postman_mcp.tools.handle_postman import read_inlined_collection, validate_string
+from code2postman_mcp.utils.executor import path_lock, run_blocking
+from code2postman_mcp.utils.metrics import path_size, record_write
+from loguru import logger
+
+
+def _write_export(collection: dict, format_name: str, output_path: str) -> int:
+    """Run one exporter into a temporary file, then move it into place. Returns the number of requests written"""
+    from code2postman_mcp.exporters import get_exporter
+
+    exporter_class = get_exporter(format_name)
+    # A unique temporary file, so that concurrent exports to the same path do not clobber each other
+    descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(output_path),
+                                             prefix=f".{os.path.basename(output_path)}.", suffix=".tmp")
+    try:
+        with open(descriptor, "w", encoding="utf-8", newline="\n") as stream:
+            count = exporter_class(stream, collection).export()
+        os.replace(temp_path, output_path)
+        record_write(path_size(output_path))
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return count
+
+
+async def export_postman_collection(file_path: str, formats: List[str], output_dir: str = None) -> dict:
+    """
+    Export the Postman collection to other formats. Every format is written by
+    its own exporter in a single pass over the collection, streaming to disk;
+    when several formats are requested they are written concurrently. Payloads
+    kept in the blob store of the collection are inlined.
+
+    Args:
+        file_path: The path to the Postman collection file (string)
+        formats: The formats to export: "openapi", "har", "curl" and/or "http" (list)
+        output_dir: The directory to write the files to, defaults to the directory of the collection (string)
+    Returns:
+        The path of the file written for each format and the number of requests written in each format (dict)
+    """
+    logger.info(f"Exporting Postman collection {file_path} to {formats}")
+    # The exporters are only imported once something is exported
+    from code2postman_mcp.exporters import get_exporter
+
+    file_path = validate_string(file_path, "file_path")
+    if isinstance(formats, str):
+        formats = [formats]
+    if not isinstance(formats, list) or not formats:
+        logger.error(f"Invalid formats: {formats}")
+        raise TypeError("formats must be a non-empty list of format names")
+    formats = list(dict.fromkeys(validate_string(name, "formats").lower() for name in formats))
+    exporters = {name: get_exporter(name) for name in formats}
+
+    if output_dir is None:
+        output_dir = os.path.dirname(os.path.abspath(file_path))
+    output_dir = validate_string(output_dir, "output_dir")
+    if not os.path.isdir(output_dir):
+        logger.error(f"Output directory not found: {output_dir}")
+        raise FileNotFoundError(f"{output_dir} does not exist")
+
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    outputs = {name: os.path.join(output_dir, f"{stem}{exporter.suffix}") for name, exporter in exporters.items()}
+    # The collection must not change while the exporters walk it in the pool
+    async with path_lock(file_path):
+        collection = await read_inlined_collection(file_path)
+        counts = await asyncio.gather(*(
+            run_blocking(_write_export, collection, name, path) for name, path in outputs.items()
+        ))
+
+    requests = dict(zip(outputs, counts))
+    logger.info(f"Exported {requests} requests from {file_path} to {list(outputs.values())}")
+    return {"files": outputs, "requests": requests}
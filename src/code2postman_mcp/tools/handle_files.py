@@ -1,55 +1,119 @@
 import os
 import re
-from code2postman_mcp.consts.excluded_files import EXCLUDED_ITEMS, Language
+from typing import Iterator, List, Pattern
+from code2postman_mcp.consts.excluded_files import AUTO_LANGUAGE, EXCLUDED_ITEMS, Language
+from code2postman_mcp.utils.executor import run_blocking
 from code2postman_mcp.utils.files import count_lines
+from code2postman_mcp.utils.metrics import file_size, record_read
+from code2postman_mcp.utils.response_cache import fingerprint_paths, response_cache
+from code2postman_mcp.utils.spool import LineSpool, get_spool, register_spool
 from loguru import logger
 
-async def get_tree_directory_from_path(path: str, language: str) -> str:
+# Trees whose output is larger than this are spooled to disk and paged
+MAX_INLINE_TREE_CHARS = 500_000
+PAGED_TREE_HEADER = "Tree too large to return at once"
+
+async def get_tree_directory_from_path(path: str, language: str, watch: bool = False) -> str:
     """
     Generate a tree directory structure as a string, excluding files and directories
     based on the specified programming language using regex patterns.
     
     Args:
         path: The root path to start generating the tree from
-        language: The programming language to filter files. Possible values: ["python", "javascript", "java", "go", "ruby", "rust", "csharp", "generic"]
+        language: The programming language to filter files. Possible values: ["auto", "python", "javascript", "java", "go", "ruby", "rust", "csharp", "generic"].
+                  "auto" detects the languages of the project and combines their filters
+        watch: Keep a background watcher on the path so later calls only rescan what changed (default: False)
         
     Returns:
-        A formatted string representing the directory tree with line counts for each file
+        A formatted string representing the directory tree with line counts for each file.
+        Very large trees return their first page and a handle to read the rest with read_tree_page
     """
     logger.info(f"Generating directory tree for path: {path} with language: {language}")
     
     # Normalize language and default to generic if not in allowed languages
     language = language.lower()
-    if language not in [lang.value for lang in Language]:
-        logger.warning(f"Invalid language: {language}. Defaulting to generic.")
-        raise ValueError(f"Invalid language: {language}. Possible values: {Language.values()}")
-    language = Language(language)
-    
-    # Get exclusion lists based on the language
-    exclusions = EXCLUDED_ITEMS.get(language, EXCLUDED_ITEMS[Language.GENERIC])
-    excluded_dirs_patterns = exclusions.get("directories", [])
-    excluded_files_patterns = exclusions.get("files", [])   
-    
-    logger.debug(f"Using exclusion patterns - Dirs: {excluded_dirs_patterns}, Files: {excluded_files_patterns}")
+    if language == AUTO_LANGUAGE:
+        if not os.path.isdir(path):
+            logger.error(f"Not a directory: {path}")
+            raise ValueError(f"{path} is not a directory")
+        # Language detection and the watchers are only imported when used
+        from code2postman_mcp.utils.language import get_project_profile
+        profile = await run_blocking(get_project_profile, path)
+        profile_name = profile.name
+        dir_patterns = list(profile.dir_patterns)
+        file_patterns = list(profile.file_patterns)
+        logger.debug(f"Using auto-detected profile: {profile_name}")
+    else:
+        if language not in [lang.value for lang in Language]:
+            logger.warning(f"Invalid language: {language}. Defaulting to generic.")
+            raise ValueError(f"Invalid language: {language}. Possible values: {[AUTO_LANGUAGE] + [lang.value for lang in Language]}")
+        language = Language(language)
+        profile_name = language.value
+        
+        # Get exclusion lists based on the language
+        exclusions = EXCLUDED_ITEMS.get(language, EXCLUDED_ITEMS[Language.GENERIC])
+        excluded_dirs_patterns = exclusions.get("directories", [])
+        excluded_files_patterns = exclusions.get("files", [])   
+        
+        logger.debug("Using exclusion patterns - Dirs: {}, Files: {}", excluded_dirs_patterns, excluded_files_patterns)
+        
+        # Compile regex patterns for better performance
+        dir_patterns = [re.compile(pattern) for pattern in excluded_dirs_patterns]
+        file_patterns = [re.compile(pattern) for pattern in excluded_files_patterns]
     
-    # Compile regex patterns for better performance
-    dir_patterns = [re.compile(pattern) for pattern in excluded_dirs_patterns]
-    file_patterns = [re.compile(pattern) for pattern in excluded_files_patterns]
+    if watch:
+        if not os.path.isdir(path):
+            logger.error(f"Not a directory: {path}")
+            raise ValueError(f"{path} is not a directory")
+        from code2postman_mcp.utils.watcher import get_watcher
+        watcher = await run_blocking(get_watcher, path, profile_name, dir_patterns, file_patterns)
+        logger.debug(f"Serving tree for {path} from {watcher.mode} watcher")
+        return await run_blocking(lambda: _emit_tree(iter(watcher.lines(os.path.basename(path)))))
     
-    # Create tree structure
-    tree_lines = []
-    base_name = os.path.basename(path)
-    tree_lines.append(f"{base_name}/")
+    # Trees are served again while none of their directories changed; stat'ing them runs in the pool too
+    key = ("get_tree_directory_from_path", os.path.abspath(path), profile_name)
+    cached = await run_blocking(response_cache.get, key)
+    if cached is not None:
+        logger.debug("Serving cached tree for {}", path)
+        return cached
     
     logger.debug(f"Starting directory walk from: {path}")
+    # The walk and the line counts run on the I/O thread pool, not on the event loop
+    directories = []
+    tree = await run_blocking(_emit_tree, _iter_tree_lines(path, dir_patterns, file_patterns, directories))
+    # Paged trees point to a spool that may expire, so only inline trees are cached;
+    # for them the walk stopped collecting directories
+    if not tree.startswith(PAGED_TREE_HEADER):
+        await run_blocking(response_cache.put, key, tree, directories, len(tree))
+    return tree
+
+def _iter_tree_lines(path: str, dir_patterns: List[Pattern], file_patterns: List[Pattern],
+                     directories: List[str] = None) -> Iterator[str]:
+    """
+    Walk the directory tree and yield the formatted tree lines one at a time,
+    so callers never need to hold the whole tree in memory. The directories
+    listed in the tree are appended to `directories` if given, as long as the
+    tree fits in MAX_INLINE_TREE_CHARS: beyond it the tree is paged and not
+    cached, so the list is emptied and no longer grows with the tree.
+    """
+    line = f"{os.path.basename(path)}/"
+    emitted = len(line) + 1
+    yield line
+    
     # Walk the directory tree and filter as needed
     for root, dirs, files in os.walk(path):
+        if directories is not None:
+            if emitted > MAX_INLINE_TREE_CHARS:
+                directories.clear()
+                directories = None
+            else:
+                directories.append(root)
         # Skip processing if root is the same as path
         if root == path:
             # Filter directories for top level
             original_dirs_count = len(dirs)
             dirs[:] = [d for d in dirs if not any(pattern.search(d) for pattern in dir_patterns)]
-            logger.debug(f"Filtered {original_dirs_count - len(dirs)} top-level directories")
+            logger.debug("Filtered {} top-level directories", original_dirs_count - len(dirs))
             
             # Filter and add files at root level
             filtered_files = 0
@@ -57,11 +121,13 @@ async def get_tree_directory_from_path(path: str, language: str) -> str:
                 if not any(pattern.search(file) for pattern in file_patterns):
                     file_path = os.path.join(root, file)
                     line_count = count_lines(file_path)
-                    tree_lines.append(f"    {file} ({line_count} lines)")
+                    line = f"    {file} ({line_count} lines)"
+                    emitted += len(line) + 1
+                    yield line
                 else:
                     filtered_files += 1
             
-            logger.debug(f"Filtered {filtered_files} files at root level")
+            logger.debug("Filtered {} files at root level", filtered_files)
             continue
         
         # Get the relative path from the root
@@ -71,21 +137,23 @@ async def get_tree_directory_from_path(path: str, language: str) -> str:
         path_parts = rel_path.split(os.sep)
         if any(any(pattern.search(part) for pattern in dir_patterns) for part in path_parts):
             # This directory or any parent is excluded, so skip it
-            logger.debug(f"Skipping excluded directory: {rel_path}")
+            logger.debug("Skipping excluded directory: {}", rel_path)
             continue
             
         # Filter out directories that should be excluded
         original_dirs_count = len(dirs)
         dirs[:] = [d for d in dirs if not any(pattern.search(d) for pattern in dir_patterns)]
         if original_dirs_count != len(dirs):
-            logger.debug(f"Filtered {original_dirs_count - len(dirs)} directories in {rel_path}")
+            logger.debug("Filtered {} directories in {}", original_dirs_count - len(dirs), rel_path)
         
         # Calculate the indentation level
         level = rel_path.count(os.sep)
         indent = ' ' * 4 * (level + 1)
         
         # Add the directory to the tree
-        tree_lines.append(f"{indent}{os.path.basename(root)}/")
+        line = f"{indent}{os.path.basename(root)}/"
+        emitted += len(line) + 1
+        yield line
         
         # Add files
         filtered_files = 0
@@ -93,15 +161,73 @@ async def get_tree_directory_from_path(path: str, language: str) -> str:
             if not any(pattern.search(file) for pattern in file_patterns):
                 file_path = os.path.join(root, file)
                 line_count = count_lines(file_path)
-                tree_lines.append(f"{' ' * 4 * (level + 2)}{file} ({line_count} lines)")
+                line = f"{' ' * 4 * (level + 2)}{file} ({line_count} lines)"
+                emitted += len(line) + 1
+                yield line
             else:
                 filtered_files += 1
         
         if filtered_files > 0:
-            logger.debug(f"Filtered {filtered_files} files in directory: {rel_path}")
+            logger.debug("Filtered {} files in directory: {}", filtered_files, rel_path)
+
+def _emit_tree(lines: Iterator[str]) -> str:
+    """
+    Join the tree lines into the tool output. Trees larger than
+    `MAX_INLINE_TREE_CHARS` are spooled to a temporary file instead, and the
+    first page is returned together with a handle for `read_tree_page`.
+    """
+    buffered = []
+    buffered_chars = 0
+    for line in lines:
+        buffered.append(line)
+        buffered_chars += len(line) + 1
+        if buffered_chars > MAX_INLINE_TREE_CHARS:
+            break
+    else:
+        logger.info(f"Generated directory tree with {len(buffered)} entries")
+        return "\n".join(buffered)
     
-    logger.info(f"Generated directory tree with {len(tree_lines)} entries")
-    return "\n".join(tree_lines)
+    spool = LineSpool(prefix="code2postman-tree-")
+    spool.write_lines(buffered)
+    del buffered
+    spool.write_lines(lines)
+    handle = register_spool(spool)
+    logger.info(f"Generated directory tree with {spool.total_lines} entries, spooled to {spool.path}")
+    header = (
+        f"{PAGED_TREE_HEADER} ({spool.total_lines} entries, {spool.total_pages} pages). "
+        f"Showing page 0; call read_tree_page with handle \"{handle}\" and page 1..{spool.total_pages - 1} for the rest."
+    )
+    return f"{header}\n{spool.read_page(0)}"
+
+async def read_tree_page(handle: str, page: int = 0) -> str:
+    """
+    Read one page of a directory tree that was too large to return at once.
+    
+    Args:
+        handle: The handle returned by get_tree_directory_from_path
+        page: The page to read (0-indexed, default: 0)
+        
+    Returns:
+        The lines of the requested page, preceded by a header with the page count
+        
+    Raises:
+        ValueError: If the handle is unknown or the page is out of range
+    """
+    logger.info(f"Reading tree page {page} of handle: {handle}")
+    
+    spool = get_spool(handle)
+    if spool is None:
+        logger.error(f"Unknown tree handle: {handle}")
+        raise ValueError(f"Unknown or expired tree handle: {handle}")
+    
+    content = await run_blocking(spool.read_page, page)
+    return f"Page {page} of {spool.total_pages - 1} ({spool.total_lines} entries)\n{content}"
+
+def _read_lines(file_path: str) -> List[str]:
+    with open(file_path, 'r', encoding='utf-8') as file:
+        lines = file.readlines()
+        record_read(file_size(file))
+    return lines
 
 async def read_file(file_path: str, start_line: int = 0, end_line: int = None) -> str:
     """
@@ -135,27 +261,34 @@ async def read_file(file_path: str, start_line: int = 0, end_line: int = None) -
         logger.error(f"Invalid start_line: {start_line}, must be non-negative")
         raise ValueError("start_line must be non-negative")
     
-    # Read the file and add line numbers
-    result = []
-    with open(file_path, 'r', encoding='utf-8') as file:
-        lines = file.readlines()
-        logger.debug(f"File {file_path} has {len(lines)} lines total")
-        
-        # Adjust end_line if it's None or exceeds the file length
-        if end_line is None or end_line >= len(lines):
-            end_line = len(lines) - 1
-        
-        if end_line < start_line:
-            logger.error(f"Invalid line range: start_line ({start_line}) > end_line ({end_line})")
-            raise ValueError("end_line must be greater than or equal to start_line")
-        
-        result = ["Total lines: " + str(len(lines)) + "\n"]
-        
-        logger.debug(f"Reading lines {start_line} to {end_line} from {file_path}")
-        # Add line numbers and extract the requested lines
-        for i in range(start_line, end_line + 1):
-            result.append(f"{i+1:4d} | {lines[i]}")
+    key = ("read_file", os.path.abspath(file_path), start_line, end_line)
+    cached = response_cache.get(key)
+    if cached is not None:
+        logger.debug("Serving cached content of {}", file_path)
+        return cached
+    fingerprints = fingerprint_paths([file_path])
+    
+    # Read the file on the I/O thread pool and add line numbers
+    lines = await run_blocking(_read_lines, file_path)
+    logger.debug("File {} has {} lines total", file_path, len(lines))
+    
+    # Adjust end_line if it's None or exceeds the file length
+    if end_line is None or end_line >= len(lines):
+        end_line = len(lines) - 1
+    
+    if end_line < start_line:
+        logger.error(f"Invalid line range: start_line ({start_line}) > end_line ({end_line})")
+        raise ValueError("end_line must be greater than or equal to start_line")
+    
+    result = ["Total lines: " + str(len(lines)) + "\n"]
+    
+    logger.debug("Reading lines {} to {} from {}", start_line, end_line, file_path)
+    # Add line numbers and extract the requested lines
+    for i in range(start_line, end_line + 1):
+        result.append(f"{i+1:4d} | {lines[i]}")
     
     logger.info(f"Successfully read {end_line - start_line + 1} lines from {file_path}")
-    return "".join(result)
+    content = "".join(result)
+    response_cache.put(key, content, [file_path], len(content), fingerprints)
+    return content
     
\ No newline at end of file
@@ -0,0 +1,35 @@
+import os
+from code2postman_mcp.tools.handle_postman import validate_string
+from code2postman_mcp.utils.metrics import metrics
+from code2postman_mcp.utils.response_cache import response_cache
+from loguru import logger
+
+
+async def get_server_metrics(tool_name: str = None, include_buckets: bool = False, prometheus_file: str = None) -> dict:
+    """
+    Get the metrics recorded since the server started: calls, errors and latency
+    of every tool, with the bytes read and written, the JSON parse and dump time
+    and the files scanned during its calls, and the hits and misses of the
+    response cache of the read-only tools
+
+    Args:
+        tool_name: Optional name of a single tool to report (string)
+        include_buckets: Whether to include the latency histogram buckets (boolean)
+        prometheus_file: Optional path where the metrics are also written in the Prometheus text format (string)
+    Returns:
+        The uptime, the metrics of every tool that was called and the response cache statistics (dict)
+    """
+    if tool_name is not None:
+        tool_name = validate_string(tool_name, "tool_name")
+    snapshot = metrics.snapshot(tool_name, include_buckets)
+    snapshot["response_cache"] = response_cache.stats()
+    if prometheus_file is not None:
+        prometheus_file = validate_string(prometheus_file, "prometheus_file")
+        directory = os.path.dirname(os.path.abspath(prometheus_file))
+        if not os.path.isdir(directory):
+            logger.error(f"Directory of the metrics file does not exist: {directory}")
+            raise FileNotFoundError(f"{directory} does not exist")
+        metrics.dump(prometheus_file)
+        logger.info(f"Metrics written to {prometheus_file}")
+        snapshot["prometheus_file"] = prometheus_file
+    return snapshot
@@ -1,10 +1,26 @@
 import os
+import copy
 import json
 from typing import List, Any
 from code2postman_mcp.consts.postman_template import POSTMAN_TEMPLATE
-from code2postman_mcp.utils.files import is_a_valid_item
+from code2postman_mcp.utils.blobs import DEFAULT_MIN_BLOB_BYTES, BlobStore, copy_blobs, folders_of, inline_payloads, store_payloads
+from code2postman_mcp.utils.collection_diff import diff_collections, merge_collections
+from code2postman_mcp.utils.collection_cache import collection_cache, compact_cache_enabled, notify_change, revisions
+from code2postman_mcp.utils.executor import load_json, locks_paths, path_lock, run_blocking
+from code2postman_mcp.utils.history import HistoryEntry, edit_history
+from code2postman_mcp.utils.json_patch import apply_patch, pointer
+from code2postman_mcp.utils.metrics import json_timer, path_size, record_read, record_write
+from code2postman_mcp.utils.response_cache import fingerprint_paths, response_cache
+from code2postman_mcp.utils.schema import validate
+from code2postman_mcp.utils.shards import (
+    MANIFEST_FILE, is_folder, is_sharded, shard_loader, shard_paths, split_collection, strip_manifest,
+)
+from code2postman_mcp.utils.variables import resolvers
 from loguru import logger
 
+# Maximum number of schema errors included in an error message or a validation report
+MAX_REPORTED_ERRORS = 100
+
 def validate_string(value: Any, param_name: str) -> str:
     """Validate that a value is a string"""
     if not isinstance(value, str):
@@ -17,6 +33,115 @@ def validate_dict(value: Any, param_name: str) -> dict:
         raise TypeError(f"{param_name} must be a dictionary, got {type(value).__name__}")
     return value
 
+def _check_revision(file_path: str, expected_revision: int = None) -> None:
+    """Raise ValueError if the collection is no longer at the revision the caller expects"""
+    if expected_revision is None:
+        return
+    if not isinstance(expected_revision, int) or isinstance(expected_revision, bool):
+        raise TypeError(f"expected_revision must be an integer, got {type(expected_revision).__name__}")
+    current_revision = revisions.current(file_path)
+    if current_revision != expected_revision:
+        logger.warning(f"Revision conflict for {file_path}: expected {expected_revision}, current {current_revision}")
+        raise ValueError(
+            f"Revision conflict for {file_path}: expected revision {expected_revision} but the collection "
+            f"is at revision {current_revision}. Read it again and retry the change"
+        )
+
+def _validate_subtree(value: Any, definition: str, root: str, label: str, partial: bool = False) -> None:
+    """Validate only the value about to be inserted, reporting errors at its JSON path in the collection"""
+    errors = validate(value, definition, root, partial=partial)
+    if errors:
+        logger.error(f"Invalid {label}: {errors}")
+        raise ValueError(f"Invalid {label}: " + "; ".join(errors[:MAX_REPORTED_ERRORS]))
+
+def _read_collection(file_path: str, folders: List[str] = None, whole: bool = False) -> dict:
+    """Blocking part of _load_collection: parse the file and load the requested shards"""
+    data = collection_cache.get(file_path)
+    if data is None:
+        size = path_size(file_path)
+        with json_timer("parse"):
+            data = load_json(file_path, size)
+        record_read(size)
+        collection_cache.put(file_path, data)
+        collection_cache.compact_cold()
+        if is_sharded(data):
+            shard_loader.reset(file_path)
+    
+    if is_sharded(data) and (whole or folders):
+        shard_loader.load(file_path, data, None if whole else folders)
+    return data
+
+async def _load_collection(file_path: str, folders: List[str] = None, whole: bool = False) -> dict:
+    """
+    Return the parsed collection, from the in-memory cache when the file is unchanged.
+    For a sharded collection, only the content of the top-level `folders` is loaded,
+    or of every folder if `whole` is set; the other folders are stubs.
+    Reading and parsing, or expanding a compacted cache entry, run on the I/O thread pool.
+    """
+    if collection_cache.is_compacted(file_path):
+        return await run_blocking(_read_collection, file_path, folders, whole)
+    data = collection_cache.get(file_path)
+    if data is not None and not is_sharded(data):
+        logger.debug("Using cached collection: {}", file_path)
+        return data
+    return await run_blocking(_read_collection, file_path, folders, whole)
+
+def _write_collection(file_path: str, data: dict, folders: List[str]) -> None:
+    if is_sharded(data):
+        shard_loader.save(file_path, data, folders)
+    else:
+        with open(file_path, "w") as file, json_timer("dump"):
+            json.dump(data, file, indent=2)
+        record_write(path_size(file_path))
+
+async def _save_collection(file_path: str, data: dict, folders: List[str] = None) -> int:
+    """
+    Write the collection to disk on the I/O thread pool, refresh the cache and notify
+    change listeners. `folders` lists the top-level folders whose content changed.
+    Returns the new revision.
+    """
+    try:
+        await run_blocking(_write_collection, file_path, data, folders or [])
+    except Exception:
+        collection_cache.invalidate(file_path)
+        # Change listeners are not called, but cached responses may share the edited document
+        response_cache.invalidate_path(file_path)
+        raise
+    collection_cache.put(file_path, data)
+    if compact_cache_enabled():
+        await run_blocking(collection_cache.compact_cold)
+    revision = revisions.bump(file_path)
+    await notify_change(file_path, folders or [])
+    return revision
+
+async def _apply_changes(file_path: str, data: dict, operations: List[dict], folders: List[str] = None) -> int:
+    """
+    Apply JSON Patch operations to the collection, save it and record the
+    inverse patch so the edit can be undone. Returns the new revision.
+    Without operations nothing is written: the revision, which other clients
+    may pass as expected_revision, and the edit history stay valid.
+    """
+    if not operations:
+        return revisions.current(file_path)
+    inverse = apply_patch(data, operations)
+    revision = await _save_collection(file_path, data, folders=folders)
+    edit_history.record(file_path, HistoryEntry(forward=operations, inverse=inverse, folders=folders or []), revision)
+    return revision
+
+async def read_inlined_collection(file_path: str) -> dict:
+    """
+    Read the Postman collection with the payloads of its blob store inlined,
+    as exports and runs need them. Callers must not modify the result.
+    """
+    collection = await read_postman_collection(file_path)
+    return await run_blocking(inline_payloads, collection, BlobStore(file_path))
+
+def _write_template(file_path: str, template: str) -> None:
+    with open(file_path, "w") as file:
+        file.write(template)
+    record_write(len(template))
+
+@locks_paths("file_path")
 async def create_postman_collection(file_path: str, name: str, description: str) -> str:
     """
     Create a Postman collection from a directory structure. Extension of the file must be .json
@@ -41,13 +166,17 @@ async def create_postman_collection(file_path: str, name: str, description: str)
     
     template = POSTMAN_TEMPLATE.format(project_name=name, project_description=description)
     logger.debug(f"Generated template for collection: {name}")
-    with open(file_path, "w") as file:
-        file.write(template)
+    await run_blocking(_write_template, file_path, template)
+    collection_cache.invalidate(file_path)
+    revisions.bump(file_path)
+    edit_history.clear(file_path)
+    await notify_change(file_path, [])
     
     logger.success(f"Created Postman collection at {file_path}")
     return template
 
-async def add_postman_collection_item(file_path: str, item: dict) -> dict:
+@locks_paths("file_path")
+async def add_postman_collection_item(file_path: str, item: dict, expected_revision: int = None) -> dict:
     """
     Add an item to the Postman collection
     
@@ -61,6 +190,7 @@ async def add_postman_collection_item(file_path: str, item: dict) -> dict:
                       "url": "https://api.example.com/users/1"
                   }
               }
+        expected_revision: Optional revision the caller last saw; the change is rejected if the collection changed since (int)
     Returns:
         The updated Postman collection data (dict)
     """
@@ -70,28 +200,32 @@ async def add_postman_collection_item(file_path: str, item: dict) -> dict:
     file_path = validate_string(file_path, "file_path")
     item = validate_dict(item, "item")
     
-    logger.debug(f"Item details: {item.get('name', 'unnamed')}")
+    logger.debug("Item details: {}", item.get("name", "unnamed"))
     
-    with open(file_path, "r") as file:
-        data = json.load(file)
+    _check_revision(file_path, expected_revision)
+    data = await _load_collection(file_path)
     
-    if not is_a_valid_item(item):
-        logger.error(f"Invalid item structure: {item}")
-        raise ValueError("Invalid item")
+    _validate_subtree(item, "items", f"$.item[{len(data.get('item', []))}]", "item")
+    if is_sharded(data) and is_folder(item) and any(
+        is_folder(existing) and existing["name"] == item["name"] for existing in data.get("item", [])
+    ):
+        logger.error(f"Folder '{item['name']}' already exists in sharded collection {file_path}")
+        raise ValueError(f"Folder '{item['name']}' already exists; folder names of a sharded collection must be unique")
     
+    operations = []
     if "item" not in data:
         logger.warning(f"Collection has no 'item' array, creating one")
-        data["item"] = []
+        operations.append({"op": "add", "path": "/item", "value": []})
     
-    data["item"].append(item)
+    operations.append({"op": "add", "path": "/item/-", "value": item})
     logger.debug(f"Added item: {item.get('name', 'unnamed')} to collection")
 
-    with open(file_path, "w") as file:
-        json.dump(data, file, indent=2)
+    await _apply_changes(file_path, data, operations, folders=[item["name"]] if "item" in item else [])
     
     logger.success(f"Updated collection with new item: {item.get('name', 'unnamed')}")
     return data
 
+@locks_paths("file_path")
 async def read_postman_collection(file_path: str) -> dict:
     """
     Read the Postman collection
@@ -114,16 +248,94 @@ async def read_postman_collection(file_path: str) -> dict:
         logger.error(f"File not found: {file_path}")
         raise FileNotFoundError(f"{file_path} does not exist")
     
+    key = ("read_postman_collection", os.path.abspath(file_path))
+    cached = response_cache.get(key)
+    if cached is not None:
+        logger.debug("Serving cached response for collection: {}", file_path)
+        return cached
+    fingerprints = fingerprint_paths([file_path])
+    
     try:
-        with open(file_path, "r") as file:
-            data = json.load(file)
-            logger.debug(f"Successfully read collection with {len(data.get('item', []))} items")
-            return data
+        data = await _load_collection(file_path, whole=True)
+        logger.debug(f"Successfully read collection with {len(data.get('item', []))} items")
     except json.JSONDecodeError as e:
         logger.error(f"Invalid JSON in file {file_path}: {str(e)}")
         raise
+    
+    paths = [file_path]
+    if is_sharded(data):
+        shards = list(shard_paths(file_path, data).values())
+        paths += shards
+        fingerprints += fingerprint_paths(shards)
+        data = strip_manifest(data)
+    size = sum(fingerprint[1] for fingerprint in fingerprints if fingerprint is not None)
+    response_cache.put(key, data, paths, size, fingerprints)
+    return data
+
+async def get_postman_collection_revision(file_path: str) -> dict:
+    """
+    Get the current revision of a Postman collection without reading it
+    
+    Args:
+        file_path: The path to the Postman collection file (string)
+    Returns:
+        A dict with the file_path and its current revision (int), to pass as expected_revision to mutating tools
+    """
+    logger.info(f"Getting revision of Postman collection: {file_path}")
+    
+    # Validate input types
+    file_path = validate_string(file_path, "file_path")
+    
+    if not os.path.isfile(file_path):
+        logger.error(f"File not found: {file_path}")
+        raise FileNotFoundError(f"{file_path} does not exist")
+    
+    return {"file_path": file_path, "revision": revisions.current(file_path)}
+
+async def read_postman_collection_if_changed(file_path: str, known_revision: int = None) -> dict:
+    """
+    Read the Postman collection together with its revision, skipping the content if it did not change
+    
+    Args:
+        file_path: The path to the Postman collection file (string)
+        known_revision: The revision the caller already has, if any (int)
+    Returns:
+        A dict with the current revision, whether it changed since known_revision and,
+        only if it changed, the collection data under "collection"
+    """
+    logger.info(f"Reading Postman collection if changed since revision {known_revision}: {file_path}")
+    
+    revision = (await get_postman_collection_revision(file_path))["revision"]
+    if known_revision is not None and known_revision == revision:
+        logger.debug(f"Collection unchanged at revision {revision}")
+        return {"revision": revision, "changed": False}
+    
+    data = await read_postman_collection(file_path)
+    return {"revision": revisions.current(file_path), "changed": True, "collection": data}
+
+async def validate_postman_collection(file_path: str) -> dict:
+    """
+    Validate the whole Postman collection against the Postman Collection v2.1 schema
+    
+    Args:
+        file_path: The path to the Postman collection file (string)
+    Returns:
+        Whether the collection is valid, the number of errors and the first errors, each prefixed with its JSON path (dict)
+    """
+    logger.info(f"Validating Postman collection: {file_path}")
+    
+    async with path_lock(file_path):
+        data = await read_postman_collection(file_path)
+        errors = await run_blocking(validate, data)
+    
+    if errors:
+        logger.warning(f"Collection {file_path} has {len(errors)} schema errors")
+    else:
+        logger.success(f"Collection {file_path} is valid")
+    return {"valid": not errors, "error_count": len(errors), "errors": errors[:MAX_REPORTED_ERRORS]}
 
-async def add_postman_collection_info(file_path: str, info: dict) -> dict:
+@locks_paths("file_path")
+async def add_postman_collection_info(file_path: str, info: dict, expected_revision: int = None) -> dict:
     """
     Update or add the info section of a Postman collection
     
@@ -136,6 +348,7 @@ async def add_postman_collection_info(file_path: str, info: dict) -> dict:
                   "version": "1.0.0",
                   "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"
               }
+        expected_revision: Optional revision the caller last saw; the change is rejected if the collection changed since (int)
     Returns:
         The updated Postman collection data (dict)
     """
@@ -145,25 +358,28 @@ async def add_postman_collection_info(file_path: str, info: dict) -> dict:
     file_path = validate_string(file_path, "file_path")
     info = validate_dict(info, "info")
     
-    logger.debug(f"Info details: {info}")
+    logger.debug("Info details: {}", info)
     
-    with open(file_path, "r") as file:
-        data = json.load(file)
+    _check_revision(file_path, expected_revision)
+    data = await _load_collection(file_path)
     
+    _validate_subtree(info, "info", "$.info", "info", partial=True)
+    
+    operations = []
     if "info" not in data:
         logger.warning("Collection has no 'info' object, creating one")
-        data["info"] = {}
+        operations.append({"op": "add", "path": "/info", "value": {}})
     
-    data["info"].update(info)
-    logger.debug(f"Updated info section with: {info}")
+    operations.extend({"op": "add", "path": pointer("info", key), "value": value} for key, value in info.items())
+    logger.debug("Updated info section with: {}", info)
     
-    with open(file_path, "w") as file:
-        json.dump(data, file, indent=2)
+    await _apply_changes(file_path, data, operations)
     
     logger.success(f"Successfully updated collection info")
     return data
 
-async def add_postman_collection_event(file_path: str, event: dict) -> dict:
+@locks_paths("file_path")
+async def add_postman_collection_event(file_path: str, event: dict, expected_revision: int = None) -> dict:
     """
     Add an event to the Postman collection
     
@@ -177,6 +393,7 @@ async def add_postman_collection_event(file_path: str, event: dict) -> dict:
                       "exec": ["console.log('This runs before each request');"]
                   }
               }
+        expected_revision: Optional revision the caller last saw; the change is rejected if the collection changed since (int)
     Returns:
         The updated Postman collection data (dict)
     """
@@ -186,25 +403,28 @@ async def add_postman_collection_event(file_path: str, event: dict) -> dict:
     file_path = validate_string(file_path, "file_path")
     event = validate_dict(event, "event")
     
-    logger.debug(f"Event details: {event}")
+    logger.debug("Event details: {}", event)
+    
+    _check_revision(file_path, expected_revision)
+    data = await _load_collection(file_path)
     
-    with open(file_path, "r") as file:
-        data = json.load(file)
+    _validate_subtree(event, "event", f"$.event[{len(data.get('event', []))}]", "event")
     
+    operations = []
     if "event" not in data:
         logger.warning("Collection has no 'event' array, creating one")
-        data["event"] = []
+        operations.append({"op": "add", "path": "/event", "value": []})
     
-    data["event"].append(event)
+    operations.append({"op": "add", "path": "/event/-", "value": event})
     logger.debug(f"Added event with listen type: {event.get('listen', 'unknown')}")
     
-    with open(file_path, "w") as file:
-        json.dump(data, file, indent=2)
+    await _apply_changes(file_path, data, operations)
     
     logger.success(f"Successfully added event to collection")
     return data
 
-async def add_postman_collection_variable(file_path: str, variable: dict) -> dict:
+@locks_paths("file_path")
+async def add_postman_collection_variable(file_path: str, variable: dict, expected_revision: int = None) -> dict:
     """
     Add a variable to the Postman collection
     
@@ -216,6 +436,7 @@ async def add_postman_collection_variable(file_path: str, variable: dict) -> dic
                     "value": "https://api.example.com",
                     "type": "string"
                 }
+        expected_revision: Optional revision the caller last saw; the change is rejected if the collection changed since (int)
     Returns:
         The updated Postman collection data (dict)
     """
@@ -225,25 +446,28 @@ async def add_postman_collection_variable(file_path: str, variable: dict) -> dic
     file_path = validate_string(file_path, "file_path")
     variable = validate_dict(variable, "variable")
     
-    logger.debug(f"Variable details: {variable}")
+    logger.debug("Variable details: {}", variable)
+    
+    _check_revision(file_path, expected_revision)
+    data = await _load_collection(file_path)
     
-    with open(file_path, "r") as file:
-        data = json.load(file)
+    _validate_subtree(variable, "variable", f"$.variable[{len(data.get('variable', []))}]", "variable")
     
+    operations = []
     if "variable" not in data:
         logger.warning("Collection has no 'variable' array, creating one")
-        data["variable"] = []
+        operations.append({"op": "add", "path": "/variable", "value": []})
     
-    data["variable"].append(variable)
+    operations.append({"op": "add", "path": "/variable/-", "value": variable})
     logger.debug(f"Added variable: {variable.get('key', 'unnamed')}")
     
-    with open(file_path, "w") as file:
-        json.dump(data, file, indent=2)
+    await _apply_changes(file_path, data, operations)
     
     logger.success(f"Successfully added variable: {variable.get('key', 'unnamed')} to collection")
     return data
 
-async def add_postman_collection_auth(file_path: str, auth: dict) -> dict:
+@locks_paths("file_path")
+async def add_postman_collection_auth(file_path: str, auth: dict, expected_revision: int = None) -> dict:
     """
     Add or update authentication information for the Postman collection
     
@@ -260,6 +484,7 @@ async def add_postman_collection_auth(file_path: str, auth: dict) -> dict:
                       }
                   ]
               }
+        expected_revision: Optional revision the caller last saw; the change is rejected if the collection changed since (int)
     Returns:
         The updated Postman collection data (dict)
     """
@@ -269,21 +494,23 @@ async def add_postman_collection_auth(file_path: str, auth: dict) -> dict:
     file_path = validate_string(file_path, "file_path")
     auth = validate_dict(auth, "auth")
     
-    logger.debug(f"Auth details: {auth}")
+    logger.debug("Auth details: {}", auth)
     
-    with open(file_path, "r") as file:
-        data = json.load(file)
+    _check_revision(file_path, expected_revision)
+    data = await _load_collection(file_path)
     
-    data["auth"] = auth
+    _validate_subtree(auth, "auth", "$.auth", "auth")
+    
+    operations = [{"op": "add", "path": "/auth", "value": auth}]
     logger.debug(f"Set auth type: {auth.get('type', 'unknown')}")
     
-    with open(file_path, "w") as file:
-        json.dump(data, file, indent=2)
+    await _apply_changes(file_path, data, operations)
     
     logger.success(f"Successfully updated auth in collection")
     return data
 
-async def add_postman_collection_protocol_behavior(file_path: str, behavior: dict) -> dict:
+@locks_paths("file_path")
+async def add_postman_collection_protocol_behavior(file_path: str, behavior: dict, expected_revision: int = None) -> dict:
     """
     Add or update protocol profile behavior settings for the Postman collection
     
@@ -294,6 +521,7 @@ async def add_postman_collection_protocol_behavior(file_path: str, behavior: dic
                      "disableBodyPruning": true,
                      "followRedirects": false
                  }
+        expected_revision: Optional revision the caller last saw; the change is rejected if the collection changed since (int)
     Returns:
         The updated Postman collection data (dict)
     """
@@ -303,27 +531,30 @@ async def add_postman_collection_protocol_behavior(file_path: str, behavior: dic
     file_path = validate_string(file_path, "file_path")
     behavior = validate_dict(behavior, "behavior")
     
-    logger.debug(f"Behavior details: {behavior}")
+    logger.debug("Behavior details: {}", behavior)
+    
+    _check_revision(file_path, expected_revision)
+    data = await _load_collection(file_path)
     
-    with open(file_path, "r") as file:
-        data = json.load(file)
+    _validate_subtree(behavior, "protocolProfileBehavior", "$.protocolProfileBehavior", "protocol behavior")
     
-    data["protocolProfileBehavior"] = behavior
+    operations = [{"op": "add", "path": "/protocolProfileBehavior", "value": behavior}]
     logger.debug(f"Set protocol behavior with {len(behavior)} settings")
     
-    with open(file_path, "w") as file:
-        json.dump(data, file, indent=2)
+    await _apply_changes(file_path, data, operations)
     
     logger.success(f"Successfully updated protocol behavior in collection")
     return data
 
-async def delete_postman_collection_item(file_path: str, item_name: str) -> dict:
+@locks_paths("file_path")
+async def delete_postman_collection_item(file_path: str, item_name: str, expected_revision: int = None) -> dict:
     """
     Delete an item from the Postman collection by name
     
     Args:
         file_path: The path to the Postman collection file (string)
         item_name: The name of the item to delete (string)
+        expected_revision: Optional revision the caller last saw; the change is rejected if the collection changed since (int)
     Returns:
         The updated Postman collection data (dict)
     """
@@ -333,29 +564,34 @@ async def delete_postman_collection_item(file_path: str, item_name: str) -> dict
     file_path = validate_string(file_path, "file_path")
     item_name = validate_string(item_name, "item_name")
     
-    with open(file_path, "r") as file:
-        data = json.load(file)
+    _check_revision(file_path, expected_revision)
+    # The content of a deleted folder is kept in the history, so it can be undone
+    data = await _load_collection(file_path, folders=[item_name])
     
     if "item" not in data:
         logger.warning(f"Collection has no items to delete")
         return data
     
-    original_count = len(data["item"])
-    data["item"] = [item for item in data["item"] if item.get("name") != item_name]
-    deleted_count = original_count - len(data["item"])
+    # Remove from the end so earlier indexes stay valid
+    operations = [
+        {"op": "remove", "path": pointer("item", index)}
+        for index in reversed(range(len(data["item"])))
+        if data["item"][index].get("name") == item_name
+    ]
+    deleted_count = len(operations)
     
     if deleted_count > 0:
         logger.debug(f"Removed {deleted_count} item(s) with name: {item_name}")
     else:
         logger.warning(f"No items found with name: {item_name}")
     
-    with open(file_path, "w") as file:
-        json.dump(data, file, indent=2)
+    await _apply_changes(file_path, data, operations, folders=[item_name] if deleted_count > 0 else [])
     
     logger.success(f"Successfully updated collection after deletion")
     return data
 
-async def update_postman_collection_variable(file_path: str, key: str, new_value: str) -> dict:
+@locks_paths("file_path")
+async def update_postman_collection_variable(file_path: str, key: str, new_value: str, expected_revision: int = None) -> dict:
     """
     Update a specific variable in the Postman collection by key
     
@@ -363,6 +599,7 @@ async def update_postman_collection_variable(file_path: str, key: str, new_value
         file_path: The path to the Postman collection file (string)
         key: The key of the variable to update (string)
         new_value: The new value for the variable (string)
+        expected_revision: Optional revision the caller last saw; the change is rejected if the collection changed since (int)
     Returns:
         The updated Postman collection data (dict)
     """
@@ -373,33 +610,91 @@ async def update_postman_collection_variable(file_path: str, key: str, new_value
     key = validate_string(key, "key")
     new_value = validate_string(new_value, "new_value")
     
-    logger.debug(f"New value: {new_value}")
+    logger.debug("New value: {}", new_value)
     
-    with open(file_path, "r") as file:
-        data = json.load(file)
+    _check_revision(file_path, expected_revision)
+    data = await _load_collection(file_path)
     
     if "variable" not in data or not isinstance(data["variable"], list):
         logger.warning(f"Collection has no variables to update")
         return data
     
-    variable_found = False
-    for var in data["variable"]:
-        if var.get("key") == key:
-            var["value"] = new_value
-            variable_found = True
-            logger.debug(f"Updated variable: {key}")
-            break
-    
-    if not variable_found:
+    operations = []
+    index = collection_cache.variable_position(file_path, data, key)
+    if index is not None:
+        operations.append({"op": "add", "path": pointer("variable", index, "value"), "value": new_value})
+        logger.debug(f"Updated variable: {key}")
+    else:
         logger.warning(f"Variable not found: {key}")
     
-    with open(file_path, "w") as file:
-        json.dump(data, file, indent=2)
+    old_revision = revisions.current(file_path)
+    revision = await _apply_changes(file_path, data, operations)
+    if operations:
+        # Only the requests using this variable need to be resolved again
+        resolvers.variable_changed(file_path, key, new_value, old_revision, revision)
     
     logger.success(f"Successfully saved collection after updating variable")
     return data
 
-async def add_postman_collection_folder(file_path: str, folder_name: str, items: List[dict] = None) -> dict:
+@locks_paths("file_path")
+async def set_postman_collection_variables(file_path: str, variables: dict, expected_revision: int = None) -> dict:
+    """
+    Set several variables of the Postman collection at once. Existing variables are
+    updated in place, new ones are appended in the given order, and the file is written
+    once; the whole change is undone as a single edit.
+
+    Args:
+        file_path: The path to the Postman collection file (string)
+        variables: The variables to set, mapping keys to values (dict)
+                Example: {"base_url": "https://api.example.com", "token": "abc123"}
+        expected_revision: Optional revision the caller last saw; the change is rejected if the collection changed since (int)
+    Returns:
+        The keys that were added and updated, and the new revision (dict)
+    """
+    logger.info(f"Setting {len(variables) if isinstance(variables, dict) else 0} variables in collection: {file_path}")
+
+    # Validate input types
+    file_path = validate_string(file_path, "file_path")
+    variables = validate_dict(variables, "variables")
+    for key, value in variables.items():
+        validate_string(key, "variable key")
+        validate_string(value, f"value of variable '{key}'")
+
+    _check_revision(file_path, expected_revision)
+    data = await _load_collection(file_path)
+
+    operations = []
+    if not isinstance(data.get("variable"), list):
+        logger.warning("Collection has no 'variable' array, creating one")
+        operations.append({"op": "add", "path": "/variable", "value": []})
+        index, length = {}, 0
+    else:
+        index, length = dict(collection_cache.variable_index(file_path, data)), len(data["variable"])
+
+    added, updated, changed = [], [], {}
+    for key, value in variables.items():
+        position = index.get(key)
+        if position is None:
+            operations.append({"op": "add", "path": "/variable/-", "value": {"key": key, "value": value}})
+            index[key] = length
+            length += 1
+            added.append(key)
+        else:
+            if data["variable"][position].get("value") == value:
+                continue
+            operations.append({"op": "add", "path": pointer("variable", position, "value"), "value": value})
+            updated.append(key)
+        changed[key] = value
+
+    old_revision = revisions.current(file_path)
+    revision = await _apply_changes(file_path, data, operations)
+    if changed:
+        resolvers.variables_changed(file_path, changed, old_revision, revision)
+
+    logger.success(f"Added {len(added)} and updated {len(updated)} variables in {file_path}")
+    return {"added": added, "updated": updated, "revision": revision}
+
+async def add_postman_collection_folder(file_path: str, folder_name: str, items: List[dict] = None, expected_revision: int = None) -> dict:
     """
     Add a folder to the Postman collection
     
@@ -407,6 +702,7 @@ async def add_postman_collection_folder(file_path: str, folder_name: str, items:
         file_path: The path to the Postman collection file (string)
         folder_name: The name of the folder (string)
         items: Optional list of item dictionaries to add to the folder (list of dicts)
+        expected_revision: Optional revision the caller last saw; the change is rejected if the collection changed since (int)
     Returns:
         The updated Postman collection data (dict)
     """
@@ -428,12 +724,13 @@ async def add_postman_collection_folder(file_path: str, folder_name: str, items:
     logger.debug(f"Created folder '{folder_name}' with {len(folder['item'])} items")
     
     # Use existing function to add the folder as an item
-    result = await add_postman_collection_item(file_path, folder)
+    result = await add_postman_collection_item(file_path, folder, expected_revision=expected_revision)
     logger.success(f"Successfully added folder '{folder_name}' to collection")
     
     return result
 
-async def add_item_to_folder(file_path: str, folder_name: str, item: dict) -> dict:
+@locks_paths("file_path")
+async def add_item_to_folder(file_path: str, folder_name: str, item: dict, expected_revision: int = None) -> dict:
     """
     Add an item to a specific folder in the Postman collection
     
@@ -441,6 +738,7 @@ async def add_item_to_folder(file_path: str, folder_name: str, item: dict) -> di
         file_path: The path to the Postman collection file (string)
         folder_name: The name of the folder to add the item to (string)
         item: The item dictionary to add (dict)
+        expected_revision: Optional revision the caller last saw; the change is rejected if the collection changed since (int)
     Returns:
         The updated Postman collection data (dict)
     """
@@ -451,35 +749,242 @@ async def add_item_to_folder(file_path: str, folder_name: str, item: dict) -> di
     folder_name = validate_string(folder_name, "folder_name")
     item = validate_dict(item, "item")
     
-    if not is_a_valid_item(item):
-        logger.error(f"Invalid item structure: {item}")
-        raise ValueError("Invalid item")
-    
-    with open(file_path, "r") as file:
-        data = json.load(file)
+    _check_revision(file_path, expected_revision)
+    data = await _load_collection(file_path, folders=[folder_name])
     
     if "item" not in data:
         logger.warning("Collection has no items, cannot find folder")
         raise ValueError(f"Collection has no items, cannot find folder '{folder_name}'")
     
-    folder_found = False
-    for collection_item in data["item"]:
+    operations = []
+    for index, collection_item in enumerate(data["item"]):
         if collection_item.get("name") == folder_name and "item" in collection_item:
-            collection_item["item"].append(item)
-            folder_found = True
+            _validate_subtree(item, "items", f"$.item[{index}].item[{len(collection_item['item'])}]", "item")
+            operations.append({"op": "add", "path": pointer("item", index, "item", "-"), "value": item})
             logger.debug(f"Added item to folder '{folder_name}'")
             break
     
-    if not folder_found:
+    if not operations:
         logger.warning(f"Folder '{folder_name}' not found in collection")
         raise ValueError(f"Folder '{folder_name}' not found in collection")
     
-    with open(file_path, "w") as file:
-        json.dump(data, file, indent=2)
+    await _apply_changes(file_path, data, operations, folders=[folder_name])
     
     logger.success(f"Successfully added item to folder '{folder_name}'")
     return data
 
+async def diff_postman_collections(old_file_path: str, new_file_path: str) -> dict:
+    """
+    Structurally compare two Postman collections. Requests are matched by folder path, name, method and URL
+    
+    Args:
+        old_file_path: The path to the original Postman collection file (string)
+        new_file_path: The path to the Postman collection file to compare against it (string)
+    Returns:
+        The keys of the added, removed and changed requests, the differing top-level sections
+        and the number of unchanged requests (dict)
+    """
+    logger.info(f"Diffing Postman collections: {old_file_path} -> {new_file_path}")
+    
+    async with path_lock(old_file_path, new_file_path):
+        old = await read_postman_collection(old_file_path)
+        new = await read_postman_collection(new_file_path)
+        result = await run_blocking(diff_collections, old, new)
+    logger.success(
+        f"Diff complete: {len(result['added'])} added, {len(result['removed'])} removed, {len(result['changed'])} changed"
+    )
+    return result
+
+async def merge_postman_collections(base_file_path: str, ours_file_path: str, theirs_file_path: str,
+                                    output_file_path: str, prefer: str = "ours") -> dict:
+    """
+    Three-way merge of two Postman collections that derive from a common base, e.g. a collection
+    regenerated from code (theirs) and a hand-edited copy (ours)
+    
+    Args:
+        base_file_path: The path to the common ancestor collection (string)
+        ours_file_path: The path to our version of the collection (string)
+        theirs_file_path: The path to their version of the collection (string)
+        output_file_path: The path where the merged collection is written, must be .json (string)
+        prefer: Which side wins when both changed the same request or folder: "ours" or "theirs" (string)
+    Returns:
+        A dict with the output_file_path, the conflicting keys and the merged collection
+    """
+    logger.info(f"Merging Postman collections into {output_file_path} (base: {base_file_path})")
+    
+    output_file_path = validate_string(output_file_path, "output_file_path")
+    prefer = validate_string(prefer, "prefer")
+    if not output_file_path.endswith(".json"):
+        logger.error(f"Invalid file extension for {output_file_path}, must be .json")
+        raise ValueError(f"{output_file_path} is not a JSON file")
+    
+    async with path_lock(base_file_path, ours_file_path, theirs_file_path, output_file_path):
+        # The versions may each have a blob store; the merged collection is written with the payloads inlined
+        base = await read_inlined_collection(base_file_path)
+        ours = await read_inlined_collection(ours_file_path)
+        theirs = await read_inlined_collection(theirs_file_path)
+        
+        merged, conflicts = await run_blocking(merge_collections, base, ours, theirs, prefer=prefer)
+        if conflicts:
+            logger.warning(f"Merge resolved {len(conflicts)} conflict(s) in favour of {prefer}")
+        
+        await _save_collection(output_file_path, merged)
+        edit_history.clear(output_file_path)
+    
+    logger.success(f"Merged collection written to {output_file_path}")
+    return {"output_file_path": output_file_path, "conflicts": conflicts, "collection": merged}
+
+async def shard_postman_collection(file_path: str, output_dir: str) -> dict:
+    """
+    Split a Postman collection into a sharded collection: a directory with a manifest
+    (collection.json) and one file per top-level folder. The manifest path can then be
+    passed to every other tool, which reads and writes only the folders it touches.
+    Top-level folder names must be unique.
+
+    Args:
+        file_path: The path to the Postman collection file to split (string)
+        output_dir: The directory where the sharded collection is written (string)
+    Returns:
+        The path of the manifest and the shard file of every folder (dict)
+    """
+    logger.info(f"Sharding Postman collection {file_path} into {output_dir}")
+
+    output_dir = validate_string(output_dir, "output_dir")
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    async with path_lock(file_path, manifest_path):
+        collection = await read_postman_collection(file_path)
+        # The shards keep the blob references, so the blobs go to the store of the manifest
+        await run_blocking(copy_blobs, collection, BlobStore(file_path), BlobStore(manifest_path))
+        shards = await run_blocking(split_collection, collection, output_dir)
+    collection_cache.invalidate(manifest_path)
+    revisions.bump(manifest_path)
+    edit_history.clear(manifest_path)
+    await notify_change(manifest_path, list(shards))
+
+    logger.success(f"Sharded collection written to {output_dir} with {len(shards)} folder shards")
+    return {"manifest_path": manifest_path, "shards": shards}
+
+async def assemble_postman_collection(file_path: str, output_file_path: str) -> dict:
+    """
+    Assemble a sharded collection, or a collection with payloads in a blob store, into a
+    self-contained single-file Postman collection, e.g. to share or import it
+
+    Args:
+        file_path: The path to the collection, or to the manifest (collection.json) of a sharded collection (string)
+        output_file_path: The path of the single-file collection to write, must be .json (string)
+    Returns:
+        A dict with the output_file_path and the number of top-level items
+    """
+    logger.info(f"Assembling sharded collection {file_path} into {output_file_path}")
+
+    output_file_path = validate_string(output_file_path, "output_file_path")
+    if not output_file_path.endswith(".json"):
+        logger.error(f"Invalid file extension for {output_file_path}, must be .json")
+        raise ValueError(f"{output_file_path} is not a JSON file")
+
+    async with path_lock(file_path, output_file_path):
+        # A copy, so that editing the assembled collection never touches the cached shards
+        collection = await run_blocking(copy.deepcopy, await read_inlined_collection(file_path))
+        await _save_collection(output_file_path, collection)
+        edit_history.clear(output_file_path)
+
+    logger.success(f"Assembled collection written to {output_file_path}")
+    return {"output_file_path": output_file_path, "items": len(collection.get("item", []))}
+
+@locks_paths("file_path")
+async def store_postman_payloads(file_path: str, min_bytes: int = DEFAULT_MIN_BLOB_BYTES,
+                                 expected_revision: int = None) -> dict:
+    """
+    Move the large raw request bodies and example response bodies of the collection into
+    a content-addressed blob store next to it (<name>.blobs), replacing each one with a
+    "blob:sha256:<hash>" reference. Identical payloads are stored once, edits no longer
+    rewrite them, and exports, runs and assembled collections get them inlined again.
+    Can be called again after adding requests; the change can be undone.
+
+    Args:
+        file_path: The path to the Postman collection file (string)
+        min_bytes: Payloads smaller than this many bytes stay in the collection, default 1024 (int)
+        expected_revision: Optional revision the caller last saw; the change is rejected if the collection changed since (int)
+    Returns:
+        The blob store directory, the number of payloads replaced, of distinct payloads and of
+        new blobs, the bytes moved out of the collection and the new revision (dict)
+    """
+    logger.info(f"Storing payloads of Postman collection {file_path} in its blob store")
+
+    file_path = validate_string(file_path, "file_path")
+    if isinstance(min_bytes, bool) or not isinstance(min_bytes, int):
+        raise TypeError(f"min_bytes must be an integer, got {type(min_bytes).__name__}")
+    if min_bytes < 1:
+        raise ValueError(f"min_bytes must be at least 1, got {min_bytes}")
+
+    _check_revision(file_path, expected_revision)
+    data = await _load_collection(file_path, whole=True)
+    store = BlobStore(file_path)
+    operations, summary = await run_blocking(store_payloads, data, store, min_bytes)
+    revision = await _apply_changes(file_path, data, operations, folders=folders_of(operations, data))
+
+    logger.success(f"Stored {summary['payloads']} payload(s) of {file_path} as {summary['distinct_payloads']} blob(s)")
+    return {"file_path": file_path, "blob_dir": store.directory, **summary, "revision": revision}
+
+@locks_paths("file_path")
+async def _replay_history(file_path: str, undo: bool, expected_revision: int = None) -> dict:
+    """Apply the inverse (undo) or forward (redo) patch of the last recorded edit"""
+    action = "undo" if undo else "redo"
+    file_path = validate_string(file_path, "file_path")
+    _check_revision(file_path, expected_revision)
+    
+    current_revision = revisions.current(file_path)
+    if undo:
+        entry = edit_history.pop_undo(file_path, current_revision)
+    else:
+        entry = edit_history.pop_redo(file_path, current_revision)
+    
+    data = await _load_collection(file_path, folders=entry.folders)
+    try:
+        apply_patch(data, entry.inverse if undo else entry.forward)
+    except ValueError:
+        logger.error(f"Could not {action} last change of {file_path}, discarding its history")
+        edit_history.clear(file_path)
+        raise
+    revision = await _save_collection(file_path, data, folders=entry.folders)
+    
+    if undo:
+        edit_history.push_undone(file_path, entry, revision)
+    else:
+        edit_history.push_redone(file_path, entry, revision)
+    logger.debug(f"Patch of {len(entry.forward)} operation(s) replayed, history: {edit_history.depth(file_path)}")
+    return data
+
+async def undo_postman_change(file_path: str, expected_revision: int = None) -> dict:
+    """
+    Undo the most recent change made to the Postman collection through these tools
+    
+    Args:
+        file_path: The path to the Postman collection file (string)
+        expected_revision: Optional revision the caller last saw; the undo is rejected if the collection changed since (int)
+    Returns:
+        The updated Postman collection data (dict)
+    """
+    logger.info(f"Undoing last change in collection: {file_path}")
+    data = await _replay_history(file_path, undo=True, expected_revision=expected_revision)
+    logger.success(f"Successfully undid last change in collection")
+    return data
+
+async def redo_postman_change(file_path: str, expected_revision: int = None) -> dict:
+    """
+    Redo the most recently undone change of the Postman collection
+    
+    Args:
+        file_path: The path to the Postman collection file (string)
+        expected_revision: Optional revision the caller last saw; the redo is rejected if the collection changed since (int)
+    Returns:
+        The updated Postman collection data (dict)
+    """
+    logger.info(f"Redoing last undone change in collection: {file_path}")
+    data = await _replay_history(file_path, undo=False, expected_revision=expected_revision)
+    logger.success(f"Successfully redid last undone change in collection")
+    return data
+
 if __name__ == "__main__":
     import asyncio
     
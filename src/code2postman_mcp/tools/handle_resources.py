@@ -0,0 +1,171 @@
+"""
+Expose Postman collections as MCP resources served from the in-memory
+collection cache, and push resource-updated notifications to subscribed
+clients when a tool modifies a collection.
+
+    postman://<path>                  the whole collection
+    postman://<path>/folder/<name>    one top-level folder (name URL-encoded)
+"""
+import os
+import re
+import json
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import quote, unquote
+from mcp.server.fastmcp.resources import ResourceTemplate
+from mcp.server.session import ServerSession
+from pydantic import AnyUrl
+from code2postman_mcp.tools.handle_postman import _load_collection, validate_string
+from code2postman_mcp.utils.collection_cache import add_change_listener, collection_cache
+from code2postman_mcp.utils.executor import path_lock, run_blocking
+from code2postman_mcp.utils.shards import is_folder, is_sharded, strip_manifest
+from loguru import logger
+
+COLLECTION_URI_TEMPLATE = "postman://{path}"
+FOLDER_URI_TEMPLATE = "postman://{path}/folder/{name}"
+
+
+def collection_uri(file_path: str, folder: Optional[str] = None) -> str:
+    """Return the resource URI of a collection, or of one of its top-level folders"""
+    uri = f"postman://{quote(os.path.abspath(file_path))}"
+    if folder is not None:
+        uri += f"/folder/{quote(folder, safe='')}"
+    return uri
+
+
+class PathResourceTemplate(ResourceTemplate):
+    """
+    Resource template whose parameters are matched with an explicit regex.
+    The default FastMCP matcher does not allow `/` inside a parameter, which
+    every file path contains.
+    """
+    pattern: str
+
+    def matches(self, uri: str) -> Optional[Dict[str, Any]]:
+        match = re.match(self.pattern, uri)
+        if match is None:
+            return None
+        return {key: unquote(value) for key, value in match.groupdict().items()}
+
+
+async def _cached_entry(path: str):
+    """The cache entry of the collection; compacted entries are expanded on the I/O thread pool"""
+    if collection_cache.is_compacted(path):
+        return await run_blocking(collection_cache.get_entry, path)
+    return collection_cache.get_entry(path)
+
+
+async def read_collection_resource(path: str) -> str:
+    """
+    Read a Postman collection as JSON text. Unchanged collections are served
+    from memory without reading or parsing the file again.
+    """
+    path = validate_string(path, "path")
+    async with path_lock(path):
+        entry = await _cached_entry(path)
+        if entry is None:
+            logger.debug(f"Loading collection resource from disk: {path}")
+            await _load_collection(path)
+            entry = collection_cache.get_entry(path)
+            if entry is None:
+                raise FileNotFoundError(f"{path} does not exist")
+        if is_sharded(entry.data):
+            # Folder shards may change on their own, so sharded collections are not kept as text
+            data = strip_manifest(await _load_collection(path, whole=True))
+            return await run_blocking(json.dumps, data, indent=2)
+        return await run_blocking(collection_cache.text, entry)
+
+
+async def read_folder_resource(path: str, name: str) -> str:
+    """
+    Read one top-level folder of a Postman collection as JSON text, served
+    from memory while the collection is unchanged.
+    """
+    path = validate_string(path, "path")
+    name = validate_string(name, "name")
+    async with path_lock(path):
+        entry = await _cached_entry(path)
+        if entry is None:
+            await _load_collection(path)
+            entry = collection_cache.get_entry(path)
+            if entry is None:
+                raise FileNotFoundError(f"{path} does not exist")
+        if is_sharded(entry.data):
+            data = await _load_collection(path, folders=[name])
+            folder = next((item for item in data.get("item", []) if is_folder(item) and item["name"] == name), None)
+            if folder is None:
+                raise ValueError(f"Folder '{name}' not found in collection")
+            return await run_blocking(json.dumps, folder, indent=2)
+        text = await run_blocking(collection_cache.text, entry, name)
+    if text is None:
+        raise ValueError(f"Folder '{name}' not found in collection")
+    return text
+
+
+class ResourceSubscriptions:
+    """Track which client sessions subscribed to which resource URIs"""
+
+    def __init__(self):
+        self._sessions: Dict[str, Set[ServerSession]] = {}
+
+    def subscribe(self, uri: str, session: ServerSession) -> None:
+        self._sessions.setdefault(uri, set()).add(session)
+        logger.debug(f"Subscribed to resource: {uri}")
+
+    def unsubscribe(self, uri: str, session: ServerSession) -> None:
+        sessions = self._sessions.get(uri)
+        if sessions is not None:
+            sessions.discard(session)
+            if not sessions:
+                del self._sessions[uri]
+
+    def subscribed(self, uri: str) -> Set[ServerSession]:
+        return set(self._sessions.get(uri, ()))
+
+    async def notify(self, file_path: str, folders: List[str]) -> None:
+        """Send resource-updated notifications for a collection and its changed folders"""
+        uris = [collection_uri(file_path)] + [collection_uri(file_path, folder) for folder in folders]
+        for uri in uris:
+            for session in self.subscribed(uri):
+                try:
+                    await session.send_resource_updated(AnyUrl(uri))
+                except Exception as e:
+                    logger.warning(f"Dropping subscription to {uri} after failed notification: {str(e)}")
+                    self.unsubscribe(uri, session)
+
+
+subscriptions = ResourceSubscriptions()
+
+
+def register_resources(mcp) -> None:
+    """Register the collection resource templates and subscription handlers on a FastMCP server"""
+    templates = [
+        (read_folder_resource, FOLDER_URI_TEMPLATE, r"^postman://(?P<path>.+?\.json)/folder/(?P<name>[^/]+)$"),
+        (read_collection_resource, COLLECTION_URI_TEMPLATE, r"^postman://(?P<path>.+?\.json)$"),
+    ]
+    for fn, uri_template, pattern in templates:
+        base = ResourceTemplate.from_function(fn, uri_template=uri_template, mime_type="application/json")
+        template = PathResourceTemplate(**base.model_dump(), fn=base.fn, pattern=pattern)
+        # FastMCP has no public hook for custom template matching
+        mcp._resource_manager._templates[uri_template] = template
+
+    add_change_listener(subscriptions.notify)
+    server = mcp._mcp_server
+
+    @server.subscribe_resource()
+    async def handle_subscribe(uri: AnyUrl) -> None:
+        subscriptions.subscribe(str(uri), server.request_context.session)
+
+    @server.unsubscribe_resource()
+    async def handle_unsubscribe(uri: AnyUrl) -> None:
+        subscriptions.unsubscribe(str(uri), server.request_context.session)
+
+    # The low-level server always advertises subscribe=False
+    get_capabilities = server.get_capabilities
+
+    def get_capabilities_with_subscribe(*args, **kwargs):
+        capabilities = get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    server.get_capabilities = get_capabilities_with_subscribe
@@ -0,0 +1,236 @@
+import os
+import json
+import time
+from code2postman_mcp.consts.runner import DEFAULT_CONCURRENCY, DEFAULT_PER_HOST_LIMIT, DEFAULT_TIMEOUT_SECONDS
+from code2postman_mcp.tools.handle_postman import read_inlined_collection, validate_dict, validate_string
+from code2postman_mcp.utils.collection_cache import revisions
+from code2postman_mcp.utils.environments import environment_store
+from code2postman_mcp.utils.executor import run_blocking
+from code2postman_mcp.utils.metrics import json_timer, path_size, record_write
+from code2postman_mcp.utils.request_parts import iter_indexed_request_items
+from code2postman_mcp.utils.variables import Resolver, resolvers
+from loguru import logger
+
+
+def _validate_positive_int(value, param_name: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise TypeError(f"{param_name} must be an integer, got {type(value).__name__}")
+    if value < 1:
+        raise ValueError(f"{param_name} must be at least 1, got {value}")
+    return value
+
+
+def _validate_positive_number(value, param_name: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError(f"{param_name} must be a number, got {type(value).__name__}")
+    if value <= 0:
+        raise ValueError(f"{param_name} must be a positive number, got {value}")
+    return value
+
+
+async def _resolver_for(file_path: str, collection: dict, environment_file: str = None, overrides: dict = None) -> Resolver:
+    """
+    Return the cached resolver of the collection with the given environment file, or the
+    active environment if there is none, and overrides
+    """
+    if environment_file is not None:
+        environment_file = validate_string(environment_file, "environment_file")
+        if not os.path.isfile(environment_file):
+            logger.error(f"Environment file not found: {environment_file}")
+            raise FileNotFoundError(f"{environment_file} does not exist")
+        environment = await run_blocking(environment_store.get, environment_file)
+    else:
+        environment = await run_blocking(environment_store.active)
+    if environment is not None:
+        logger.debug(f"Resolving variables with environment: {environment.file_path}")
+    if overrides is not None:
+        overrides = {str(key): str(value) for key, value in validate_dict(overrides, "overrides").items()}
+    return resolvers.get(file_path, revisions.current(file_path), collection,
+                         environment=environment.values() if environment is not None else None,
+                         environment_key=environment.key if environment is not None else None,
+                         overrides=overrides)
+
+
+def _write_report(report_path: str, report: dict) -> None:
+    with open(report_path, "w") as file, json_timer("dump"):
+        json.dump(report, file, indent=2)
+    record_write(path_size(report_path))
+
+
+async def run_postman_collection(file_path: str, folder: str = None, iterations: int = 1,
+                                 concurrency: int = DEFAULT_CONCURRENCY, per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                                 timeout: float = DEFAULT_TIMEOUT_SECONDS, scripts: str = "safe",
+                                 environment_file: str = None, overrides: dict = None) -> dict:
+    """
+    Run the requests of a Postman collection and report their status codes and latencies.
+    {{variables}} are resolved from the collection variables, then the environment file, then
+    the overrides, the later ones taking precedence. Event scripts are not executed:
+    with scripts="safe", literal pm.*.set("name", "value") calls in pre-request scripts and
+    pm.response.to.have.status(code) checks in test scripts are applied; with scripts="skip"
+    they are ignored.
+
+    Args:
+        file_path: The path to the Postman collection file (string)
+        folder: Optional name of a top-level folder to run instead of the whole collection (string)
+        iterations: How many times each request is sent (int)
+        concurrency: Maximum number of requests in flight at once (int)
+        per_host_limit: Maximum number of requests in flight to the same host (int)
+        timeout: Timeout of each request, in seconds (float)
+        scripts: "safe" or "skip" (string)
+        environment_file: Optional path to a Postman environment file, the active environment if omitted (string)
+        overrides: Optional variable values that take precedence over all others (dict)
+    Returns:
+        A summary and, for every request, its status codes, errors and latency percentiles in milliseconds;
+        a request fails on transport errors, failed status checks or, without checks, 5xx responses (dict)
+    """
+    logger.info(f"Running Postman collection: {file_path}")
+
+    file_path = validate_string(file_path, "file_path")
+    if folder is not None:
+        folder = validate_string(folder, "folder")
+    iterations = _validate_positive_int(iterations, "iterations")
+    concurrency = _validate_positive_int(concurrency, "concurrency")
+    per_host_limit = _validate_positive_int(per_host_limit, "per_host_limit")
+    scripts = validate_string(scripts, "scripts")
+    timeout = _validate_positive_number(timeout, "timeout")
+
+    # The HTTP runner is only imported once a collection is actually run
+    from code2postman_mcp.utils.runner import CollectionRunner, prepare_requests, run_requests
+
+    collection = await read_inlined_collection(file_path)
+    resolver = await _resolver_for(file_path, collection, environment_file, overrides)
+    plans = prepare_requests(collection, folder=folder, scripts=scripts, resolver=resolver)
+    logger.debug(f"Prepared {len(plans)} requests from {file_path}")
+
+    start = time.perf_counter()
+    async with CollectionRunner(concurrency, per_host_limit, timeout) as runner:
+        results = await run_requests(plans, runner, iterations)
+    duration_ms = (time.perf_counter() - start) * 1000
+
+    failed = sum(1 for result in results if not result["ok"])
+    if failed:
+        logger.warning(f"{failed} of {len(results)} requests failed in {file_path}")
+    else:
+        logger.success(f"All {len(results)} requests succeeded in {file_path}")
+    return {
+        "summary": {
+            "requests": len(results),
+            "runs": len(results) * iterations,
+            "failed": failed,
+            "duration_ms": round(duration_ms, 3),
+        },
+        "requests": results,
+    }
+
+
+async def load_test_postman_collection(file_path: str, duration: float = None, iterations: int = None,
+                                       rps: float = None, workers: int = None, folder: str = None,
+                                       concurrency: int = DEFAULT_CONCURRENCY,
+                                       per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                                       timeout: float = DEFAULT_TIMEOUT_SECONDS, scripts: str = "safe",
+                                       environment_file: str = None, overrides: dict = None) -> dict:
+    """
+    Load-test a service by replaying the requests of a Postman collection, in order, for a duration
+    or a number of iterations (whichever ends first), optionally at a target rate. The JSON report,
+    with latency histograms, error rates and throughput in total, per folder and per request, is
+    written next to the collection as <name>.loadtest.json.
+
+    Args:
+        file_path: The path to the Postman collection file (string)
+        duration: Maximum duration of the test, in seconds (float)
+        iterations: Maximum number of passes over the requests (int)
+        rps: Target number of requests started per second; as fast as possible if omitted (float)
+        workers: Number of concurrent workers, defaults to concurrency (int)
+        folder: Optional name of a top-level folder to replay instead of the whole collection (string)
+        concurrency: Maximum number of requests in flight at once (int)
+        per_host_limit: Maximum number of requests in flight to the same host (int)
+        timeout: Timeout of each request, in seconds (float)
+        scripts: "safe" or "skip", as for run_postman_collection (string)
+        environment_file: Optional path to a Postman environment file, the active environment if omitted (string)
+        overrides: Optional variable values that take precedence over all others (dict)
+    Returns:
+        The path of the report and its total and per-folder statistics (dict)
+    """
+    logger.info(f"Load testing Postman collection: {file_path}")
+
+    file_path = validate_string(file_path, "file_path")
+    if folder is not None:
+        folder = validate_string(folder, "folder")
+    if duration is None and iterations is None:
+        raise ValueError("Either duration or iterations is required")
+    if duration is not None:
+        duration = _validate_positive_number(duration, "duration")
+    if iterations is not None:
+        iterations = _validate_positive_int(iterations, "iterations")
+    if rps is not None:
+        rps = _validate_positive_number(rps, "rps")
+    if workers is not None:
+        workers = _validate_positive_int(workers, "workers")
+    concurrency = _validate_positive_int(concurrency, "concurrency")
+    per_host_limit = _validate_positive_int(per_host_limit, "per_host_limit")
+    scripts = validate_string(scripts, "scripts")
+    timeout = _validate_positive_number(timeout, "timeout")
+
+    from code2postman_mcp.utils.load_test import run_load_test
+    from code2postman_mcp.utils.runner import CollectionRunner, prepare_requests
+
+    collection = await read_inlined_collection(file_path)
+    resolver = await _resolver_for(file_path, collection, environment_file, overrides)
+    plans = prepare_requests(collection, folder=folder, scripts=scripts, resolver=resolver)
+
+    async with CollectionRunner(concurrency, per_host_limit, timeout) as runner:
+        report = await run_load_test(plans, runner, duration=duration, iterations=iterations,
+                                     rps=rps, workers=workers)
+    report = {"collection": os.path.abspath(file_path), **report}
+
+    report_path = f"{os.path.splitext(file_path)[0]}.loadtest.json"
+    await run_blocking(_write_report, report_path, report)
+
+    logger.success(f"Load test report written to {report_path}")
+    return {
+        "report_path": report_path,
+        "elapsed_seconds": report["elapsed_seconds"],
+        "total": {**report["total"], "latency_ms": {
+            key: value for key, value in report["total"]["latency_ms"].items() if key != "buckets"
+        }},
+        "folders": report["folders"],
+    }
+
+
+async def preview_postman_request(file_path: str, item_name: str, environment_file: str = None,
+                                  overrides: dict = None) -> dict:
+    """
+    Show a request of a Postman collection with its {{variables}} resolved, without sending it.
+    Variables come from the collection, then the environment file, then the overrides.
+
+    Args:
+        file_path: The path to the Postman collection file (string)
+        item_name: The name of the request, or its folder path such as "Users/Get User" (string)
+        environment_file: Optional path to a Postman environment file, the active environment if omitted (string)
+        overrides: Optional variable values that take precedence over all others (dict)
+    Returns:
+        The resolved method, URL, headers and body, and the variables that are not defined (dict)
+    """
+    logger.info(f"Previewing request '{item_name}' of collection: {file_path}")
+
+    file_path = validate_string(file_path, "file_path")
+    item_name = validate_string(item_name, "item_name")
+
+    collection = await read_inlined_collection(file_path)
+    resolver = await _resolver_for(file_path, collection, environment_file, overrides)
+
+    for folders, index_path, item in iter_indexed_request_items(collection.get("item", [])):
+        path = "/".join(folders + (str(item.get("name", "")),))
+        if item_name in (path, item.get("name")):
+            resolved = resolver.resolve(item, key=index_path)
+            return {
+                "name": path,
+                "method": resolved.method,
+                "url": resolved.url,
+                "headers": [{"key": key, "value": value} for key, value in resolved.headers],
+                "body": resolved.body,
+                "undefined_variables": resolved.undefined,
+            }
+
+    logger.warning(f"Request '{item_name}' not found in {file_path}")
+    raise ValueError(f"Request '{item_name}' not found in collection")
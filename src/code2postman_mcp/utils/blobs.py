@@ -0,0 +1,215 @@
+"""
+Content-addressed storage of the large payloads of a collection.
+
+Raw request bodies and example response bodies can be moved out of the
+collection into a blob store next to it, one file per distinct payload named
+by its SHA-256:
+
+    <dir>/<name>.json                      the collection
+    <dir>/<name>.blobs/<hh>/<sha256>       one payload, UTF-8 text
+
+In the collection the payload string is replaced by a reference such as
+"blob:sha256:<hex>", so edits rewrite a small file and identical payloads are
+stored once. Exports, runs and assembled collections get the payloads
+inlined again by `inline_payloads`; tools writing the collection to a new
+path carry the referenced blobs along with `copy_blobs`. Blobs are never
+deleted by the tools, so that undoing an edit can bring a reference back.
+"""
+import os
+import re
+import copy
+import hashlib
+import threading
+from typing import Any, Dict, Iterator, List, Tuple
+from code2postman_mcp.utils.json_patch import pointer
+from code2postman_mcp.utils.metrics import record_read, record_write
+from loguru import logger
+
+BLOBS_SUFFIX = ".blobs"
+BLOB_PREFIX = "blob:sha256:"
+# Payloads of at least this many bytes are moved to the blob store by default
+DEFAULT_MIN_BLOB_BYTES = 1024
+
+_REFERENCE = re.compile(r"blob:sha256:([0-9a-f]{64})")
+
+# (JSON pointer tokens, payload string) of a payload in the collection
+Payload = Tuple[Tuple[Any, ...], str]
+
+
+def is_blob_reference(value: Any) -> bool:
+    return isinstance(value, str) and _REFERENCE.fullmatch(value) is not None
+
+
+def blob_store_dir(file_path: str) -> str:
+    """Directory of the blob store of a collection file"""
+    return f"{os.path.splitext(os.path.abspath(file_path))[0]}{BLOBS_SUFFIX}"
+
+
+class BlobStore:
+    """The payloads of one collection, keyed by their SHA-256"""
+
+    def __init__(self, file_path: str):
+        self.directory = blob_store_dir(file_path)
+        self._lock = threading.Lock()
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def exists(self) -> bool:
+        return os.path.isdir(self.directory)
+
+    def put(self, payload: str) -> Tuple[str, bool]:
+        """Store a payload; returns its reference and whether a new blob was written"""
+        data = payload.encode("utf-8", "surrogatepass")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        with self._lock:
+            if os.path.exists(path):
+                return BLOB_PREFIX + digest, False
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        record_write(len(data))
+        return BLOB_PREFIX + digest, True
+
+    def get(self, reference: str) -> str:
+        """The payload a reference points to"""
+        match = _REFERENCE.fullmatch(reference)
+        if match is None:
+            raise ValueError(f"Invalid blob reference: {reference}")
+        path = self._path(match.group(1))
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Blob {reference} not found in {self.directory}")
+        with open(path, "rb") as file:
+            data = file.read()
+        record_read(len(data))
+        return data.decode("utf-8", "surrogatepass")
+
+
+def _body_payload(body: Any, tokens: Tuple[Any, ...]) -> Iterator[Payload]:
+    if isinstance(body, dict) and isinstance(body.get("raw"), str):
+        yield tokens + ("raw",), body["raw"]
+
+
+def iter_payloads(items: List[Any], tokens: Tuple[Any, ...] = ("item",)) -> Iterator[Payload]:
+    """
+    Every raw request body and example response body of the items, with the
+    tokens of its JSON pointer: request.body.raw, response[].body and
+    response[].originalRequest.body.raw
+    """
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        item_tokens = tokens + (index,)
+        if isinstance(item.get("item"), list):
+            yield from iter_payloads(item["item"], item_tokens + ("item",))
+        request = item.get("request")
+        if isinstance(request, dict):
+            yield from _body_payload(request.get("body"), item_tokens + ("request", "body"))
+        responses = item.get("response")
+        if not isinstance(responses, list):
+            continue
+        for position, response in enumerate(responses):
+            if not isinstance(response, dict):
+                continue
+            response_tokens = item_tokens + ("response", position)
+            if isinstance(response.get("body"), str):
+                yield response_tokens + ("body",), response["body"]
+            original = response.get("originalRequest")
+            if isinstance(original, dict):
+                yield from _body_payload(original.get("body"), response_tokens + ("originalRequest", "body"))
+
+
+def store_payloads(data: dict, store: BlobStore, min_bytes: int = DEFAULT_MIN_BLOB_BYTES) -> Tuple[List[dict], dict]:
+    """
+    Write the payloads of at least `min_bytes` to the store. Returns the JSON
+    Patch operations replacing them with references, and a summary of what
+    was stored. Blocking: call it from the I/O thread pool.
+    """
+    operations = []
+    summary = {"payloads": 0, "blobs_written": 0, "bytes_moved": 0}
+    written: Dict[str, str] = {}
+    for tokens, payload in iter_payloads(data.get("item", [])):
+        if is_blob_reference(payload):
+            continue
+        size = len(payload.encode("utf-8", "surrogatepass"))
+        if size < min_bytes:
+            continue
+        reference = written.get(payload)
+        if reference is None:
+            reference, new = store.put(payload)
+            written[payload] = reference
+            summary["blobs_written"] += new
+        operations.append({"op": "replace", "path": pointer(*tokens), "value": reference})
+        summary["payloads"] += 1
+        summary["bytes_moved"] += size
+    summary["distinct_payloads"] = len(written)
+    return operations, summary
+
+
+def _set_copied(document: Any, tokens: Tuple[Any, ...], value: Any, copies: set) -> None:
+    """Set a value in a copy of the document, copying only the containers on its path"""
+    for token in tokens[:-1]:
+        child = document[token]
+        if id(child) not in copies:
+            child = document[token] = copy.copy(child)
+            copies.add(id(child))
+        document = child
+    document[tokens[-1]] = value
+
+
+def inline_payloads(data: dict, store: BlobStore) -> dict:
+    """
+    The collection with every blob reference replaced by its payload. The
+    collection itself is returned when it has no reference, otherwise a copy
+    sharing every part that holds no reference. Blocking: call it from the
+    I/O thread pool.
+    """
+    references = [(tokens, payload) for tokens, payload in iter_payloads(data.get("item", []))
+                  if is_blob_reference(payload)]
+    if not references:
+        return data
+    if not store.exists():
+        raise FileNotFoundError(
+            f"The collection references {len(references)} blob payload(s) but its blob store {store.directory} does not exist"
+        )
+    inlined = dict(data)
+    copies = {id(inlined)}
+    payloads: Dict[str, str] = {}
+    for tokens, reference in references:
+        if reference not in payloads:
+            payloads[reference] = store.get(reference)
+        _set_copied(inlined, tokens, payloads[reference], copies)
+    logger.debug("Inlined {} payload reference(s) from {}", len(references), store.directory)
+    return inlined
+
+
+def copy_blobs(data: dict, source: BlobStore, target: BlobStore) -> int:
+    """
+    Copy the blobs the collection references from its store to the store of
+    the new path it is written to. Returns the number of blobs written.
+    Blocking: call it from the I/O thread pool.
+    """
+    if source.directory == target.directory:
+        return 0
+    references = {payload for _, payload in iter_payloads(data.get("item", [])) if is_blob_reference(payload)}
+    written = 0
+    for reference in sorted(references):
+        written += target.put(source.get(reference))[1]
+    if references:
+        logger.debug("Copied {} blob(s) from {} to {}", written, source.directory, target.directory)
+    return written
+
+
+def folders_of(operations: List[dict], data: dict) -> List[str]:
+    """Names of the top-level folders that operations on /item/<index>/... change"""
+    names = []
+    items = data.get("item", [])
+    for operation in operations:
+        index = int(operation["path"].split("/")[2])
+        item = items[index]
+        if isinstance(item, dict) and isinstance(item.get("item"), list) and item.get("name") not in names:
+            names.append(item.get("name"))
+    return names
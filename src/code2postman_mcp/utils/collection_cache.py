@@ -0,0 +1,284 @@
+"""
+In-memory cache of parsed Postman collections, their revision numbers and
+the change notifications emitted when the server's own tools modify a
+collection.
+
+With CODE2POSTMAN_COMPACT_CACHE set, collections that are not among the
+most recently used are kept as a CompactCollection instead of plain dicts,
+and expanded again on their next lookup.
+"""
+import os
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from code2postman_mcp.utils.compact import CompactCollection
+from code2postman_mcp.utils.metrics import json_timer
+from loguru import logger
+
+# Maximum number of parsed collections kept in memory
+MAX_CACHED_COLLECTIONS = 32
+COMPACT_CACHE_ENV = "CODE2POSTMAN_COMPACT_CACHE"
+# Most recently used collections kept as plain dicts when the compact cache is enabled
+COMPACT_HOT_ENTRIES = 1
+
+# (mtime_ns, size) of a collection file
+Fingerprint = Tuple[int, int]
+ChangeListener = Callable[[str, List[str]], Awaitable[None]]
+
+
+def file_fingerprint(file_path: str) -> Optional[Fingerprint]:
+    """Return the (mtime_ns, size) of a file, or None if it cannot be stat'ed"""
+    try:
+        stat = os.stat(file_path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def compact_cache_enabled() -> bool:
+    return os.environ.get(COMPACT_CACHE_ENV, "").lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class CachedCollection:
+    fingerprint: Fingerprint
+    # None while the entry is compacted
+    data: Optional[dict]
+    # Serialized forms (whole collection or one folder), built lazily for resources
+    texts: Dict[Optional[str], str] = field(default_factory=dict)
+    # Position of every collection variable by key, with the list and length it was built from
+    variable_index: Optional[Tuple[list, int, Dict[str, int]]] = None
+    compact: Optional[CompactCollection] = None
+
+
+class CollectionCache:
+    """LRU cache of parsed collections, validated against the file fingerprint"""
+
+    def __init__(self, max_entries: int = MAX_CACHED_COLLECTIONS):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedCollection]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_entry(self, file_path: str) -> Optional[CachedCollection]:
+        """
+        Return the cached entry if the file is unchanged since it was cached,
+        expanding it first if it was compacted
+        """
+        key = os.path.abspath(file_path)
+        fingerprint = file_fingerprint(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.fingerprint != fingerprint:
+                logger.debug(f"Collection changed on disk, dropping cached copy: {key}")
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            compact = entry.compact
+        if compact is not None:
+            data = compact.to_dict()
+            with self._lock:
+                # Another thread may have expanded it meanwhile
+                if entry.data is None:
+                    entry.data = data
+                    entry.compact = None
+        return entry
+
+    def is_compacted(self, file_path: str) -> bool:
+        """Whether the lookup of the collection has to expand it, which is slow for large ones"""
+        with self._lock:
+            entry = self._entries.get(os.path.abspath(file_path))
+            return entry is not None and entry.compact is not None
+
+    def get(self, file_path: str) -> Optional[dict]:
+        entry = self.get_entry(file_path)
+        return entry.data if entry is not None else None
+
+    def put(self, file_path: str, data: dict) -> None:
+        """Cache the parsed collection as it is currently stored on disk"""
+        key = os.path.abspath(file_path)
+        fingerprint = file_fingerprint(key)
+        with self._lock:
+            if fingerprint is None:
+                self._entries.pop(key, None)
+                return
+            previous = self._entries.get(key)
+            self._entries[key] = CachedCollection(fingerprint=fingerprint, data=data)
+            if previous is not None and previous.data is data:
+                # The same document edited in place; lookups verify the index before trusting it
+                self._entries[key].variable_index = previous.variable_index
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def compact_cold(self) -> int:
+        """
+        Compact the entries that are not among the COMPACT_HOT_ENTRIES most
+        recently used, if the compact cache is enabled. Blocking: call it
+        from the I/O thread pool. Returns the number of compacted entries.
+        """
+        if not compact_cache_enabled():
+            return 0
+        with self._lock:
+            cold = [entry for entry in list(self._entries.values())[:-COMPACT_HOT_ENTRIES]
+                    if entry.data is not None]
+        compacted = 0
+        for entry in cold:
+            data = entry.data
+            if data is None:
+                continue
+            compact = CompactCollection(data)
+            with self._lock:
+                # Skip entries replaced or expanded while compacting
+                if entry.data is data:
+                    entry.data = None
+                    entry.compact = compact
+                    entry.texts.clear()
+                    entry.variable_index = None
+                    compacted += 1
+        if compacted:
+            logger.debug("Compacted {} cached collection(s)", compacted)
+        return compacted
+
+    def invalidate(self, file_path: str) -> None:
+        with self._lock:
+            self._entries.pop(os.path.abspath(file_path), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def variable_index(self, file_path: str, data: dict) -> Dict[str, int]:
+        """
+        Return the position of every collection variable in data["variable"] by
+        key, from an index kept with the cached collection instead of scanning
+        the list. The index is rebuilt when it no longer matches the list.
+        The returned dict is shared; copy it before changing it.
+        """
+        variables = data.get("variable")
+        if not isinstance(variables, list):
+            return {}
+        entry = self.get_entry(file_path)
+        cached = entry.variable_index if entry is not None and entry.data is data else None
+        # Adding or removing variables changes the length; replacing the list changes its identity
+        if cached is not None and cached[0] is variables and cached[1] == len(variables):
+            return cached[2]
+        index = {}
+        for position, variable in enumerate(variables):
+            if isinstance(variable, dict) and "key" in variable:
+                index.setdefault(variable["key"], position)
+        if entry is not None and entry.data is data:
+            entry.variable_index = (variables, len(variables), index)
+        return index
+
+    def variable_position(self, file_path: str, data: dict, key: str) -> Optional[int]:
+        """Return the position of the collection variable `key` in data["variable"], or None"""
+        position = self.variable_index(file_path, data).get(key)
+        if position is not None and data["variable"][position].get("key") != key:
+            # A variable was replaced in place; index the list again
+            self.invalidate_variable_index(file_path)
+            position = self.variable_index(file_path, data).get(key)
+        return position
+
+    def invalidate_variable_index(self, file_path: str) -> None:
+        with self._lock:
+            entry = self._entries.get(os.path.abspath(file_path))
+            if entry is not None:
+                entry.variable_index = None
+
+    def text(self, entry: CachedCollection, folder: Optional[str] = None) -> Optional[str]:
+        """
+        Return the JSON text of the collection, or of one of its top-level
+        folders, serializing it only the first time it is requested.
+        """
+        cached = entry.texts.get(folder)
+        if cached is not None:
+            return cached
+        if folder is None:
+            value = entry.data
+        else:
+            value = next(
+                (item for item in entry.data.get("item", []) if item.get("name") == folder and "item" in item),
+                None,
+            )
+            if value is None:
+                return None
+        with json_timer("dump"):
+            text = json.dumps(value, indent=2)
+        entry.texts[folder] = text
+        return text
+
+
+class RevisionTracker:
+    """
+    Monotonically increasing revision number per collection file. The
+    revision is bumped on every write made through the tools and whenever the
+    file fingerprint shows it was changed by someone else. New revisions are
+    seeded from the file mtime (in microseconds) so they keep increasing
+    across server restarts.
+    """
+
+    def __init__(self):
+        self._revisions: Dict[str, Tuple[Optional[Fingerprint], int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _next(previous: Optional[Tuple[Optional[Fingerprint], int]], fingerprint: Optional[Fingerprint]) -> int:
+        revision = previous[1] + 1 if previous is not None else 1
+        if fingerprint is not None:
+            revision = max(revision, fingerprint[0] // 1000)
+        return revision
+
+    def current(self, file_path: str) -> int:
+        """Return the revision of the collection as it is currently stored on disk"""
+        key = os.path.abspath(file_path)
+        fingerprint = file_fingerprint(key)
+        with self._lock:
+            previous = self._revisions.get(key)
+            if previous is not None and previous[0] == fingerprint:
+                return previous[1]
+            revision = self._next(previous, fingerprint)
+            self._revisions[key] = (fingerprint, revision)
+            return revision
+
+    def bump(self, file_path: str) -> int:
+        """Record a write made by the server and return the new revision"""
+        key = os.path.abspath(file_path)
+        fingerprint = file_fingerprint(key)
+        with self._lock:
+            revision = self._next(self._revisions.get(key), fingerprint)
+            self._revisions[key] = (fingerprint, revision)
+            return revision
+
+
+collection_cache = CollectionCache()
+revisions = RevisionTracker()
+
+_listeners: List[ChangeListener] = []
+
+
+def add_change_listener(listener: ChangeListener) -> None:
+    """
+    Register a coroutine called as `listener(file_path, folders)` after a tool
+    writes a collection; `folders` lists the top-level folders that changed.
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_change_listener(listener: ChangeListener) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+async def notify_change(file_path: str, folders: List[str]) -> None:
+    """Call every change listener, logging (not raising) listener failures"""
+    key = os.path.abspath(file_path)
+    for listener in list(_listeners):
+        try:
+            await listener(key, folders)
+        except Exception as e:
+            logger.error(f"Collection change listener failed for {key}: {str(e)}")
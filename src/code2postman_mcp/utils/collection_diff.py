@@ -0,0 +1,210 @@
+"""
+Structural diff and three-way merge of Postman collections.
+
+Requests are matched by their folder path, name, method and URL, folders by
+their path, and both are compared through a hash of their canonical JSON, so
+both operations run in time linear in the size of the collections.
+"""
+import copy
+import json
+import hashlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from code2postman_mcp.utils.request_parts import RequestParts, iter_request_items
+
+# Key of the item tree; every other top-level key is diffed and merged as a whole
+_ITEM_KEY = "item"
+
+
+def content_hash(value) -> str:
+    """Hash of the canonical JSON form of a value"""
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def request_key(folders: Tuple[str, ...], item: dict) -> str:
+    """Identity of a request: folder path, name, method and URL"""
+    parts = RequestParts(folders, item)
+    path = "/".join(folders + (parts.name,))
+    return f"{path} [{parts.method} {parts.url}]"
+
+
+def index_folders(collection: dict) -> "OrderedDict[Tuple[str, ...], Tuple[dict, str]]":
+    """
+    Map every folder path to (folder without its items, content hash), in document order.
+    When several folders share a path, the first one is kept.
+    """
+    index: "OrderedDict[Tuple[str, ...], Tuple[dict, str]]" = OrderedDict()
+
+    def visit(items: List[dict], path: Tuple[str, ...]) -> None:
+        for item in items or []:
+            if isinstance(item, dict) and isinstance(item.get(_ITEM_KEY), list):
+                sub_path = path + (str(item.get("name", "")),)
+                if sub_path not in index:
+                    metadata = {k: v for k, v in item.items() if k != _ITEM_KEY}
+                    index[sub_path] = (metadata, content_hash(metadata))
+                visit(item[_ITEM_KEY], sub_path)
+
+    visit(collection.get(_ITEM_KEY, []), ())
+    return index
+
+
+def index_requests(collection: dict) -> "OrderedDict[str, Tuple[Tuple[str, ...], dict, str]]":
+    """
+    Map every request key to (folder path, item, content hash), in document order.
+    Repeated keys get a "#2", "#3", ... suffix so they stay distinct.
+    """
+    index: "OrderedDict[str, Tuple[Tuple[str, ...], dict, str]]" = OrderedDict()
+    seen: Dict[str, int] = {}
+    for folders, item in iter_request_items(collection.get(_ITEM_KEY, [])):
+        key = request_key(folders, item)
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] > 1:
+            key = f"{key} #{seen[key]}"
+        index[key] = (folders, item, content_hash(item))
+    return index
+
+
+def diff_collections(old: dict, new: dict) -> dict:
+    """
+    Compare two collections request by request.
+
+    Returns:
+        A dict with the "added", "removed" and "changed" request keys, the
+        top-level sections that differ under "sections", and "unchanged" (count)
+    """
+    old_index = index_requests(old)
+    new_index = index_requests(new)
+    added = [key for key in new_index if key not in old_index]
+    removed = [key for key in old_index if key not in new_index]
+    changed = [key for key, (_, _, digest) in new_index.items() if key in old_index and old_index[key][2] != digest]
+    sections = sorted(
+        key for key in set(old) | set(new)
+        if key != _ITEM_KEY and content_hash(old.get(key)) != content_hash(new.get(key))
+    )
+    return {
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "sections": sections,
+        "unchanged": len(new_index) - len(added) - len(changed),
+    }
+
+
+def _choose(base: Optional[str], ours: Optional[str], theirs: Optional[str], prefer: str) -> Tuple[str, bool]:
+    """Return which side wins for one element ("ours" or "theirs") and whether it was a conflict"""
+    if ours == theirs or theirs == base:
+        return "ours", False
+    if ours == base:
+        return "theirs", False
+    return prefer, True
+
+
+def merge_collections(base: dict, ours: dict, theirs: dict, prefer: str = "ours") -> Tuple[dict, List[str]]:
+    """
+    Three-way merge of two collections derived from a common base.
+
+    Changes made on only one side are taken from that side. When both sides
+    changed the same request, folder (its name, description, auth, events...,
+    not its items) or top-level section differently, the `prefer` side wins
+    and the conflict is reported; folders are reported as their path followed
+    by "/". The merged tree follows the order of `ours`; folders and requests
+    that only `theirs` added are appended to their parent folder, creating it
+    if needed. Folders are kept as long as `ours` has them, even when `theirs`
+    removed them, while the requests they held are merged one by one.
+
+    Returns:
+        The merged collection and the list of conflicting keys
+    """
+    if prefer not in ("ours", "theirs"):
+        raise ValueError(f"prefer must be 'ours' or 'theirs', got {prefer}")
+    conflicts: List[str] = []
+    merged: dict = {}
+
+    # Top-level sections (info, variable, auth, event, ...)
+    for key in list(OrderedDict.fromkeys(list(ours) + list(theirs))):
+        if key == _ITEM_KEY:
+            continue
+        hashes = [content_hash(side[key]) if key in side else None for side in (base, ours, theirs)]
+        winner, conflict = _choose(*hashes, prefer)
+        if conflict:
+            conflicts.append(key)
+        source = ours if winner == "ours" else theirs
+        if key in source:
+            merged[key] = copy.deepcopy(source[key])
+
+    # Folder metadata
+    base_folders = index_folders(base)
+    ours_folders = index_folders(ours)
+    theirs_folders = index_folders(theirs)
+    folder_metadata: Dict[Tuple[str, ...], dict] = {}
+    for path in OrderedDict.fromkeys(list(ours_folders) + list(theirs_folders)):
+        hashes = [index[path][1] if path in index else None for index in (base_folders, ours_folders, theirs_folders)]
+        winner, conflict = _choose(*hashes, prefer)
+        if conflict:
+            conflicts.append("/".join(path) + "/")
+        source = ours_folders if winner == "ours" else theirs_folders
+        # A folder removed on the winning side keeps the metadata of the side that still has it
+        folder_metadata[path] = (source.get(path) or ours_folders.get(path) or theirs_folders[path])[0]
+
+    # Requests
+    base_index = index_requests(base)
+    ours_index = index_requests(ours)
+    theirs_index = index_requests(theirs)
+    decisions: Dict[str, Optional[dict]] = {}
+    for key in OrderedDict.fromkeys(list(ours_index) + list(theirs_index)):
+        hashes = [index[key][2] if key in index else None for index in (base_index, ours_index, theirs_index)]
+        winner, conflict = _choose(*hashes, prefer)
+        if conflict:
+            conflicts.append(key)
+        source = ours_index if winner == "ours" else theirs_index
+        decisions[key] = source[key][1] if key in source else None
+
+    folders_by_path: Dict[Tuple[str, ...], dict] = {}
+    keys_in_ours = iter(ours_index)
+
+    def rebuild(items: List[dict], path: Tuple[str, ...]) -> List[dict]:
+        result = []
+        for item in items or []:
+            if isinstance(item, dict) and isinstance(item.get(_ITEM_KEY), list):
+                sub_path = path + (str(item.get("name", "")),)
+                if sub_path in folders_by_path:
+                    # Later folders with the same path keep their own metadata
+                    folder = {k: copy.deepcopy(v) for k, v in item.items() if k != _ITEM_KEY}
+                else:
+                    folder = copy.deepcopy(folder_metadata[sub_path])
+                    folders_by_path[sub_path] = folder
+                folder[_ITEM_KEY] = rebuild(item[_ITEM_KEY], sub_path)
+                result.append(folder)
+            elif isinstance(item, dict) and "request" in item:
+                chosen = decisions.get(next(keys_in_ours))
+                if chosen is not None:
+                    result.append(copy.deepcopy(chosen))
+            else:
+                # Not a request: kept as ours has it
+                result.append(copy.deepcopy(item))
+        return result
+
+    root = {_ITEM_KEY: rebuild(ours.get(_ITEM_KEY, []), ())}
+    folders_by_path[()] = root
+
+    def folder_for(path: Tuple[str, ...]) -> dict:
+        folder = folders_by_path.get(path)
+        if folder is None:
+            parent = folder_for(path[:-1])
+            folder = copy.deepcopy(folder_metadata[path]) if path in folder_metadata else {"name": path[-1]}
+            folder[_ITEM_KEY] = []
+            parent[_ITEM_KEY].append(folder)
+            folders_by_path[path] = folder
+        return folder
+
+    # Folders that theirs added, even empty ones, then the requests that only theirs has
+    for path in theirs_folders:
+        if path not in ours_folders and path not in base_folders:
+            folder_for(path)
+    for key, (folders, _, _) in theirs_index.items():
+        if key not in ours_index and decisions.get(key) is not None:
+            folder_for(folders)[_ITEM_KEY].append(copy.deepcopy(decisions[key]))
+
+    merged[_ITEM_KEY] = root[_ITEM_KEY]
+    return merged, conflicts
@@ -0,0 +1,246 @@
+"""
+Compact in-memory representation of Postman collections.
+
+A request item parsed from JSON is a tree of small dicts and lists, which
+costs several hundred bytes even for a bare GET. `CompactCollection` keeps
+the same content in `__slots__` objects instead:
+
+- an item keeps its name, method, URL, headers and body reference in slots;
+- headers, URL query parameters and variables are tuples that start with
+  the tuple of their keys, shared by every record with the same keys;
+- header names and variable keys are interned, so the thousands of
+  "Content-Type" or "Authorization" headers of a collection are one string;
+- bodies and example responses of at least LAZY_JSON_BYTES are kept as
+  compact JSON bytes and only parsed when they are read.
+
+`to_dict` rebuilds the collection exactly as it was parsed, key order
+included, so a compacted collection can be expanded and saved without
+changing the file.
+"""
+import sys
+import json
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+# Bodies and example responses at least this large (as compact JSON) are stored as bytes
+LAZY_JSON_BYTES = 256
+
+# Key tuples shared by every record, item and request with the same keys in the same order
+_shapes: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+# Fields of a record whose string value is interned
+_INTERNED_FIELDS = ("key", "type")
+_URL_LISTS = ("host", "path", "query", "variable")
+
+
+def _shape(keys) -> Tuple[str, ...]:
+    keys = tuple(keys)
+    return _shapes.setdefault(keys, keys)
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+class LazyJSON:
+    """A JSON value kept serialized until it is read"""
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+
+    @classmethod
+    def wrap(cls, value: Any) -> Any:
+        """Return the value itself if it is small, else a LazyJSON holding it"""
+        if not isinstance(value, (dict, list)):
+            return value
+        raw = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+        raw = raw.encode("utf-8", "surrogatepass")
+        return cls(raw) if len(raw) >= LAZY_JSON_BYTES else value
+
+    def load(self) -> Any:
+        return json.loads(self.raw.decode("utf-8", "surrogatepass"))
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+
+def _unwrap(value: Any) -> Any:
+    return value.load() if isinstance(value, LazyJSON) else value
+
+
+def _pack_record(value: Any) -> Any:
+    """A dict such as a header or a query parameter as a tuple: (keys, *values)"""
+    if type(value) is not dict:
+        return value
+    return (_shape(value), *[_intern(field) if key in _INTERNED_FIELDS else field for key, field in value.items()])
+
+
+def _unpack_record(value: Any) -> Any:
+    if type(value) is not tuple:
+        return value
+    return dict(zip(value[0], value[1:]))
+
+
+def _pack_records(values: Any) -> Any:
+    if type(values) is not list:
+        return values
+    return tuple(_pack_record(value) for value in values)
+
+
+def _unpack_records(values: Any) -> Any:
+    if type(values) is not tuple:
+        return values
+    return [_unpack_record(value) for value in values]
+
+
+def _pack_url(url: Any) -> Any:
+    if type(url) is not dict:
+        return url
+    return (_shape(url), *[_pack_records(value) if key in _URL_LISTS else value for key, value in url.items()])
+
+
+def _unpack_url(url: Any) -> Any:
+    if type(url) is not tuple:
+        return url
+    return {key: _unpack_records(value) if key in _URL_LISTS else value for key, value in zip(url[0], url[1:])}
+
+
+def _extra(value: dict, known: FrozenSet[str]) -> Optional[dict]:
+    if value.keys() <= known:
+        return None
+    return {key: field for key, field in value.items() if key not in known}
+
+
+class CompactRequest:
+    """The `request` of an item"""
+
+    __slots__ = ("shape", "method", "url", "headers", "body", "extra")
+
+    FIELDS = frozenset(("method", "url", "header", "body"))
+
+    def __init__(self, request: dict):
+        self.shape = _shape(request)
+        self.method = _intern(request.get("method"))
+        self.url = _pack_url(request.get("url"))
+        self.headers = _pack_records(request.get("header"))
+        self.body = LazyJSON.wrap(request.get("body"))
+        self.extra = _extra(request, self.FIELDS)
+
+    def header_items(self) -> Iterator[Tuple[Any, Any]]:
+        """(key, value) of every header"""
+        for header in self.headers or ():
+            header = _unpack_record(header)
+            if isinstance(header, dict):
+                yield header.get("key"), header.get("value")
+
+    def load_body(self) -> Any:
+        return _unwrap(self.body)
+
+    def to_dict(self) -> dict:
+        values = {
+            "method": self.method,
+            "url": _unpack_url(self.url),
+            "header": _unpack_records(self.headers),
+            "body": self.load_body(),
+        }
+        extra = self.extra or {}
+        return {key: values[key] if key in values else extra[key] for key in self.shape}
+
+
+class CompactItem:
+    """A request item; `request` is None for items without one"""
+
+    __slots__ = ("shape", "name", "request", "responses", "extra")
+
+    FIELDS = frozenset(("name", "request", "response"))
+
+    def __init__(self, item: dict):
+        self.shape = _shape(item)
+        self.name = item.get("name")
+        request = item.get("request")
+        self.request = CompactRequest(request) if type(request) is dict else request
+        self.responses = LazyJSON.wrap(item.get("response"))
+        self.extra = _extra(item, self.FIELDS)
+
+    def load_responses(self) -> Any:
+        return _unwrap(self.responses)
+
+    def to_dict(self) -> dict:
+        request = self.request.to_dict() if isinstance(self.request, CompactRequest) else self.request
+        values = {"name": self.name, "request": request, "response": self.load_responses()}
+        extra = self.extra or {}
+        return {key: values[key] if key in values else extra[key] for key in self.shape}
+
+
+class CompactFolder:
+    """A folder and its compacted children"""
+
+    __slots__ = ("shape", "name", "items", "extra")
+
+    FIELDS = frozenset(("name", "item"))
+
+    def __init__(self, folder: dict):
+        self.shape = _shape(folder)
+        self.name = folder.get("name")
+        self.items = compact_items(folder["item"])
+        self.extra = _extra(folder, self.FIELDS)
+
+    def to_dict(self) -> dict:
+        values = {"name": self.name, "item": expand_items(self.items)}
+        extra = self.extra or {}
+        return {key: values[key] if key in values else extra[key] for key in self.shape}
+
+
+def _compact(item: Any) -> Any:
+    if type(item) is not dict:
+        return item
+    if type(item.get("item")) is list:
+        return CompactFolder(item)
+    return CompactItem(item)
+
+
+def _expand(item: Any) -> Any:
+    return item.to_dict() if isinstance(item, (CompactItem, CompactFolder)) else item
+
+
+def compact_items(items: List[Any]) -> tuple:
+    return tuple(_compact(item) for item in items)
+
+
+def expand_items(items: tuple) -> List[Any]:
+    return [_expand(item) for item in items]
+
+
+class CompactCollection:
+    """A whole collection: compacted items, variables with interned keys and the other top-level fields"""
+
+    __slots__ = ("shape", "items", "variables", "extra")
+
+    FIELDS = frozenset(("item", "variable"))
+
+    def __init__(self, data: dict):
+        self.shape = _shape(data)
+        items = data.get("item")
+        self.items = compact_items(items) if type(items) is list else items
+        self.variables = _pack_records(data.get("variable"))
+        self.extra = _extra(data, self.FIELDS)
+
+    def iter_items(self) -> Iterator[CompactItem]:
+        """Every request item, depth first"""
+        stack = [iter(self.items if type(self.items) is tuple else ())]
+        while stack:
+            for item in stack[-1]:
+                if isinstance(item, CompactFolder):
+                    stack.append(iter(item.items))
+                    break
+                if isinstance(item, CompactItem):
+                    yield item
+            else:
+                stack.pop()
+
+    def to_dict(self) -> dict:
+        items = expand_items(self.items) if type(self.items) is tuple else self.items
+        values = {"item": items, "variable": _unpack_records(self.variables)}
+        extra = self.extra or {}
+        return {key: values[key] if key in values else extra[key] for key in self.shape}
@@ -0,0 +1,157 @@
+"""
+Postman environment files, parsed once and kept in memory with a key to
+position index, and the server-wide active environment.
+"""
+import os
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from code2postman_mcp.utils.collection_cache import Fingerprint, file_fingerprint
+from code2postman_mcp.utils.metrics import json_timer, record_read, record_write
+from loguru import logger
+
+# Maximum number of parsed environments kept in memory
+MAX_CACHED_ENVIRONMENTS = 16
+
+
+class Environment:
+    """A parsed environment file and the index of its variables by key"""
+
+    def __init__(self, file_path: str, data: dict, fingerprint: Optional[Fingerprint] = None):
+        if not isinstance(data, dict) or not isinstance(data.get("values", []), list):
+            raise ValueError(f"{file_path} is not a Postman environment file")
+        data.setdefault("values", [])
+        self.file_path = os.path.abspath(file_path)
+        self.data = data
+        self.fingerprint = fingerprint
+        self.index: Dict[str, int] = {
+            str(value["key"]): position
+            for position, value in enumerate(data["values"])
+            if isinstance(value, dict) and "key" in value
+        }
+        self._values: Optional[Dict[str, str]] = None
+
+    @property
+    def name(self) -> str:
+        return str(self.data.get("name", ""))
+
+    @property
+    def key(self) -> str:
+        """Identifies this environment and its content, for caches built from its values"""
+        return f"{self.file_path}@{self.fingerprint}"
+
+    def is_enabled(self, key: str) -> bool:
+        """Whether the variable exists and is neither "enabled": false nor "disabled": true"""
+        entry = self.get(key)
+        return entry is not None and bool(entry.get("enabled", True)) and not entry.get("disabled")
+
+    def values(self) -> Dict[str, str]:
+        """The enabled variables of the environment"""
+        if self._values is None:
+            self._values = {
+                key: "" if self.data["values"][position].get("value") is None
+                else str(self.data["values"][position]["value"])
+                for key, position in self.index.items()
+                if self.is_enabled(key)
+            }
+        return self._values
+
+    def get(self, key: str) -> Optional[dict]:
+        position = self.index.get(key)
+        return self.data["values"][position] if position is not None else None
+
+    def upsert(self, values: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        """
+        Set every given variable, updating existing entries in place and
+        appending new ones in the given order. Returns the added and updated keys.
+        """
+        added, updated = [], []
+        for key, value in values.items():
+            key = str(key)
+            position = self.index.get(key)
+            if position is None:
+                self.index[key] = len(self.data["values"])
+                self.data["values"].append({"key": key, "value": value, "type": "default", "enabled": True})
+                added.append(key)
+            else:
+                self.data["values"][position]["value"] = value
+                updated.append(key)
+        self._values = None
+        return added, updated
+
+
+class EnvironmentStore:
+    """LRU cache of parsed environments, validated against the file fingerprint"""
+
+    def __init__(self, max_entries: int = MAX_CACHED_ENVIRONMENTS):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Environment]" = OrderedDict()
+        self._active: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def get(self, file_path: str) -> Environment:
+        """Return the environment, parsing the file only if it changed since it was last read"""
+        key = os.path.abspath(file_path)
+        fingerprint = file_fingerprint(key)
+        with self._lock:
+            environment = self._entries.get(key)
+            if environment is not None and environment.fingerprint == fingerprint:
+                self._entries.move_to_end(key)
+                return environment
+        if fingerprint is None:
+            raise FileNotFoundError(f"{file_path} does not exist")
+        logger.debug(f"Parsing environment file: {key}")
+        with open(key, "r") as file, json_timer("parse"):
+            environment = Environment(key, json.load(file), fingerprint)
+        record_read(fingerprint[1])
+        self._store(environment)
+        return environment
+
+    def save(self, environment: Environment) -> None:
+        """Write the environment to its file and keep the in-memory copy current"""
+        try:
+            with open(environment.file_path, "w") as file, json_timer("dump"):
+                json.dump(environment.data, file, indent=2)
+        except Exception:
+            with self._lock:
+                self._entries.pop(environment.file_path, None)
+            raise
+        environment.fingerprint = file_fingerprint(environment.file_path)
+        record_write(environment.fingerprint[1] if environment.fingerprint else 0)
+        self._store(environment)
+
+    def _store(self, environment: Environment) -> None:
+        with self._lock:
+            self._entries[environment.file_path] = environment
+            self._entries.move_to_end(environment.file_path)
+            # The active environment stays in memory whatever its age
+            excess = len(self._entries) - self.max_entries
+            if excess > 0:
+                for path in [path for path in self._entries if path != self._active][:excess]:
+                    del self._entries[path]
+
+    def activate(self, file_path: Optional[str]) -> Optional[Environment]:
+        """Make an environment the active one, or clear it with None"""
+        if file_path is None:
+            with self._lock:
+                self._active = None
+            return None
+        environment = self.get(file_path)
+        with self._lock:
+            self._active = environment.file_path
+        return environment
+
+    def active(self) -> Optional[Environment]:
+        """The active environment, or None if no environment is active"""
+        with self._lock:
+            active = self._active
+        return self.get(active) if active is not None else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._active = None
+
+
+environment_store = EnvironmentStore()
@@ -0,0 +1,258 @@
+"""
+Execution layer for the blocking work of the async tools.
+
+File reads and writes, directory walks and CPU-heavy JSON work run on a
+bounded thread pool through `run_blocking`, so a long tree scan or a large
+collection write does not stall the other requests served by the event
+loop. The context of the caller is copied into the worker, so the metrics
+of the running tool keep being attributed to it.
+
+JSON files of at least CODE2POSTMAN_PROCESS_PARSE_BYTES (50 MB by default)
+are parsed by `load_json` in a worker process instead: json.load holds the
+GIL for seconds on such files, which stalls the event loop even from a pool
+thread, and so would unpickling the whole structure at once. The worker
+sends it back as one pickle per request or folder shell, and the parent
+unpickles them one at a time, so the event loop runs in between.
+
+Tools that read-modify-write a collection hold the path lock of that
+collection for the whole call (`path_lock`, or the `locks_paths` decorator):
+once their I/O runs on the pool they can be interleaved, and the lock keeps
+their changes from overwriting each other.
+"""
+import os
+import gc
+import json
+import pickle
+import asyncio
+import inspect
+import functools
+import threading
+import contextvars
+import weakref
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple, TypeVar, Union
+from loguru import logger
+
+IO_WORKERS_ENV = "CODE2POSTMAN_IO_WORKERS"
+# Same default as ThreadPoolExecutor: enough threads to overlap I/O, bounded on large machines
+DEFAULT_IO_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+PROCESS_PARSE_ENV = "CODE2POSTMAN_PROCESS_PARSE_BYTES"
+# Files at least this large are parsed in a worker process; 0 disables it
+DEFAULT_PROCESS_PARSE_BYTES = 50 * 1024 * 1024
+PARSE_WORKERS_ENV = "CODE2POSTMAN_PARSE_WORKERS"
+DEFAULT_PARSE_WORKERS = 2
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+# Number of threads decoding with the garbage collector paused, see _gc_paused
+_gc_pauses = 0
+_gc_was_enabled = True
+_gc_lock = threading.Lock()
+
+
+class _PathLock:
+    """asyncio lock that the task holding it can take again, so locked tools can call each other"""
+
+    __slots__ = ("_lock", "_owner", "_depth", "__weakref__")
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._owner = None
+        self._depth = 0
+
+    async def acquire(self) -> None:
+        task = asyncio.current_task()
+        if self._owner is not task:
+            await self._lock.acquire()
+            self._owner = task
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            self._owner = None
+            self._lock.release()
+
+
+# Locks are only kept while someone holds or waits for them
+_path_locks: "weakref.WeakValueDictionary[str, _PathLock]" = weakref.WeakValueDictionary()
+
+
+def _int_setting(name: str, default: int, minimum: int) -> int:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}")
+    if number < minimum:
+        raise ValueError(f"{name} must be at least {minimum}, got {number}")
+    return number
+
+
+def io_workers() -> int:
+    """Size of the I/O thread pool, from IO_WORKERS_ENV"""
+    return _int_setting(IO_WORKERS_ENV, DEFAULT_IO_WORKERS, 1)
+
+
+def process_parse_threshold() -> int:
+    """Size in bytes from which JSON files are parsed in a worker process, 0 if disabled"""
+    return _int_setting(PROCESS_PARSE_ENV, DEFAULT_PROCESS_PARSE_BYTES, 0)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """The shared I/O thread pool, created on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = io_workers()
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="code2postman-io")
+                logger.debug(f"Started I/O thread pool with {workers} workers")
+    return _executor
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """The pool of JSON parsing processes, created on first use"""
+    global _process_pool
+    if _process_pool is None:
+        with _executor_lock:
+            if _process_pool is None:
+                workers = _int_setting(PARSE_WORKERS_ENV, DEFAULT_PARSE_WORKERS, 1)
+                # spawn rather than fork: the server has threads (I/O pool, log writer) that fork would copy mid-flight
+                _process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+                logger.debug(f"Started JSON parsing process pool with {workers} workers")
+    return _process_pool
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """Stop the I/O thread pool and the parsing processes; they are started again on demand"""
+    global _executor, _process_pool
+    with _executor_lock:
+        executor, _executor = _executor, None
+        process_pool, _process_pool = _process_pool, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+    if process_pool is not None:
+        process_pool.shutdown(wait=wait)
+
+
+# A pickled value, or a pickled folder shell with the encoded content of its "item" list
+Encoded = Union[bytes, Tuple[bytes, List["Encoded"]]]
+
+
+def _encode(value: Any) -> Encoded:
+    # Any non-empty "item" list is split, so that a collection holding a single large folder is not one pickle
+    if isinstance(value, dict) and isinstance(value.get("item"), list) and value["item"]:
+        shell = {**value, "item": []}
+        return pickle.dumps(shell, pickle.HIGHEST_PROTOCOL), [_encode(child) for child in value["item"]]
+    return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def _decode(encoded: Encoded) -> Any:
+    if isinstance(encoded, bytes):
+        return pickle.loads(encoded)
+    shell, children = encoded
+    value = pickle.loads(shell)
+    value["item"] = [_decode(child) for child in children]
+    return value
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """
+    Pause the cyclic garbage collector. Pauses of concurrent threads nest: the
+    collector is enabled again by the last one to finish, if it was enabled
+    before the first one started.
+    """
+    global _gc_pauses, _gc_was_enabled
+    with _gc_lock:
+        if _gc_pauses == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+def _parse_json_file(file_path: str) -> Encoded:
+    """Runs in a parsing process"""
+    with open(file_path, "rb") as file:
+        return _encode(json.loads(file.read()))
+
+
+def load_json(file_path: str, size: int) -> Any:
+    """
+    Parse a JSON file of `size` bytes, in a worker process if it reaches the
+    process-parse threshold. Blocking: call it from the I/O thread pool.
+    """
+    threshold = process_parse_threshold()
+    if threshold and size >= threshold:
+        logger.debug(f"Parsing {file_path} ({size} bytes) in a worker process")
+        encoded = get_process_pool().submit(_parse_json_file, file_path).result()
+        # Rebuilding millions of objects triggers full collections that stop
+        # every thread for hundreds of milliseconds. Parsed JSON has no cycles,
+        # so collections are paused while decoding, and only then
+        with _gc_paused():
+            return _decode(encoded)
+    with open(file_path, "r") as file:
+        return json.load(file)
+
+
+async def run_blocking(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking function on the I/O thread pool and wait for its result"""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(), call)
+
+
+@asynccontextmanager
+async def path_lock(*paths: Optional[str]) -> AsyncIterator[None]:
+    """
+    Hold the locks of the given files. Locks are taken in a fixed order, so
+    calls locking several files cannot deadlock, and are reentrant within a
+    task. Values that are not strings are ignored, to let the tool report
+    them as invalid arguments.
+    """
+    keys = sorted({os.path.abspath(path) for path in paths if isinstance(path, str)})
+    locks = []
+    for key in keys:
+        lock = _path_locks.get(key)
+        if lock is None:
+            lock = _path_locks[key] = _PathLock()
+        locks.append(lock)
+    acquired = []
+    try:
+        for lock in locks:
+            await lock.acquire()
+            acquired.append(lock)
+        yield
+    finally:
+        for lock in reversed(acquired):
+            lock.release()
+
+
+def locks_paths(*parameters: str):
+    """Decorator holding the path locks of the named file path parameters for the whole call"""
+    def decorate(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            async with path_lock(*(arguments.get(name) for name in parameters)):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -1,5 +1,11 @@
+from code2postman_mcp.utils.schema import validate
+from code2postman_mcp.utils.metrics import file_size, record_file_scanned
+from code2postman_mcp.utils.log import LogSampler
 from loguru import logger
 
+# Per-file messages of tree scans are sampled
+_line_count_log = LogSampler()
+
 def count_lines(file_path: str) -> int:
     """
     Count the number of lines in a file.
@@ -10,11 +16,12 @@ def count_lines(file_path: str) -> int:
     Returns:
         Number of lines in the file
     """
-    logger.debug(f"Counting lines in file: {file_path}")
     try:
         with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
             line_count = sum(1 for _ in f)
-            logger.debug(f"Counted {line_count} lines in {file_path}")
+            record_file_scanned(file_size(f))
+            if _line_count_log():
+                logger.debug("Counted {} lines in {} (one file in {} is logged)", line_count, file_path, _line_count_log.every)
             return line_count
     except Exception as e:
         logger.error(f"Error counting lines in {file_path}: {str(e)}")
@@ -22,10 +29,11 @@ def count_lines(file_path: str) -> int:
 
 def is_a_valid_item(item: dict) -> bool:
     """
-    Check if the item is a valid Postman collection item
+    Check if the item is a valid Postman collection item (a request or a
+    folder) according to the Postman Collection v2.1 schema
     """
-    logger.debug(f"Validating Postman item: {item.get('name')}")
-    is_valid = "name" in item
-    if not is_valid:
-        logger.warning(f"Invalid Postman item: missing required fields 'name'")
-    return is_valid
+    logger.debug("Validating Postman item: {}", item.get("name"))
+    errors = validate(item, "items")
+    if errors:
+        logger.warning(f"Invalid Postman item: {'; '.join(errors)}")
+    return not errors
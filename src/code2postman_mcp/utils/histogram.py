@@ -0,0 +1,91 @@
+"""
+Log-linear latency histogram in the style of HdrHistogram: values are
+recorded in microseconds into buckets whose width grows with the value, so
+memory stays bounded while every recorded value keeps a relative precision
+better than 1%.
+"""
+from typing import Dict, Iterable, Tuple
+
+# Each power of two is split into 2**(SUB_BUCKET_BITS - 1) linear sub-buckets
+SUB_BUCKET_BITS = 8
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+# Percentiles included in the summaries
+SUMMARY_PERCENTILES = (50, 75, 90, 95, 99, 99.9)
+
+
+def _bucket(value: int) -> Tuple[int, int]:
+    """Return (key, shift) of the bucket holding a non-negative integer value"""
+    shift = max(0, value.bit_length() - SUB_BUCKET_BITS)
+    return (shift << SUB_BUCKET_BITS) + (value >> shift), shift
+
+
+def _bucket_value(key: int) -> int:
+    """Midpoint of a bucket, used as the value of everything recorded in it"""
+    shift, sub_bucket = key >> SUB_BUCKET_BITS, key & (_SUB_BUCKETS - 1)
+    return (sub_bucket << shift) + ((1 << shift) >> 1)
+
+
+class LatencyHistogram:
+    """Histogram of latencies, recorded in milliseconds"""
+
+    __slots__ = ("_counts", "count", "total_us", "min_us", "max_us")
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    def record(self, latency_ms: float) -> None:
+        value = max(0, int(round(latency_ms * 1000)))
+        key, _ = _bucket(value)
+        self._counts[key] = self._counts.get(key, 0) + 1
+        if self.count == 0 or value < self.min_us:
+            self.min_us = value
+        if value > self.max_us:
+            self.max_us = value
+        self.count += 1
+        self.total_us += value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the values recorded by another histogram to this one"""
+        if other.count == 0:
+            return
+        for key, count in other._counts.items():
+            self._counts[key] = self._counts.get(key, 0) + count
+        self.min_us = other.min_us if self.count == 0 else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+        self.count += other.count
+        self.total_us += other.total_us
+
+    def percentile(self, percent: float) -> float:
+        """Value at the given percentile, in milliseconds"""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, -(-percent * self.count // 100))
+        seen = 0
+        for key in sorted(self._counts):
+            seen += self._counts[key]
+            if seen >= rank:
+                value = min(max(_bucket_value(key), self.min_us), self.max_us)
+                return value / 1000
+        return self.max_us / 1000
+
+    def buckets(self) -> Iterable[Tuple[float, int]]:
+        """(bucket value in milliseconds, count) for every non-empty bucket, in increasing order"""
+        for key in sorted(self._counts):
+            yield _bucket_value(key) / 1000, self._counts[key]
+
+    def to_dict(self, include_buckets: bool = True) -> dict:
+        summary = {
+            "count": self.count,
+            "min": self.min_us / 1000,
+            "mean": round(self.total_us / self.count / 1000, 3) if self.count else 0.0,
+            "max": self.max_us / 1000,
+            "percentiles": {f"p{p:g}": self.percentile(p) for p in SUMMARY_PERCENTILES},
+        }
+        if include_buckets:
+            summary["buckets"] = [[value, count] for value, count in self.buckets()]
+        return summary
@@ -0,0 +1,110 @@
+"""
+Bounded per-collection undo/redo history. Each entry stores the forward and
+inverse JSON patches of one edit, so memory grows with the size of the edits,
+not with the size of the collection.
+"""
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional
+from code2postman_mcp.utils.json_patch import Operation
+from loguru import logger
+
+# Maximum number of edits that can be undone per collection
+MAX_HISTORY_ENTRIES = 100
+
+
+@dataclass
+class HistoryEntry:
+    forward: List[Operation]
+    inverse: List[Operation]
+    # Top-level folders touched by the edit
+    folders: List[str]
+
+
+class _CollectionHistory:
+    def __init__(self, max_entries: int):
+        self.undo: Deque[HistoryEntry] = deque(maxlen=max_entries)
+        self.redo: List[HistoryEntry] = []
+        # Revision of the collection right after the last recorded, undone or redone edit
+        self.revision: Optional[int] = None
+
+
+class EditHistory:
+    """Undo and redo stacks for every collection edited by the server"""
+
+    def __init__(self, max_entries: int = MAX_HISTORY_ENTRIES):
+        self.max_entries = max_entries
+        self._histories: Dict[str, _CollectionHistory] = {}
+        self._lock = threading.Lock()
+
+    def _history(self, file_path: str) -> _CollectionHistory:
+        key = os.path.abspath(file_path)
+        history = self._histories.get(key)
+        if history is None:
+            history = self._histories[key] = _CollectionHistory(self.max_entries)
+        return history
+
+    def record(self, file_path: str, entry: HistoryEntry, revision: int) -> None:
+        """Record a new edit; this discards anything that could have been redone"""
+        with self._lock:
+            history = self._history(file_path)
+            history.undo.append(entry)
+            history.redo.clear()
+            history.revision = revision
+
+    def _check(self, file_path: str, history: _CollectionHistory, current_revision: int) -> None:
+        if history.revision is not None and history.revision != current_revision:
+            logger.warning(f"Collection {file_path} changed outside the recorded history, discarding it")
+            history.undo.clear()
+            history.redo.clear()
+            history.revision = None
+            raise ValueError(
+                f"{file_path} was modified outside of the recorded edits; its history was discarded"
+            )
+
+    def pop_undo(self, file_path: str, current_revision: int) -> HistoryEntry:
+        """Take the most recent edit to undo, raising ValueError if there is none"""
+        with self._lock:
+            history = self._history(file_path)
+            self._check(file_path, history, current_revision)
+            if not history.undo:
+                raise ValueError(f"Nothing to undo for {file_path}")
+            return history.undo.pop()
+
+    def pop_redo(self, file_path: str, current_revision: int) -> HistoryEntry:
+        """Take the most recently undone edit to redo, raising ValueError if there is none"""
+        with self._lock:
+            history = self._history(file_path)
+            self._check(file_path, history, current_revision)
+            if not history.redo:
+                raise ValueError(f"Nothing to redo for {file_path}")
+            return history.redo.pop()
+
+    def push_undone(self, file_path: str, entry: HistoryEntry, revision: int) -> None:
+        with self._lock:
+            history = self._history(file_path)
+            history.redo.append(entry)
+            history.revision = revision
+
+    def push_redone(self, file_path: str, entry: HistoryEntry, revision: int) -> None:
+        with self._lock:
+            history = self._history(file_path)
+            history.undo.append(entry)
+            history.revision = revision
+
+    def clear(self, file_path: str) -> None:
+        with self._lock:
+            self._histories.pop(os.path.abspath(file_path), None)
+
+    def depth(self, file_path: str) -> Dict[str, int]:
+        """Return how many edits can currently be undone and redone"""
+        with self._lock:
+            history = self._histories.get(os.path.abspath(file_path))
+            if history is None:
+                return {"undo": 0, "redo": 0}
+            return {"undo": len(history.undo), "redo": len(history.redo)}
+
+
+edit_history = EditHistory()
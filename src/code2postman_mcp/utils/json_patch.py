@@ -0,0 +1,126 @@
+"""
+A small JSON Patch (RFC 6902) implementation covering the `add`, `remove` and
+`replace` operations. Applying a patch returns its inverse, so every edit can
+be undone in time proportional to the patch rather than to the document.
+"""
+import copy
+from typing import Any, List, Tuple
+
+Operation = dict
+
+
+def escape_token(token: Any) -> str:
+    """Escape one reference token of a JSON pointer"""
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def pointer(*tokens: Any) -> str:
+    """Build a JSON pointer from its reference tokens, e.g. pointer("item", 3) == "/item/3\""""
+    return "".join(f"/{escape_token(token)}" for token in tokens)
+
+
+def _parse_pointer(path: str) -> List[str]:
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer: {path}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/")]
+
+
+def _resolve_parent(document: Any, path: str) -> Tuple[Any, str]:
+    tokens = _parse_pointer(path)
+    if not tokens:
+        raise ValueError("Patching the document root is not supported")
+    parent = document
+    for token in tokens[:-1]:
+        if isinstance(parent, list):
+            parent = parent[_array_index(parent, token)]
+        elif isinstance(parent, dict) and token in parent:
+            parent = parent[token]
+        else:
+            raise ValueError(f"Path not found: {path}")
+    return parent, tokens[-1]
+
+
+def _array_index(array: list, token: str, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return len(array)
+    if not token.isdigit():
+        raise ValueError(f"Invalid array index: {token}")
+    index = int(token)
+    if index > len(array) or (index == len(array) and not allow_end):
+        raise ValueError(f"Array index out of range: {index}")
+    return index
+
+
+def _apply_operation(document: Any, operation: Operation) -> Operation:
+    """Apply a single operation in place and return the operation that reverts it"""
+    op = operation.get("op")
+    path = operation.get("path")
+    parent, token = _resolve_parent(document, path)
+
+    if op == "add":
+        value = copy.deepcopy(operation["value"])
+        if isinstance(parent, list):
+            index = _array_index(parent, token, allow_end=True)
+            parent.insert(index, value)
+            return {"op": "remove", "path": _replace_last(path, index)}
+        if token in parent:
+            previous = parent[token]
+            parent[token] = value
+            return {"op": "replace", "path": path, "value": previous}
+        parent[token] = value
+        return {"op": "remove", "path": path}
+
+    if op == "remove":
+        if isinstance(parent, list):
+            index = _array_index(parent, token)
+            return {"op": "add", "path": path, "value": parent.pop(index)}
+        if token not in parent:
+            raise ValueError(f"Path not found: {path}")
+        return {"op": "add", "path": path, "value": parent.pop(token)}
+
+    if op == "replace":
+        value = copy.deepcopy(operation["value"])
+        if isinstance(parent, list):
+            index = _array_index(parent, token)
+        elif token in parent:
+            index = token
+        else:
+            raise ValueError(f"Path not found: {path}")
+        previous = parent[index]
+        parent[index] = value
+        return {"op": "replace", "path": path, "value": previous}
+
+    raise ValueError(f"Unsupported patch operation: {op}")
+
+
+def _replace_last(path: str, token: Any) -> str:
+    return path[:path.rindex("/") + 1] + escape_token(token)
+
+
+def apply_patch(document: Any, operations: List[Operation]) -> List[Operation]:
+    """
+    Apply the operations to `document` in place, in order.
+
+    Args:
+        document: The JSON document (dict) to modify
+        operations: The JSON Patch operations to apply
+
+    Returns:
+        The inverse patch, which restores the previous document when applied.
+        If an operation fails, the operations already applied are reverted
+        before the error is raised.
+    """
+    inverse = []
+    try:
+        for operation in operations:
+            inverse.append(_apply_operation(document, operation))
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        for undo in reversed(inverse):
+            _apply_operation(document, undo)
+        if isinstance(e, ValueError):
+            raise
+        raise ValueError(f"Invalid patch operation: {str(e)}") from e
+    inverse.reverse()
+    return inverse
@@ -0,0 +1,152 @@
+"""
+Detect the programming languages of a project and build the matching
+exclusion profile, caching it per root directory.
+"""
+import os
+import re
+import threading
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+from typing import List, Pattern, Tuple
+from code2postman_mcp.consts.excluded_files import EXCLUDED_ITEMS, LANGUAGE_MARKERS, Language
+from loguru import logger
+
+# Maximum number of directory entries inspected while detecting languages
+MAX_SAMPLED_ENTRIES = 5000
+# Maximum directory depth inspected while detecting languages
+MAX_SAMPLE_DEPTH = 3
+# Minimum share of the sampled source files a language needs without a marker file
+MIN_EXTENSION_SHARE = 0.1
+# Maximum number of project profiles kept in memory
+MAX_CACHED_PROFILES = 64
+
+_MARKER_PATTERNS = {
+    language: [re.compile(pattern) for pattern in markers["files"]]
+    for language, markers in LANGUAGE_MARKERS.items()
+}
+_EXTENSION_TO_LANGUAGE = {
+    extension: language
+    for language, markers in LANGUAGE_MARKERS.items()
+    for extension in markers["extensions"]
+}
+# Never descend into these while sampling, whatever the project language is
+_SAMPLE_SKIP_DIRS = [re.compile(pattern) for pattern in EXCLUDED_ITEMS[Language.GENERIC]["directories"]] + [
+    re.compile(pattern) for pattern in (r"^\.venv$", r"^venv$", r"^__pycache__$")
+]
+
+
+@dataclass(frozen=True)
+class ProjectProfile:
+    """Languages detected in a project and the union of their exclusion patterns"""
+    languages: Tuple[Language, ...]
+    dir_patterns: Tuple[Pattern, ...]
+    file_patterns: Tuple[Pattern, ...]
+
+    @property
+    def name(self) -> str:
+        return "+".join(language.value for language in self.languages)
+
+
+def build_profile(languages: List[Language]) -> ProjectProfile:
+    """
+    Build a profile whose exclusions are the union of the `EXCLUDED_ITEMS`
+    filters of the given languages, keeping the first occurrence of each pattern.
+    """
+    languages = tuple(languages) or (Language.GENERIC,)
+    dir_patterns = []
+    file_patterns = []
+    for language in languages:
+        exclusions = EXCLUDED_ITEMS.get(language, EXCLUDED_ITEMS[Language.GENERIC])
+        dir_patterns.extend(exclusions.get("directories", []))
+        file_patterns.extend(exclusions.get("files", []))
+    return ProjectProfile(
+        languages=languages,
+        dir_patterns=tuple(re.compile(pattern) for pattern in dict.fromkeys(dir_patterns)),
+        file_patterns=tuple(re.compile(pattern) for pattern in dict.fromkeys(file_patterns)),
+    )
+
+
+def detect_languages(root: str) -> List[Language]:
+    """
+    Detect the languages of a project in a single bounded breadth-first pass,
+    looking at marker files (pyproject.toml, package.json, go.mod, ...) and at
+    the extensions of the sampled source files.
+
+    Args:
+        root: The root directory of the project
+
+    Returns:
+        The detected languages, in enum order (GENERIC alone if none was found)
+    """
+    found_markers = set()
+    extension_counts: Counter = Counter()
+    sampled = 0
+    pending = deque([(root, 0)])
+    while pending and sampled < MAX_SAMPLED_ENTRIES:
+        directory, depth = pending.popleft()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            sampled += 1
+            if sampled > MAX_SAMPLED_ENTRIES:
+                break
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                if depth < MAX_SAMPLE_DEPTH and not any(p.search(entry.name) for p in _SAMPLE_SKIP_DIRS):
+                    pending.append((entry.path, depth + 1))
+                continue
+            for language, patterns in _MARKER_PATTERNS.items():
+                if any(pattern.search(entry.name) for pattern in patterns):
+                    found_markers.add(language)
+            language = _EXTENSION_TO_LANGUAGE.get(os.path.splitext(entry.name)[1].lower())
+            if language is not None:
+                extension_counts[language] += 1
+
+    total_sources = sum(extension_counts.values())
+    detected = set(found_markers)
+    for language, count in extension_counts.items():
+        if count / total_sources >= MIN_EXTENSION_SHARE:
+            detected.add(language)
+
+    languages = [language for language in Language if language in detected]
+    logger.debug(f"Detected languages for {root} from {sampled} entries: {[l.value for l in languages]}")
+    return languages or [Language.GENERIC]
+
+
+_profiles: "OrderedDict[str, Tuple[int, ProjectProfile]]" = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+def get_project_profile(root: str) -> ProjectProfile:
+    """
+    Return the cached profile of a project, detecting it on first use. The
+    cache entry is dropped when the mtime of the root directory changes, which
+    is the case whenever a top-level marker file is added or removed.
+    """
+    root = os.path.abspath(root)
+    root_mtime = os.stat(root).st_mtime_ns
+    with _profiles_lock:
+        cached = _profiles.get(root)
+        if cached is not None and cached[0] == root_mtime:
+            _profiles.move_to_end(root)
+            return cached[1]
+
+    profile = build_profile(detect_languages(root))
+    logger.info(f"Detected project profile for {root}: {profile.name}")
+    with _profiles_lock:
+        _profiles[root] = (root_mtime, profile)
+        _profiles.move_to_end(root)
+        while len(_profiles) > MAX_CACHED_PROFILES:
+            _profiles.popitem(last=False)
+    return profile
+
+
+def clear_profile_cache() -> None:
+    """Forget every cached project profile"""
+    with _profiles_lock:
+        _profiles.clear()
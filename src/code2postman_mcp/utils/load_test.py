@@ -0,0 +1,131 @@
+"""
+Load testing with the requests of a collection: asyncio workers replay the
+prepared requests in order, for a number of iterations or a duration,
+optionally paced at a target rate.
+
+When a rate is given the schedule is open-loop: every request has an
+intended start time, and its latency is measured from that time rather than
+from when it was actually sent. Requests delayed by a saturated server then
+count against its latency instead of silently lowering the load
+("coordinated omission").
+"""
+import time
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, List
+from code2postman_mcp.utils.histogram import LatencyHistogram
+from code2postman_mcp.utils.runner import CollectionRunner, RequestOutcome, RequestPlan, is_error
+from loguru import logger
+
+# Name under which requests outside any folder are aggregated
+ROOT_FOLDER = "(root)"
+
+
+@dataclass
+class LoadStats:
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    status_codes: Dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+
+    def record(self, latency_ms: float, outcome: RequestOutcome, is_error: bool) -> None:
+        self.histogram.record(latency_ms)
+        if outcome.status is not None:
+            key = str(outcome.status)
+            self.status_codes[key] = self.status_codes.get(key, 0) + 1
+        if is_error:
+            self.errors += 1
+
+    def merge(self, other: "LoadStats") -> None:
+        self.histogram.merge(other.histogram)
+        for key, count in other.status_codes.items():
+            self.status_codes[key] = self.status_codes.get(key, 0) + count
+        self.errors += other.errors
+
+    def to_dict(self, elapsed_seconds: float, include_buckets: bool = True) -> dict:
+        count = self.histogram.count
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 6) if count else 0.0,
+            "throughput_rps": round(count / elapsed_seconds, 3) if elapsed_seconds > 0 else 0.0,
+            "status_codes": self.status_codes,
+            "latency_ms": self.histogram.to_dict(include_buckets),
+        }
+
+
+async def run_load_test(plans: List[RequestPlan], runner: CollectionRunner, duration: float = None,
+                        iterations: int = None, rps: float = None, workers: int = None) -> dict:
+    """
+    Replay the requests until `iterations` passes over them are done or
+    `duration` seconds have elapsed, whichever comes first.
+
+    Args:
+        plans: The prepared requests, replayed in order
+        runner: The runner sending the requests
+        duration: Maximum duration of the test, in seconds
+        iterations: Maximum number of passes over the requests
+        rps: Target number of requests started per second; as fast as possible if None
+        workers: Number of asyncio workers sending requests, defaults to the runner concurrency
+
+    Returns:
+        The statistics of the test in total, per folder and per request
+    """
+    if duration is None and iterations is None:
+        raise ValueError("A duration or a number of iterations is required")
+    if not plans:
+        raise ValueError("There are no requests to run")
+    unresolved = [f"{plan.title} ({', '.join(plan.unresolved)})" for plan in plans if plan.unresolved]
+    if unresolved:
+        raise ValueError(f"Requests with unresolved variables: {'; '.join(unresolved)}")
+    workers = workers or runner.concurrency
+    total = iterations * len(plans) if iterations is not None else None
+    stats = [LoadStats() for _ in plans]
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    deadline = start + duration if duration is not None else None
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while True:
+            index = next_index
+            if total is not None and index >= total:
+                return
+            scheduled = start + index / rps if rps else loop.time()
+            if deadline is not None and scheduled >= deadline:
+                return
+            next_index += 1
+            delay = scheduled - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            plan = plans[index % len(plans)]
+            outcome = await runner.send(plan)
+            latency_ms = (loop.time() - scheduled) * 1000 if rps else outcome.latency_ms
+            stats[index % len(plans)].record(latency_ms, outcome, is_error(plan, outcome))
+
+    logger.info(f"Starting load test: {len(plans)} requests, {workers} workers, "
+                f"duration={duration}, iterations={iterations}, rps={rps}")
+    started_at = time.time()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    elapsed = loop.time() - start
+
+    totals = LoadStats()
+    folders: Dict[str, LoadStats] = {}
+    for plan, request_stats in zip(plans, stats):
+        totals.merge(request_stats)
+        folders.setdefault("/".join(plan.folders) or ROOT_FOLDER, LoadStats()).merge(request_stats)
+
+    logger.info(f"Load test finished: {totals.histogram.count} requests in {elapsed:.2f}s, {totals.errors} errors")
+    return {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(started_at)),
+        "elapsed_seconds": round(elapsed, 3),
+        "settings": {"duration": duration, "iterations": iterations, "rps": rps, "workers": workers,
+                     "concurrency": runner.concurrency, "per_host_limit": runner.per_host_limit},
+        "total": totals.to_dict(elapsed),
+        "folders": {name: folder_stats.to_dict(elapsed, include_buckets=False)
+                    for name, folder_stats in folders.items()},
+        "requests": [
+            {"name": plan.title, "method": plan.method, "url": plan.url, **request_stats.to_dict(elapsed)}
+            for plan, request_stats in zip(plans, stats)
+        ],
+    }
@@ -0,0 +1,81 @@
+"""
+Logging setup of the server and helpers that keep logging cheap on hot paths.
+
+The level comes from CODE2POSTMAN_LOG_LEVEL (INFO by default), and the file
+sink, CODE2POSTMAN_LOG_FILE (logs/code2postman.log by default, empty to
+disable it), is enqueued: records are written by a background thread, so
+tools never wait on the disk. Debug messages on hot paths pass their
+arguments to loguru instead of formatting an f-string, so nothing is
+formatted when debug output is disabled, and per-file messages go through a
+LogSampler so that scanning a large tree does not produce a record per file.
+"""
+import os
+import sys
+import itertools
+from typing import List
+from loguru import logger
+
+LOG_LEVEL_ENV = "CODE2POSTMAN_LOG_LEVEL"
+LOG_FILE_ENV = "CODE2POSTMAN_LOG_FILE"
+LOG_SAMPLE_ENV = "CODE2POSTMAN_LOG_SAMPLE"
+DEFAULT_LOG_LEVEL = "INFO"
+DEFAULT_LOG_FILE = "logs/code2postman.log"
+# One per-file debug message is logged every this many files
+DEFAULT_LOG_SAMPLE = 100
+LOG_ROTATION = "10 MB"
+
+CONSOLE_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+FILE_FORMAT = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}"
+
+# Handlers added by configure_logging, replaced when it is called again
+_handler_ids: List[int] = []
+
+
+def configure_logging(level: str = None, log_file: str = None) -> str:
+    """
+    Replace the loguru handlers with a console sink on stderr and an enqueued
+    file sink. Calling it again reconfigures instead of adding sinks.
+
+    Args:
+        level: Minimum level, defaults to CODE2POSTMAN_LOG_LEVEL or INFO
+        log_file: Path of the file sink, defaults to CODE2POSTMAN_LOG_FILE; "" disables it
+
+    Returns:
+        The level in use
+    """
+    level = (level or os.environ.get(LOG_LEVEL_ENV) or DEFAULT_LOG_LEVEL).upper()
+    try:
+        logger.level(level)
+    except ValueError:
+        raise ValueError(f"Invalid log level: {level}")
+    if log_file is None:
+        log_file = os.environ.get(LOG_FILE_ENV, DEFAULT_LOG_FILE)
+
+    logger.remove()
+    _handler_ids.clear()
+    _handler_ids.append(logger.add(sys.stderr, level=level, format=CONSOLE_FORMAT))
+    if log_file:
+        _handler_ids.append(logger.add(log_file, level=level, format=FILE_FORMAT,
+                                       rotation=LOG_ROTATION, enqueue=True))
+    return level
+
+
+def log_sample_rate() -> int:
+    try:
+        return max(1, int(os.environ.get(LOG_SAMPLE_ENV, DEFAULT_LOG_SAMPLE)))
+    except ValueError:
+        return DEFAULT_LOG_SAMPLE
+
+
+class LogSampler:
+    """Lets one call in `every` through, e.g. to log a message per N files"""
+
+    __slots__ = ("every", "_counter")
+
+    def __init__(self, every: int = None):
+        self.every = every or log_sample_rate()
+        # next() on itertools.count is atomic, so worker threads can share a sampler
+        self._counter = itertools.count()
+
+    def __call__(self) -> bool:
+        return next(self._counter) % self.every == 0
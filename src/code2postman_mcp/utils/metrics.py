@@ -0,0 +1,253 @@
+"""
+Per-tool metrics: call counts, latency histograms, bytes read and written,
+JSON parse and dump time and files scanned.
+
+Tools are wrapped with `instrument`, which makes the tool's metrics current
+for the duration of the call (a context variable; `executor.run_blocking` runs
+its workers in a copy of the caller's context from contextvars.copy_context(),
+so the I/O they do on the thread pool is attributed to the same tool). The
+I/O helpers record into the current tool, or into BACKGROUND outside tools.
+Recording is a few integer additions under a per-tool lock.
+
+If the CODE2POSTMAN_METRICS_FILE environment variable is set, the metrics
+are also written there in the Prometheus text format, at most every
+DUMP_INTERVAL_SECONDS, e.g. for the node_exporter textfile collector.
+"""
+import os
+import time
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+from code2postman_mcp.utils.executor import run_blocking
+from code2postman_mcp.utils.histogram import LatencyHistogram
+from loguru import logger
+
+METRICS_FILE_ENV = "CODE2POSTMAN_METRICS_FILE"
+# Minimum time between two automatic dumps of the metrics file
+DUMP_INTERVAL_SECONDS = 10.0
+# Name under which I/O done outside any tool call is recorded
+BACKGROUND = "(background)"
+PROMETHEUS_PREFIX = "code2postman"
+# Upper bounds of the latency buckets of the Prometheus histograms, fixed so
+# that every dump exposes the same series
+PROMETHEUS_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class ToolMetrics:
+    """Counters of one tool"""
+
+    __slots__ = ("calls", "errors", "latency", "bytes_read", "bytes_written", "json_parses",
+                 "json_parse_ms", "json_dumps", "json_dump_ms", "files_scanned", "lock")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.json_parses = 0
+        self.json_parse_ms = 0.0
+        self.json_dumps = 0
+        self.json_dump_ms = 0.0
+        self.files_scanned = 0
+        self.lock = threading.Lock()
+
+    def to_dict(self, include_buckets: bool = False) -> dict:
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "latency_ms": self.latency.to_dict(include_buckets),
+                "bytes_read": self.bytes_read,
+                "bytes_written": self.bytes_written,
+                "json_parse": {"count": self.json_parses, "total_ms": round(self.json_parse_ms, 3)},
+                "json_dump": {"count": self.json_dumps, "total_ms": round(self.json_dump_ms, 3)},
+                "files_scanned": self.files_scanned,
+            }
+
+
+_active: ContextVar[Optional[ToolMetrics]] = ContextVar("code2postman_active_tool", default=None)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._tools: Dict[str, ToolMetrics] = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self._last_dump = 0.0
+
+    def tool(self, name: str) -> ToolMetrics:
+        metrics = self._tools.get(name)
+        if metrics is None:
+            with self._lock:
+                metrics = self._tools.setdefault(name, ToolMetrics())
+        return metrics
+
+    def current(self) -> ToolMetrics:
+        """The metrics of the running tool, or of BACKGROUND outside tool calls"""
+        return _active.get() or self.tool(BACKGROUND)
+
+    def snapshot(self, tool_name: str = None, include_buckets: bool = False) -> dict:
+        with self._lock:
+            tools = dict(self._tools)
+        if tool_name is not None:
+            tools = {name: metrics for name, metrics in tools.items() if name == tool_name}
+        return {
+            "uptime_seconds": round(time.time() - self.started, 3),
+            "tools": {name: tools[name].to_dict(include_buckets) for name in sorted(tools)},
+        }
+
+    def prometheus(self) -> str:
+        """The metrics in the Prometheus text exposition format"""
+        with self._lock:
+            tools = dict(self._tools)
+        p = PROMETHEUS_PREFIX
+        lines = [
+            f"# HELP {p}_uptime_seconds Seconds since the server started",
+            f"# TYPE {p}_uptime_seconds gauge",
+            f"{p}_uptime_seconds {time.time() - self.started:.3f}",
+        ]
+        counters = [
+            ("tool_calls_total", "Tool calls", lambda m: m.calls),
+            ("tool_errors_total", "Tool calls that raised", lambda m: m.errors),
+            ("bytes_read_total", "Bytes read from disk", lambda m: m.bytes_read),
+            ("bytes_written_total", "Bytes written to disk", lambda m: m.bytes_written),
+            ("json_parse_seconds_total", "Time spent parsing JSON", lambda m: m.json_parse_ms / 1000),
+            ("json_dump_seconds_total", "Time spent serializing JSON", lambda m: m.json_dump_ms / 1000),
+            ("files_scanned_total", "Files scanned while walking directories", lambda m: m.files_scanned),
+        ]
+        for name, help_text, value in counters:
+            lines += [f"# HELP {p}_{name} {help_text}", f"# TYPE {p}_{name} counter"]
+            for tool in sorted(tools):
+                with tools[tool].lock:
+                    lines.append(f'{p}_{name}{{tool="{_escape_label(tool)}"}} {value(tools[tool])}')
+        lines += [f"# HELP {p}_tool_latency_seconds Tool call latency",
+                  f"# TYPE {p}_tool_latency_seconds histogram"]
+        for tool in sorted(tools):
+            label = _escape_label(tool)
+            with tools[tool].lock:
+                histogram = tools[tool].latency
+                recorded = list(histogram.buckets())
+                for upper_ms in PROMETHEUS_BUCKETS_MS:
+                    cumulative = sum(count for value, count in recorded if value <= upper_ms)
+                    lines.append(f'{p}_tool_latency_seconds_bucket{{tool="{label}",le="{upper_ms / 1000:g}"}} {cumulative}')
+                lines.append(f'{p}_tool_latency_seconds_bucket{{tool="{label}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{p}_tool_latency_seconds_sum{{tool="{label}"}} {histogram.total_us / 1_000_000:.6f}')
+                lines.append(f'{p}_tool_latency_seconds_count{{tool="{label}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, file_path: str) -> None:
+        """Write the Prometheus text atomically, so scrapers never see a partial file"""
+        temp_path = f"{file_path}.tmp"
+        with open(temp_path, "w") as file:
+            file.write(self.prometheus())
+        os.replace(temp_path, file_path)
+
+    async def maybe_dump(self) -> None:
+        """
+        Dump to the file named by METRICS_FILE_ENV if the last dump is old
+        enough. The file is written on the I/O thread pool, not on the event loop
+        """
+        file_path = os.environ.get(METRICS_FILE_ENV)
+        now = time.monotonic()
+        if not file_path or now - self._last_dump < DUMP_INTERVAL_SECONDS:
+            return
+        self._last_dump = now
+        try:
+            await run_blocking(self.dump, file_path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {file_path}: {e}")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tools.clear()
+            self.started = time.time()
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = MetricsRegistry()
+
+
+def instrument(func):
+    """Wrap an async tool so that its calls, latency and I/O are recorded under its name"""
+    name = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        tool_metrics = metrics.tool(name)
+        token = _active.set(tool_metrics)
+        start = time.perf_counter()
+        failed = False
+        try:
+            return await func(*args, **kwargs)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            _active.reset(token)
+            with tool_metrics.lock:
+                tool_metrics.calls += 1
+                tool_metrics.errors += failed
+                tool_metrics.latency.record(elapsed_ms)
+            await metrics.maybe_dump()
+
+    return wrapper
+
+
+def record_read(byte_count: int) -> None:
+    current = metrics.current()
+    with current.lock:
+        current.bytes_read += byte_count
+
+
+def record_write(byte_count: int) -> None:
+    current = metrics.current()
+    with current.lock:
+        current.bytes_written += byte_count
+
+
+def record_file_scanned(byte_count: int = 0) -> None:
+    current = metrics.current()
+    with current.lock:
+        current.files_scanned += 1
+        current.bytes_read += byte_count
+
+
+@contextmanager
+def json_timer(kind: str) -> Iterator[None]:
+    """Time a JSON parse ("parse") or serialization ("dump") for the current tool"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        current = metrics.current()
+        with current.lock:
+            if kind == "parse":
+                current.json_parses += 1
+                current.json_parse_ms += elapsed_ms
+            else:
+                current.json_dumps += 1
+                current.json_dump_ms += elapsed_ms
+
+
+def path_size(file_path: str) -> int:
+    """Size of a file in bytes, 0 if it cannot be stat'ed"""
+    try:
+        return os.path.getsize(file_path)
+    except (OSError, TypeError, ValueError):
+        return 0
+
+
+def file_size(file) -> int:
+    """Size of an open file in bytes, 0 if it has no file descriptor"""
+    try:
+        return os.fstat(file.fileno()).st_size
+    except (AttributeError, OSError, TypeError, ValueError):
+        return 0
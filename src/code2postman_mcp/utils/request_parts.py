@@ -0,0 +1,109 @@
+"""
+Access to the parts of Postman request items shared by the exporters, the
+runner and the variable resolver.
+"""
+import json
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+def iter_indexed_request_items(items: List[dict], folders: Tuple[str, ...] = (),
+                               path: Tuple[int, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], Tuple[int, ...], dict]]:
+    """
+    Yield (folder path, index path, item) for every request of an item tree,
+    depth first. The index path locates the item in the tree, so it identifies
+    the request across copies of the same collection.
+    """
+    for index, item in enumerate(items or []):
+        if not isinstance(item, dict):
+            continue
+        if isinstance(item.get("item"), list):
+            yield from iter_indexed_request_items(item["item"], folders + (str(item.get("name", "")),), path + (index,))
+        elif "request" in item:
+            yield folders, path + (index,), item
+
+
+def iter_request_items(items: List[dict], folders: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], dict]]:
+    """Yield (folder path, item) for every request of an item tree, depth first"""
+    for item_folders, _path, item in iter_indexed_request_items(items, folders):
+        yield item_folders, item
+
+
+def collection_variables(collection: dict) -> Dict[str, str]:
+    """Map the collection variable keys to their values"""
+    return {
+        str(variable["key"]): "" if variable.get("value") is None else str(variable["value"])
+        for variable in collection.get("variable", []) or []
+        if isinstance(variable, dict) and "key" in variable and not variable.get("disabled")
+    }
+
+
+def url_to_string(url) -> str:
+    """Return the raw form of a Postman URL, which may be a string or an object"""
+    if isinstance(url, str):
+        return url
+    if not isinstance(url, dict):
+        return ""
+    if url.get("raw"):
+        return url["raw"]
+    host = url.get("host", "")
+    host = ".".join(host) if isinstance(host, list) else str(host)
+    path = url.get("path", "")
+    path = "/".join(str(p) if not isinstance(p, dict) else str(p.get("value", "")) for p in path) \
+        if isinstance(path, list) else str(path)
+    raw = f"{url['protocol']}://" if url.get("protocol") else ""
+    raw += host
+    if url.get("port"):
+        raw += f":{url['port']}"
+    if path:
+        raw += "/" + path.lstrip("/")
+    query = [q for q in url.get("query", []) or [] if isinstance(q, dict) and not q.get("disabled")]
+    if query:
+        raw += "?" + "&".join(f"{q.get('key', '')}={q.get('value', '') or ''}" for q in query)
+    return raw
+
+
+class RequestParts:
+    """The parts of a Postman request item that every exporter needs"""
+
+    __slots__ = ("name", "folders", "method", "url", "headers", "body", "content_type", "description")
+
+    def __init__(self, folders: Tuple[str, ...], item: dict):
+        request = item.get("request", {})
+        if isinstance(request, str):
+            request = {"url": request}
+        self.name = str(item.get("name", ""))
+        self.folders = folders
+        self.method = str(request.get("method", "GET")).upper()
+        self.url = url_to_string(request.get("url", ""))
+        self.headers: List[Tuple[str, str]] = [
+            (str(header.get("key", "")), str(header.get("value", "")))
+            for header in request.get("header", []) or []
+            if isinstance(header, dict) and not header.get("disabled")
+        ]
+        self.description = request.get("description") if isinstance(request.get("description"), str) else None
+        self.body: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self._read_body(request.get("body"))
+
+    def _read_body(self, body) -> None:
+        if not isinstance(body, dict) or body.get("disabled"):
+            return
+        mode = body.get("mode")
+        if mode == "raw" and body.get("raw"):
+            self.body = str(body["raw"])
+            language = ((body.get("options") or {}).get("raw") or {}).get("language")
+            self.content_type = {"json": "application/json", "xml": "application/xml",
+                                 "html": "text/html"}.get(language, "text/plain")
+        elif mode == "urlencoded":
+            pairs = [p for p in body.get("urlencoded", []) or [] if isinstance(p, dict) and not p.get("disabled")]
+            self.body = "&".join(f"{p.get('key', '')}={p.get('value', '')}" for p in pairs)
+            self.content_type = "application/x-www-form-urlencoded"
+        elif mode == "graphql" and isinstance(body.get("graphql"), dict):
+            self.body = json.dumps(body["graphql"])
+            self.content_type = "application/json"
+        if self.content_type and not any(key.lower() == "content-type" for key, _ in self.headers):
+            self.headers.append(("Content-Type", self.content_type))
+
+    @property
+    def title(self) -> str:
+        return " / ".join(self.folders + (self.name,))
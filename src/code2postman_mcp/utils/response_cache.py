@@ -0,0 +1,205 @@
+"""
+Cache of the responses of the read-only tools (read_file,
+get_tree_directory_from_path, read_postman_collection).
+
+A response is stored with the paths it was built from: the file read, the
+directories of a tree, or a collection and its shards. It is served again
+only while the (mtime_ns, size) fingerprints of these paths are unchanged and
+its TTL has not expired; a tree is checked against the mtimes of its
+directories, which change when entries are added, removed or renamed, while
+edits inside a file are only picked up once the TTL expires. Responses are
+dropped as soon as the server's own tools write a collection (through the
+change listeners of the collection cache), and the least recently used ones
+are evicted past CODE2POSTMAN_RESPONSE_CACHE_ENTRIES entries or
+CODE2POSTMAN_RESPONSE_CACHE_BYTES bytes.
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from code2postman_mcp.utils.collection_cache import Fingerprint, add_change_listener, file_fingerprint
+from loguru import logger
+
+ENTRIES_ENV = "CODE2POSTMAN_RESPONSE_CACHE_ENTRIES"
+TTL_ENV = "CODE2POSTMAN_RESPONSE_CACHE_TTL"
+BYTES_ENV = "CODE2POSTMAN_RESPONSE_CACHE_BYTES"
+# 0 entries disables the cache
+DEFAULT_ENTRIES = 256
+DEFAULT_TTL_SECONDS = 30.0
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class _Response:
+    value: Any
+    paths: Tuple[str, ...]
+    fingerprints: Tuple[Optional[Fingerprint], ...]
+    size: int
+    expires: float
+
+
+def _setting(name: str, default, cast):
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        number = cast(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {value!r}")
+    if number < 0:
+        raise ValueError(f"{name} must not be negative, got {number}")
+    return number
+
+
+def fingerprint_paths(paths: Iterable[str]) -> Tuple[Optional[Fingerprint], ...]:
+    return tuple(file_fingerprint(path) for path in paths)
+
+
+class ResponseCache:
+    """LRU cache of tool responses with a TTL, validated against the fingerprints of their paths"""
+
+    def __init__(self, max_entries: int = None, ttl: float = None, max_bytes: int = None):
+        self.max_entries = _setting(ENTRIES_ENV, DEFAULT_ENTRIES, int) if max_entries is None else max_entries
+        self.ttl = _setting(TTL_ENV, DEFAULT_TTL_SECONDS, float) if ttl is None else ttl
+        self.max_bytes = _setting(BYTES_ENV, DEFAULT_MAX_BYTES, int) if max_bytes is None else max_bytes
+        self._entries: "OrderedDict[Hashable, _Response]" = OrderedDict()
+        # Path -> keys of the responses built from it
+        self._keys_by_path: Dict[str, Set[Hashable]] = {}
+        self._bytes = 0
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+        self._tools: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _count(self, key: Hashable, counter: str) -> None:
+        self._counters[counter] += 1
+        if isinstance(key, tuple) and key and isinstance(key[0], str):
+            tool = self._tools.setdefault(key[0], {"hits": 0, "misses": 0})
+            tool[counter] += 1
+
+    def _drop(self, key: Hashable) -> None:
+        response = self._entries.pop(key, None)
+        if response is None:
+            return
+        self._bytes -= response.size
+        for path in response.paths:
+            keys = self._keys_by_path.get(path)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_path[path]
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        The cached response, or None if there is none or it is stale. Keys
+        start with the tool name, which the statistics are grouped by.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            response = self._entries.get(key)
+        if response is None:
+            with self._lock:
+                self._count(key, "misses")
+            return None
+        # The paths are stat'ed outside the lock
+        fresh = fingerprint_paths(response.paths) == response.fingerprints
+        with self._lock:
+            if self._entries.get(key) is not response:
+                self._count(key, "misses")
+                return None
+            if time.monotonic() >= response.expires:
+                self._counters["expirations"] += 1
+                fresh = False
+            if not fresh:
+                self._drop(key)
+                self._count(key, "misses")
+                return None
+            self._entries.move_to_end(key)
+            self._count(key, "hits")
+            return response.value
+
+    def put(self, key: Hashable, value: Any, paths: Iterable[str], size: int,
+            fingerprints: Tuple[Optional[Fingerprint], ...] = None) -> None:
+        """
+        Cache a response built from `paths`. Pass the `fingerprints` of the
+        paths taken before the response was built, so that a change made
+        meanwhile makes it stale; otherwise they are taken now.
+        """
+        if not self.enabled:
+            return
+        paths = tuple(os.path.abspath(path) for path in paths)
+        if not paths:
+            return
+        if fingerprints is None:
+            fingerprints = fingerprint_paths(paths)
+        if any(fingerprint is None for fingerprint in fingerprints) or size > self.max_bytes:
+            return
+        response = _Response(value, paths, fingerprints, size, time.monotonic() + self.ttl)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = response
+            self._bytes += size
+            for path in paths:
+                self._keys_by_path.setdefault(path, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+
+    def invalidate_path(self, file_path: str) -> int:
+        """Drop the responses built from a file or from a directory containing it"""
+        path = os.path.abspath(file_path)
+        candidates: List[str] = [path]
+        parent = os.path.dirname(path)
+        while parent != candidates[-1]:
+            candidates.append(parent)
+            parent = os.path.dirname(parent)
+        with self._lock:
+            keys = set()
+            for candidate in candidates:
+                keys |= self._keys_by_path.get(candidate, set())
+            for key in keys:
+                self._drop(key)
+            self._counters["invalidations"] += len(keys)
+        if keys:
+            logger.debug("Invalidated {} cached response(s) of {}", len(keys), path)
+        return len(keys)
+
+    async def on_change(self, file_path: str, folders: List[str]) -> None:
+        """Change listener: a tool wrote the collection"""
+        self.invalidate_path(file_path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_path.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Hit and miss counters, overall and per tool, with the current size"""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "tools": {name: dict(counts) for name, counts in self._tools.items()},
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._counters = dict.fromkeys(self._counters, 0)
+            self._tools.clear()
+
+
+response_cache = ResponseCache()
+add_change_listener(response_cache.on_change)
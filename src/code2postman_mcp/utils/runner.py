@@ -0,0 +1,268 @@
+"""
+Execution of the requests of a Postman collection over a pooled async HTTP
+client, used to smoke-test generated collections.
+
+Event scripts are not executed. With the "safe" script mode, a small subset
+of common statements is recognised instead: literal variable assignments in
+pre-request scripts and status code checks in test scripts.
+"""
+import re
+import time
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+import httpx
+from code2postman_mcp.consts.runner import DEFAULT_CONCURRENCY, DEFAULT_PER_HOST_LIMIT, DEFAULT_TIMEOUT_SECONDS
+from code2postman_mcp.utils.request_parts import collection_variables
+from code2postman_mcp.utils.variables import Resolver, VariableScope
+from loguru import logger
+
+# Script handling modes
+SCRIPT_MODES = ("skip", "safe")
+# Percentiles reported for every request
+PERCENTILES = (50, 90, 95, 99)
+# Distinct error messages kept per request
+MAX_ERRORS_PER_REQUEST = 5
+
+_SET_VARIABLE = re.compile(
+    r"""pm\.(?:collectionVariables|environment|variables|globals)\.set\(\s*(["'])(.+?)\1\s*,\s*(["'])(.*?)\3\s*\)"""
+)
+_EXPECT_STATUS = re.compile(
+    r"""pm\.response\.to\.have\.status\(\s*(\d{3})\s*\)"""
+    r"""|pm\.expect\(\s*pm\.response\.code\s*\)\.to\.(?:eql|equal|be\.equal)\(\s*(\d{3})\s*\)"""
+)
+
+
+@dataclass
+class RequestPlan:
+    """A request of the collection, resolved and ready to be sent"""
+    title: str
+    folders: Tuple[str, ...]
+    method: str
+    url: str
+    headers: List[Tuple[str, str]]
+    body: Optional[str]
+    # Status codes the test scripts expect
+    expected_status: List[int] = field(default_factory=list)
+    # Variables still unresolved after substitution; the request is not sent
+    unresolved: List[str] = field(default_factory=list)
+
+
+@dataclass
+class RequestOutcome:
+    latency_ms: float
+    status: Optional[int] = None
+    error: Optional[str] = None
+
+
+def _script_lines(events: List[dict], listen: str) -> List[str]:
+    lines = []
+    for event in events:
+        if not isinstance(event, dict) or event.get("listen") != listen or event.get("disabled"):
+            continue
+        exec_ = (event.get("script") or {}).get("exec", [])
+        lines.extend(exec_.splitlines() if isinstance(exec_, str) else [str(line) for line in exec_])
+    return lines
+
+
+def _iter_items(items: Iterable[Tuple[int, dict]], folders: Tuple[str, ...], path: Tuple[int, ...], events: List[dict]):
+    """Yield (folders, index path, item, events) for the (index, item) pairs and the requests below them"""
+    for index, item in items:
+        if not isinstance(item, dict):
+            continue
+        item_events = events + [e for e in item.get("event", []) or [] if isinstance(e, dict)]
+        if isinstance(item.get("item"), list):
+            yield from _iter_items(enumerate(item["item"]), folders + (str(item.get("name", "")),),
+                                   path + (index,), item_events)
+        elif "request" in item:
+            yield folders, path + (index,), item, item_events
+
+
+def prepare_requests(collection: dict, folder: str = None, scripts: str = "safe",
+                     resolver: Resolver = None) -> List[RequestPlan]:
+    """
+    Resolve the requests of a collection, or of one of its top-level folders.
+
+    Args:
+        collection: The Postman collection
+        folder: Only prepare the requests of this top-level folder
+        scripts: "skip" to ignore event scripts, "safe" to apply their recognised statements
+        resolver: The resolver of the collection variables, built from the collection if omitted
+
+    Returns:
+        The prepared requests, in document order
+    """
+    if scripts not in SCRIPT_MODES:
+        raise ValueError(f"scripts must be one of {list(SCRIPT_MODES)}, got {scripts}")
+    if resolver is None:
+        resolver = Resolver(VariableScope(collection_variables(collection)))
+    root_events = [e for e in collection.get("event", []) or [] if isinstance(e, dict)]
+    # Indexes in the whole collection, so that the resolver identifies items however they are selected
+    items = list(enumerate(collection.get("item", []) or []))
+    if folder is not None:
+        items = [(index, item) for index, item in items
+                 if isinstance(item, dict) and item.get("name") == folder and "item" in item]
+        if not items:
+            raise ValueError(f"Folder '{folder}' not found in collection")
+
+    plans = []
+    for folders, path, item, events in _iter_items(items, (), (), root_events):
+        request_resolver = resolver
+        expected_status = []
+        if scripts == "safe":
+            assignments = {}
+            for line in _script_lines(events, "prerequest"):
+                for match in _SET_VARIABLE.finditer(line):
+                    assignments[match.group(2)] = match.group(4)
+            if assignments:
+                # Script assignments only apply to this request, so it gets its own scope
+                request_resolver = Resolver(resolver.scope.with_overrides(assignments))
+            for line in _script_lines(events, "test"):
+                for match in _EXPECT_STATUS.finditer(line):
+                    expected_status.append(int(match.group(1) or match.group(2)))
+
+        resolved = request_resolver.resolve(item, key=path)
+        url = resolved.url
+        if url and "://" not in url:
+            url = f"http://{url}"
+        plans.append(RequestPlan(
+            title=" / ".join(folders + (str(item.get("name", "")),)), folders=folders, method=resolved.method,
+            url=url, headers=resolved.headers, body=resolved.body,
+            expected_status=expected_status, unresolved=resolved.undefined,
+        ))
+    return plans
+
+
+class CollectionRunner:
+    """
+    Sends prepared requests over one pooled HTTP client, limiting the number
+    of requests in flight overall and per host. Use as an async context manager.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                 timeout: float = DEFAULT_TIMEOUT_SECONDS):
+        if concurrency < 1 or per_host_limit < 1:
+            raise ValueError("concurrency and per_host_limit must be at least 1")
+        self.concurrency = concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "CollectionRunner":
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            timeout=httpx.Timeout(self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._client.aclose()
+        self._client = None
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return semaphore
+
+    async def send(self, plan: RequestPlan) -> RequestOutcome:
+        """Send one request, returning its latency and status or the error it raised"""
+        if plan.unresolved:
+            return RequestOutcome(0.0, error=f"Unresolved variables: {', '.join(plan.unresolved)}")
+        # A malformed URL fails this request only, not the whole run
+        try:
+            host_semaphore = self._host_semaphore(plan.url)
+        except ValueError as e:
+            return RequestOutcome(0.0, error=f"{type(e).__name__}: {e}")
+        async with self._semaphore, host_semaphore:
+            start = time.perf_counter()
+            try:
+                response = await self._client.request(
+                    plan.method, plan.url, headers=plan.headers,
+                    content=plan.body.encode("utf-8") if plan.body is not None else None,
+                )
+                await response.aread()
+            except (httpx.HTTPError, httpx.InvalidURL, ValueError) as e:
+                return RequestOutcome((time.perf_counter() - start) * 1000, error=f"{type(e).__name__}: {e}")
+            return RequestOutcome((time.perf_counter() - start) * 1000, status=response.status_code)
+
+
+def is_error(plan: RequestPlan, outcome: RequestOutcome) -> bool:
+    """
+    A run fails on a transport error, on a status rejected by the test script
+    checks or, for requests without checks, on a 5xx status
+    """
+    if outcome.status is None:
+        return True
+    if plan.expected_status:
+        return outcome.status not in plan.expected_status
+    return outcome.status >= 500
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(-(-percent * len(sorted_values) // 100)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(plan: RequestPlan, outcomes: List[RequestOutcome]) -> dict:
+    """Aggregate the outcomes of one request into its report entry"""
+    latencies = sorted(outcome.latency_ms for outcome in outcomes if outcome.status is not None)
+    status_codes: Dict[str, int] = {}
+    errors: List[str] = []
+    failed_assertions = 0
+    for outcome in outcomes:
+        if outcome.status is not None:
+            status_codes[str(outcome.status)] = status_codes.get(str(outcome.status), 0) + 1
+            if plan.expected_status and outcome.status not in plan.expected_status:
+                failed_assertions += 1
+        elif outcome.error not in errors and len(errors) < MAX_ERRORS_PER_REQUEST:
+            errors.append(outcome.error)
+    error_count = sum(1 for outcome in outcomes if outcome.status is None)
+    server_errors = 0 if plan.expected_status else sum(
+        1 for outcome in outcomes if outcome.status is not None and outcome.status >= 500
+    )
+    entry = {
+        "name": plan.title,
+        "method": plan.method,
+        "url": plan.url,
+        "runs": len(outcomes),
+        "status_codes": status_codes,
+        "errors": error_count,
+        "latency_ms": {
+            "min": round(latencies[0], 3) if latencies else 0.0,
+            **{f"p{p}": round(percentile(latencies, p), 3) for p in PERCENTILES},
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        },
+    }
+    if errors:
+        entry["error_messages"] = errors
+    if plan.expected_status:
+        entry["assertions"] = {
+            "expected_status": plan.expected_status,
+            "passed": len(latencies) - failed_assertions,
+            "failed": failed_assertions,
+        }
+    if server_errors:
+        entry["server_errors"] = server_errors
+    entry["ok"] = not any(is_error(plan, outcome) for outcome in outcomes)
+    return entry
+
+
+async def run_requests(plans: List[RequestPlan], runner: CollectionRunner, iterations: int = 1) -> List[dict]:
+    """Send every request `iterations` times, concurrently within the runner limits"""
+    if iterations < 1:
+        raise ValueError("iterations must be at least 1")
+    outcomes = await asyncio.gather(*(runner.send(plan) for plan in plans for _ in range(iterations)))
+    logger.debug(f"Sent {len(outcomes)} requests")
+    return [
+        summarize(plan, list(outcomes[index * iterations:(index + 1) * iterations]))
+        for index, plan in enumerate(plans)
+    ]
@@ -0,0 +1,249 @@
+"""
+Validation of Postman collections against the bundled v2.1 schema.
+
+The schema is compiled once into nested closures, one per schema node, so
+validating a value does not re-interpret the schema. Any definition can be
+used as an entry point, which lets the tools validate only the subtree they
+are about to insert. Only the JSON Schema keywords used by the Postman schema
+are supported.
+"""
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from code2postman_mcp.consts.postman_schema import POSTMAN_COLLECTION_SCHEMA
+
+# A path is a linked list of (parent, token); its string form is only built for errors
+Path = Optional[Tuple[Any, Any]]
+Error = Tuple[Path, str]
+Check = Callable[[Any, Path, List[Error]], None]
+
+# Entry point that validates a whole collection
+COLLECTION = "collection"
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "boolean": lambda value: isinstance(value, bool),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+def format_path(path: Path, root: str = "$") -> str:
+    """Render a path as a JSON path, e.g. $.item[3].request.method"""
+    tokens = []
+    while path is not None:
+        path, token = path
+        tokens.append(token)
+    rendered = root
+    for token in reversed(tokens):
+        if isinstance(token, int):
+            rendered += f"[{token}]"
+        elif _IDENTIFIER.match(token):
+            rendered += f".{token}"
+        else:
+            rendered += "['" + token.replace("'", "\\'") + "']"
+    return rendered
+
+
+def _depth(path: Path) -> int:
+    depth = 0
+    while path is not None:
+        path = path[0]
+        depth += 1
+    return depth
+
+
+class _Compiler:
+    def __init__(self, root_schema: dict):
+        self.definitions = root_schema.get("definitions", {})
+        self.compiled: Dict[str, Check] = {}
+
+    def reference(self, ref: str) -> Check:
+        prefix = "#/definitions/"
+        if not ref.startswith(prefix) or ref[len(prefix):] not in self.definitions:
+            raise ValueError(f"Unsupported schema reference: {ref}")
+        name = ref[len(prefix):]
+
+        # Resolved on first use, so recursive definitions (item-group) compile
+        def check(value: Any, path: Path, errors: List[Error]) -> None:
+            target = self.compiled.get(name)
+            if target is None:
+                target = self.compiled[name] = self.compile(self.definitions[name])
+            target(value, path, errors)
+
+        return check
+
+    def compile(self, schema: dict) -> Check:
+        checks: List[Check] = []
+
+        if "$ref" in schema:
+            checks.append(self.reference(schema["$ref"]))
+
+        if "type" in schema:
+            names = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+            type_checks = [_TYPE_CHECKS[name] for name in names]
+            expected = " or ".join(names)
+
+            def check_type(value, path, errors):
+                if not any(type_check(value) for type_check in type_checks):
+                    errors.append((path, f"expected {expected}, got {_type_name(value)}"))
+            checks.append(check_type)
+
+        if "enum" in schema:
+            allowed = list(schema["enum"])
+
+            def check_enum(value, path, errors):
+                if value not in allowed:
+                    errors.append((path, f"{value!r} is not one of {allowed}"))
+            checks.append(check_enum)
+
+        if "required" in schema:
+            required = list(schema["required"])
+
+            def check_required(value, path, errors):
+                if isinstance(value, dict):
+                    for key in required:
+                        if key not in value:
+                            errors.append((path, f"missing required property '{key}'"))
+            checks.append(check_required)
+
+        if "properties" in schema:
+            properties = [(key, self.compile(sub_schema)) for key, sub_schema in schema["properties"].items()]
+
+            def check_properties(value, path, errors):
+                if isinstance(value, dict):
+                    for key, check in properties:
+                        if key in value:
+                            check(value[key], (path, key), errors)
+            checks.append(check_properties)
+
+        if "items" in schema:
+            item_check = self.compile(schema["items"])
+
+            def check_items(value, path, errors):
+                if isinstance(value, list):
+                    for index, element in enumerate(value):
+                        item_check(element, (path, index), errors)
+            checks.append(check_items)
+
+        if "minimum" in schema:
+            minimum = schema["minimum"]
+
+            def check_minimum(value, path, errors):
+                if _TYPE_CHECKS["number"](value) and value < minimum:
+                    errors.append((path, f"{value} is less than {minimum}"))
+            checks.append(check_minimum)
+
+        if "maxLength" in schema:
+            max_length = schema["maxLength"]
+
+            def check_max_length(value, path, errors):
+                if isinstance(value, str) and len(value) > max_length:
+                    errors.append((path, f"longer than {max_length} characters"))
+            checks.append(check_max_length)
+
+        if "anyOf" in schema:
+            checks.append(self._alternatives([self.compile(s) for s in schema["anyOf"]], exactly_one=False))
+
+        if "oneOf" in schema:
+            checks.append(self._alternatives([self.compile(s) for s in schema["oneOf"]], exactly_one=True))
+
+        if not checks:
+            return lambda value, path, errors: None
+        if len(checks) == 1:
+            return checks[0]
+
+        def check_all(value, path, errors):
+            for check in checks:
+                check(value, path, errors)
+        return check_all
+
+    @staticmethod
+    def _alternatives(branches: List[Check], exactly_one: bool) -> Check:
+        def check_alternatives(value, path, errors):
+            failures = []
+            matches = 0
+            for branch in branches:
+                branch_errors: List[Error] = []
+                branch(value, path, branch_errors)
+                if not branch_errors:
+                    matches += 1
+                    if not exactly_one:
+                        return
+                else:
+                    failures.append(branch_errors)
+            if matches == 1 or (matches and not exactly_one):
+                return
+            if matches > 1:
+                errors.append((path, "matches more than one of the allowed forms"))
+                return
+            # When the value has none of the allowed types, list them all
+            if all(len(fails) == 1 and fails[0][0] is path and fails[0][1].startswith("expected ")
+                   for fails in failures):
+                expected = " or ".join(fails[0][1][len("expected "):].split(", got ")[0] for fails in failures)
+                errors.append((path, f"expected {expected}, got {_type_name(value)}"))
+                return
+            # Otherwise report the branch that got furthest into the value, i.e.
+            # the one whose errors are deepest, then the one with the fewest errors
+            best = max(failures, key=lambda fails: (max(_depth(p) for p, _ in fails), -len(fails)))
+            errors.extend(best)
+        return check_alternatives
+
+
+def _type_name(value: Any) -> str:
+    for name in ("null", "boolean", "integer", "number", "string", "array", "object"):
+        if _TYPE_CHECKS[name](value):
+            return name
+    return type(value).__name__
+
+
+@lru_cache(maxsize=None)
+def get_validator(definition: str = COLLECTION, partial: bool = False) -> Check:
+    """
+    Return the compiled check for a definition of the Postman schema ("item",
+    "event", "variable", ...) or for the whole collection. Compiled checks are
+    cached, so the schema is only compiled once per definition.
+
+    With `partial`, the properties required at the top of the definition are
+    not enforced, for values that are merged into an existing object.
+    """
+    compiler = _get_compiler()
+    if definition == COLLECTION:
+        schema = {key: value for key, value in POSTMAN_COLLECTION_SCHEMA.items() if key != "definitions"}
+    elif definition in compiler.definitions:
+        if not partial:
+            return compiler.reference(f"#/definitions/{definition}")
+        schema = compiler.definitions[definition]
+    else:
+        raise ValueError(f"Unknown schema definition: {definition}")
+    if partial:
+        schema = {key: value for key, value in schema.items() if key != "required"}
+    return compiler.compile(schema)
+
+
+@lru_cache(maxsize=None)
+def _get_compiler() -> _Compiler:
+    return _Compiler(POSTMAN_COLLECTION_SCHEMA)
+
+
+def validate(value: Any, definition: str = COLLECTION, root: str = "$", partial: bool = False) -> List[str]:
+    """
+    Validate a value against the Postman schema.
+
+    Args:
+        value: The value to validate
+        definition: The schema definition to validate against, or "collection" for a whole collection
+        root: The JSON path of the value inside its collection, used as the prefix of the error paths
+        partial: Do not require the top-level required properties of the definition
+
+    Returns:
+        The validation errors as "<json path>: <message>", empty if the value is valid
+    """
+    errors: List[Error] = []
+    get_validator(definition, partial)(value, None, errors)
+    return [f"{format_path(path, root)}: {message}" for path, message in errors]
@@ -0,0 +1,161 @@
+"""
+Sharded collections: a directory holding a manifest, which is the collection
+with every top-level folder reduced to a stub, and one file per top-level
+folder.
+
+    <dir>/collection.json       the manifest
+    <dir>/folders/<name>.json   one top-level folder, as it appears in the collection
+
+Folder shards are loaded into the cached manifest only when a tool needs
+their content, and are not read again until their file changes. Saving
+writes the manifest and only the shards of the folders that changed.
+"""
+import os
+import re
+import json
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+from code2postman_mcp.utils.collection_cache import Fingerprint, file_fingerprint
+from code2postman_mcp.utils.executor import load_json
+from code2postman_mcp.utils.metrics import json_timer, path_size, record_read, record_write
+from loguru import logger
+
+MANIFEST_FILE = "collection.json"
+SHARDS_DIR = "folders"
+# Key of the manifest mapping folder names to their shard files
+SHARDS_KEY = "_shards"
+SHARD_FORMAT_VERSION = 1
+
+
+def is_sharded(data: dict) -> bool:
+    """Whether a parsed collection is the manifest of a sharded collection"""
+    return isinstance(data, dict) and isinstance(data.get(SHARDS_KEY), dict)
+
+
+def is_folder(item: dict) -> bool:
+    return isinstance(item, dict) and isinstance(item.get("item"), list) and "name" in item
+
+
+def _shard_file(name: str, taken: Iterable[str]) -> str:
+    """Relative path of a new shard file, unique among `taken`"""
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "-", str(name)).strip("-.").lower() or "folder"
+    taken = set(taken)
+    candidate = f"{SHARDS_DIR}/{slug}.json"
+    suffix = 2
+    while candidate in taken:
+        candidate = f"{SHARDS_DIR}/{slug}-{suffix}.json"
+        suffix += 1
+    return candidate
+
+
+def _write_json(path: str, value) -> None:
+    with open(path, "w") as file, json_timer("dump"):
+        json.dump(value, file, indent=2)
+    record_write(path_size(path))
+
+
+def shard_paths(manifest_path: str, data: dict) -> Dict[str, str]:
+    """Path of the shard file of every folder of a sharded collection"""
+    directory = os.path.dirname(os.path.abspath(manifest_path))
+    return {name: os.path.join(directory, path) for name, path in data[SHARDS_KEY].get("folders", {}).items()}
+
+
+def strip_manifest(data: dict) -> dict:
+    """The collection without the shard mapping, as a single-file collection would contain it"""
+    return {key: value for key, value in data.items() if key != SHARDS_KEY}
+
+
+class ShardLoader:
+    """Loads and saves the folder shards of sharded collections"""
+
+    def __init__(self):
+        # manifest path -> folder name -> fingerprint of the shard loaded into the cached manifest
+        self._loaded: Dict[str, Dict[str, Fingerprint]] = {}
+        self._lock = threading.Lock()
+
+    def reset(self, manifest_path: str) -> None:
+        """Forget the loaded shards, after the manifest was parsed again"""
+        with self._lock:
+            self._loaded.pop(os.path.abspath(manifest_path), None)
+
+    def load(self, manifest_path: str, data: dict, folders: Optional[Iterable[str]] = None) -> int:
+        """
+        Load the content of the given top-level folders (all of them if None)
+        into the manifest, replacing their stubs. Returns the number of shards read.
+        """
+        base = os.path.dirname(os.path.abspath(manifest_path))
+        shards = data[SHARDS_KEY].get("folders", {})
+        wanted = None if folders is None else set(folders)
+        read = 0
+        with self._lock:
+            loaded = self._loaded.setdefault(os.path.abspath(manifest_path), {})
+            for index, item in enumerate(data.get("item", [])):
+                name = item.get("name") if isinstance(item, dict) else None
+                if name not in shards or (wanted is not None and name not in wanted):
+                    continue
+                shard_path = os.path.join(base, shards[name])
+                fingerprint = file_fingerprint(shard_path)
+                if fingerprint is None:
+                    raise FileNotFoundError(f"Shard of folder '{name}' does not exist: {shard_path}")
+                if loaded.get(name) == fingerprint:
+                    continue
+                with json_timer("parse"):
+                    data["item"][index] = load_json(shard_path, fingerprint[1])
+                record_read(fingerprint[1])
+                loaded[name] = fingerprint
+                read += 1
+        if read:
+            logger.debug(f"Loaded {read} shard(s) of {manifest_path}")
+        return read
+
+    def save(self, manifest_path: str, data: dict, folders: List[str]) -> None:
+        """
+        Write the shards of the changed top-level folders, delete the shards of
+        the folders that no longer exist, then write the manifest
+        """
+        base = os.path.dirname(os.path.abspath(manifest_path))
+        shards = data[SHARDS_KEY].setdefault("folders", {})
+        present = {item["name"]: item for item in data.get("item", []) if is_folder(item)}
+        with self._lock:
+            loaded = self._loaded.setdefault(os.path.abspath(manifest_path), {})
+            for name in dict.fromkeys(folders):
+                folder = present.get(name)
+                if folder is None:
+                    if name in shards:
+                        shard_path = os.path.join(base, shards.pop(name))
+                        if os.path.exists(shard_path):
+                            os.remove(shard_path)
+                        loaded.pop(name, None)
+                        logger.debug(f"Removed shard of deleted folder '{name}'")
+                    continue
+                if name not in shards:
+                    shards[name] = _shard_file(name, shards.values())
+                shard_path = os.path.join(base, shards[name])
+                os.makedirs(os.path.dirname(shard_path), exist_ok=True)
+                _write_json(shard_path, folder)
+                loaded[name] = file_fingerprint(shard_path)
+        _write_json(manifest_path, {**data, "item": [
+            {"name": item["name"], "item": []} if is_folder(item) and item["name"] in shards else item
+            for item in data.get("item", [])
+        ]})
+
+
+shard_loader = ShardLoader()
+
+
+def split_collection(collection: dict, output_dir: str) -> Dict[str, str]:
+    """
+    Write a collection as a sharded collection in `output_dir`. Top-level
+    folders must have distinct names. Returns the shard path of every folder.
+    """
+    names = [item["name"] for item in collection.get("item", []) if is_folder(item)]
+    duplicates = sorted(name for name, count in Counter(names).items() if count > 1)
+    if duplicates:
+        raise ValueError(f"Top-level folder names must be unique to shard a collection: {duplicates}")
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = {**strip_manifest(collection), SHARDS_KEY: {"version": SHARD_FORMAT_VERSION, "folders": {}}}
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    shard_loader.reset(manifest_path)
+    shard_loader.save(manifest_path, manifest, names)
+    return {name: os.path.join(output_dir, path) for name, path in manifest[SHARDS_KEY]["folders"].items()}
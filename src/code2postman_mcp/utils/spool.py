@@ -0,0 +1,91 @@
+"""
+Spool large tool outputs to temporary files and page through them by handle,
+so peak memory does not depend on the size of the output.
+"""
+import os
+import atexit
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Iterable, List, Optional
+from loguru import logger
+
+# Number of lines returned by each page of a spooled output
+PAGE_LINES = 2000
+# Maximum number of spooled outputs kept on disk; the oldest is deleted first
+MAX_SPOOLS = 16
+
+
+class LineSpool:
+    """A temporary file of lines with the byte offset of every page"""
+
+    def __init__(self, prefix: str = "code2postman-"):
+        self.handle = uuid.uuid4().hex
+        fd, self.path = tempfile.mkstemp(prefix=prefix, suffix=".txt")
+        self._file = os.fdopen(fd, "w+b")
+        self._page_offsets: List[int] = [0]
+        self._lock = threading.Lock()
+        self.total_lines = 0
+
+    def write_lines(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            if self.total_lines and self.total_lines % PAGE_LINES == 0:
+                self._page_offsets.append(self._file.tell())
+            self._file.write(line.encode("utf-8") + b"\n")
+            self.total_lines += 1
+        self._file.flush()
+
+    @property
+    def total_pages(self) -> int:
+        return len(self._page_offsets)
+
+    def read_page(self, page: int) -> str:
+        """Return the lines of a page (0-indexed) joined by newlines"""
+        if page < 0 or page >= self.total_pages:
+            raise ValueError(f"page must be between 0 and {self.total_pages - 1}, got {page}")
+        lines = []
+        with self._lock:
+            self._file.seek(self._page_offsets[page])
+            for _ in range(PAGE_LINES):
+                line = self._file.readline()
+                if not line:
+                    break
+                lines.append(line.decode("utf-8").rstrip("\n"))
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+_spools: "OrderedDict[str, LineSpool]" = OrderedDict()
+_spools_lock = threading.Lock()
+
+
+def register_spool(spool: LineSpool) -> str:
+    """Keep a spool available for paging and return its handle"""
+    with _spools_lock:
+        _spools[spool.handle] = spool
+        while len(_spools) > MAX_SPOOLS:
+            _, evicted = _spools.popitem(last=False)
+            logger.debug(f"Deleting oldest spooled output: {evicted.handle}")
+            evicted.close()
+    return spool.handle
+
+
+def get_spool(handle: str) -> Optional[LineSpool]:
+    with _spools_lock:
+        return _spools.get(handle)
+
+
+@atexit.register
+def close_all_spools() -> None:
+    """Delete every spooled output"""
+    with _spools_lock:
+        while _spools:
+            _, spool = _spools.popitem()
+            spool.close()
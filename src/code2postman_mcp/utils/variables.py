@@ -0,0 +1,377 @@
+"""
+Resolution of Postman {{variable}} placeholders.
+
+Every templated string is compiled once into a sequence of literals and
+variable slots (`compile_template`), and the compiled parts of each request
+are cached per item by the `Resolver`. Variable values can themselves contain
+placeholders; they are resolved on demand, with cycle detection, and the
+dependencies found along the way are indexed so that changing one variable
+only invalidates the variables and requests that depend on it.
+"""
+import os
+import re
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from code2postman_mcp.utils.environments import Environment
+from code2postman_mcp.utils.request_parts import RequestParts, collection_variables
+from loguru import logger
+
+# Number of distinct strings whose compiled template is kept
+TEMPLATE_CACHE_SIZE = 8192
+# Number of resolvers kept by the registry
+MAX_RESOLVERS = 16
+
+# Variable layers, from lowest to highest precedence
+LAYERS = ("collection", "environment", "overrides")
+
+_PLACEHOLDER = re.compile(r"\{\{\s*([^{}]+?)\s*\}\}")
+
+
+class Template:
+    """A string compiled into literals and variable slots"""
+
+    __slots__ = ("parts", "variables")
+
+    def __init__(self, parts: Tuple, variables: frozenset):
+        # Literals are str; slots are (name, original placeholder) tuples
+        self.parts = parts
+        self.variables = variables
+
+    def render(self, values: Dict[str, str]) -> str:
+        """Fill the slots from `values`, leaving unknown placeholders as they are"""
+        if not self.variables:
+            return self.parts[0] if self.parts else ""
+        return "".join(
+            part if isinstance(part, str) else values.get(part[0], part[1])
+            for part in self.parts
+        )
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(text: str) -> Template:
+    """Compile a string into a Template; identical strings share one compiled template"""
+    if "{{" not in text:
+        return Template((text,), frozenset())
+    parts = []
+    position = 0
+    for match in _PLACEHOLDER.finditer(text):
+        if match.start() > position:
+            parts.append(text[position:match.start()])
+        parts.append((match.group(1), match.group(0)))
+        position = match.end()
+    if position < len(text):
+        parts.append(text[position:])
+    return Template(tuple(parts), frozenset(part[0] for part in parts if not isinstance(part, str)))
+
+
+def load_environment_file(file_path: str) -> Dict[str, str]:
+    """Read the enabled values of a Postman environment file"""
+    with open(file_path, "r") as file:
+        return Environment(file_path, json.load(file)).values()
+
+
+class VariableScope:
+    """
+    Variables from the collection, an environment and explicit overrides, the
+    later layers taking precedence. Resolved values are memoized, and the
+    variables each value depends on are recorded as they are discovered.
+    """
+
+    def __init__(self, collection: Dict[str, str] = None, environment: Dict[str, str] = None,
+                 overrides: Dict[str, str] = None):
+        self._layers: Dict[str, Dict[str, str]] = {
+            "collection": dict(collection or {}),
+            "environment": dict(environment or {}),
+            "overrides": dict(overrides or {}),
+        }
+        self._resolved: Dict[str, str] = {}
+        # variable -> variables whose value references it
+        self._dependents: Dict[str, Set[str]] = {}
+
+    def raw(self, name: str) -> Optional[str]:
+        for layer in reversed(LAYERS):
+            if name in self._layers[layer]:
+                return self._layers[layer][name]
+        return None
+
+    def names(self) -> List[str]:
+        return list(OrderedDict.fromkeys(name for layer in LAYERS for name in self._layers[layer]))
+
+    def with_overrides(self, overrides: Dict[str, str]) -> "VariableScope":
+        """A new scope with the same variables plus extra overrides"""
+        return VariableScope(self._layers["collection"], self._layers["environment"],
+                             {**self._layers["overrides"], **overrides})
+
+    def value(self, name: str, _stack: Tuple[str, ...] = ()) -> Optional[str]:
+        """
+        Return the resolved value of a variable, None if it is not defined.
+        Placeholders referring to undefined variables are kept in the value.
+        Raises ValueError if the variable refers to itself, directly or not.
+        """
+        if name in self._resolved:
+            return self._resolved[name]
+        if name in _stack:
+            cycle = _stack[_stack.index(name):] + (name,)
+            raise ValueError(f"Variable cycle: {' -> '.join(cycle)}")
+        raw = self.raw(name)
+        if raw is None:
+            return None
+        template = compile_template(raw)
+        values = {}
+        for dependency in template.variables:
+            self._dependents.setdefault(dependency, set()).add(name)
+            value = self.value(dependency, _stack + (name,))
+            if value is not None:
+                values[dependency] = value
+        resolved = template.render(values)
+        self._resolved[name] = resolved
+        return resolved
+
+    def values_for(self, names: Iterable[str]) -> Dict[str, str]:
+        """Resolved values of the given variables that are defined"""
+        values = {}
+        for name in names:
+            value = self.value(name)
+            if value is not None:
+                values[name] = value
+        return values
+
+    def undefined(self, names: Iterable[str]) -> Set[str]:
+        """The given variables that are not defined, directly or through the variables they refer to"""
+        missing = set()
+        pending = list(names)
+        seen = set()
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            raw = self.raw(name)
+            if raw is None:
+                missing.add(name)
+            else:
+                pending.extend(compile_template(raw).variables)
+        return missing
+
+    def affected_by(self, name: str) -> Set[str]:
+        """The variable and every variable whose value depends on it"""
+        affected = set()
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            if current not in affected:
+                affected.add(current)
+                pending.extend(self._dependents.get(current, ()))
+        return affected
+
+    def set(self, name: str, value: Optional[str], layer: str = "collection") -> Set[str]:
+        """
+        Set (or with None, remove) a variable in one layer, and return the
+        variables whose resolved value may have changed.
+        """
+        if layer not in LAYERS:
+            raise ValueError(f"layer must be one of {list(LAYERS)}, got {layer}")
+        if value is None:
+            self._layers[layer].pop(name, None)
+        else:
+            self._layers[layer][name] = str(value)
+        affected = self.affected_by(name)
+        for variable in affected:
+            self._resolved.pop(variable, None)
+        return affected
+
+
+@dataclass
+class ResolvedRequest:
+    method: str
+    url: str
+    headers: List[Tuple[str, str]]
+    body: Optional[str]
+    # Variables used by the request that are not defined
+    undefined: List[str]
+
+
+class _ItemTemplates:
+    __slots__ = ("item", "method", "url", "headers", "body", "variables")
+
+    def __init__(self, item: dict, parts: RequestParts):
+        self.item = item
+        self.method = parts.method
+        self.url = compile_template(parts.url)
+        self.headers = [(compile_template(key), compile_template(value)) for key, value in parts.headers]
+        self.body = compile_template(parts.body) if parts.body is not None else None
+        variables = set(self.url.variables)
+        for key, value in self.headers:
+            variables |= key.variables | value.variables
+        if self.body is not None:
+            variables |= self.body.variables
+        self.variables = frozenset(variables)
+
+
+class Resolver:
+    """
+    Resolves the requests of a collection against a VariableScope. The
+    compiled templates and the resolved form of every request are cached per
+    item, and an index of the variables used by each item limits the work
+    done when a variable changes to the requests that use it.
+
+    Items are identified by the key passed to `resolve`, normally their index
+    path in the collection, which stays the same for the copies of an item
+    made when payloads are inlined; without a key, by the item object itself.
+    """
+
+    def __init__(self, scope: VariableScope):
+        self.scope = scope
+        self._templates: Dict[Hashable, _ItemTemplates] = {}
+        self._resolved: Dict[Hashable, ResolvedRequest] = {}
+        # variable -> keys of the items that use it
+        self._users: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def _item_templates(self, item: dict, key: Hashable, by_identity: bool) -> _ItemTemplates:
+        templates = self._templates.get(key)
+        if templates is None or (by_identity and templates.item is not item):
+            templates = self._templates[key] = _ItemTemplates(item, RequestParts((), item))
+            self._resolved.pop(key, None)
+            for name in templates.variables:
+                self._users.setdefault(name, set()).add(key)
+        return templates
+
+    def resolve(self, item: dict, key: Optional[Hashable] = None) -> ResolvedRequest:
+        """
+        Return the request of an item with its placeholders resolved. `key`
+        identifies the item within the collection revision the resolver was
+        built for, e.g. its index path.
+        """
+        by_identity = key is None
+        if by_identity:
+            key = id(item)
+        with self._lock:
+            templates = self._item_templates(item, key, by_identity)
+            resolved = self._resolved.get(key)
+            if resolved is not None:
+                return resolved
+            # Dependencies of the variables are only discovered while resolving them
+            values = self.scope.values_for(templates.variables)
+            for name in templates.variables:
+                for dependency in self._dependencies(name):
+                    self._users.setdefault(dependency, set()).add(key)
+            resolved = ResolvedRequest(
+                method=templates.method,
+                url=templates.url.render(values),
+                headers=[(key.render(values), value.render(values)) for key, value in templates.headers],
+                body=templates.body.render(values) if templates.body is not None else None,
+                undefined=sorted(self.scope.undefined(templates.variables)),
+            )
+            self._resolved[key] = resolved
+            return resolved
+
+    def _dependencies(self, name: str) -> Set[str]:
+        dependencies = set()
+        pending = [name]
+        while pending:
+            raw = self.scope.raw(pending.pop())
+            if raw is None:
+                continue
+            for dependency in compile_template(raw).variables:
+                if dependency not in dependencies:
+                    dependencies.add(dependency)
+                    pending.append(dependency)
+        return dependencies
+
+    def render(self, text: str) -> str:
+        """Resolve the placeholders of any string against the scope"""
+        template = compile_template(text)
+        with self._lock:
+            values = self.scope.values_for(template.variables)
+        return template.render(values)
+
+    def set_variable(self, name: str, value: Optional[str], layer: str = "collection") -> int:
+        """Change a variable and drop the resolved requests that use it; returns how many were dropped"""
+        with self._lock:
+            affected = self.scope.set(name, value, layer)
+            dropped = set()
+            for variable in affected:
+                dropped |= self._users.get(variable, set())
+            for key in dropped:
+                self._resolved.pop(key, None)
+        logger.debug(f"Variable {name} changed, {len(dropped)} resolved requests invalidated")
+        return len(dropped)
+
+
+class ResolverRegistry:
+    """
+    Resolvers of recently used collections, per environment and overrides.
+    A resolver is reused while the collection stays at the revision it was
+    built for; variable updates made through the tools are applied to it in
+    place instead of rebuilding it.
+    """
+
+    def __init__(self, max_entries: int = MAX_RESOLVERS):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Tuple[int, Resolver]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(file_path: str, environment_key: Optional[str], overrides: Optional[Dict[str, str]]) -> tuple:
+        return (os.path.abspath(file_path), environment_key, tuple(sorted((overrides or {}).items())))
+
+    def get(self, file_path: str, revision: int, collection: dict, environment: Dict[str, str] = None,
+            environment_key: str = None, overrides: Dict[str, str] = None) -> Resolver:
+        """
+        Return the resolver of a collection at `revision`, building it if needed.
+        `environment_key` identifies the environment values (e.g. their file and revision).
+        """
+        key = self._key(file_path, environment_key, overrides)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == revision:
+                self._entries.move_to_end(key)
+                return entry[1]
+        resolver = Resolver(VariableScope(collection_variables(collection), environment, overrides))
+        with self._lock:
+            self._entries[key] = (revision, resolver)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return resolver
+
+    def variable_changed(self, file_path: str, name: str, value: Optional[str],
+                         old_revision: int, new_revision: int) -> None:
+        """Apply a collection variable change to the resolvers built for `old_revision`"""
+        self.variables_changed(file_path, {name: value}, old_revision, new_revision)
+
+    def variables_changed(self, file_path: str, values: Dict[str, Optional[str]],
+                          old_revision: int, new_revision: int) -> None:
+        """Apply collection variable changes made in one revision to the resolvers built for `old_revision`"""
+        path = os.path.abspath(file_path)
+        with self._lock:
+            entries = [(key, entry) for key, entry in self._entries.items() if key[0] == path]
+            for key, (revision, resolver) in entries:
+                if revision != old_revision:
+                    del self._entries[key]
+                    continue
+                for name, value in values.items():
+                    resolver.set_variable(name, value)
+                self._entries[key] = (new_revision, resolver)
+
+    def environment_changed(self, old_key: str, new_key: str, values: Dict[str, Optional[str]]) -> None:
+        """Apply environment variable changes to the resolvers built with the environment `old_key`"""
+        with self._lock:
+            entries = [(key, entry) for key, entry in self._entries.items() if key[1] == old_key]
+            for key, (revision, resolver) in entries:
+                del self._entries[key]
+                for name, value in values.items():
+                    resolver.set_variable(name, value, "environment")
+                self._entries[(key[0], new_key, key[2])] = (revision, resolver)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+resolvers = ResolverRegistry()
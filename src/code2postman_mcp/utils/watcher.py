@@ -0,0 +1,371 @@
+"""
+Background filesystem watchers that keep an in-memory model of a filtered
+directory tree (and the line counts of its files) up to date.
+
+On Linux the watcher uses inotify through ctypes; everywhere else, or when
+inotify is unavailable or runs out of watches, it falls back to polling.
+Either way the watcher only records which directories changed, and the next
+tree request rescans just those directories; in polling mode the request
+polls first, so it never serves a tree older than the request.
+"""
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Pattern, Set, Tuple
+from code2postman_mcp.utils.files import count_lines
+from loguru import logger
+
+# Maximum number of roots watched at the same time
+MAX_WATCHERS = 8
+# Seconds without a tree request after which a watcher stops itself
+WATCHER_IDLE_SECONDS = 600.0
+# Seconds between two scans of the polling fallback
+POLL_INTERVAL_SECONDS = 2.0
+
+# inotify constants (see <sys/inotify.h>)
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_NONBLOCK = 0x00000800
+_IN_CLOEXEC = 0x00080000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+# (mtime_ns, size, line count) for a file
+FileEntry = Tuple[int, int, int]
+
+
+class _Inotify:
+    """Minimal ctypes binding to the Linux inotify API"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: str) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """Read all pending events without blocking, as (wd, mask, name) tuples"""
+        events = []
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+                events.append((wd, mask, os.fsdecode(name)))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _is_excluded(name: str, patterns: List[Pattern]) -> bool:
+    return any(pattern.search(name) for pattern in patterns)
+
+
+class TreeWatcher:
+    """
+    Keep the filtered tree under `root` in memory and refresh only the
+    directories that changed since the last request.
+    """
+
+    def __init__(self, root: str, dir_patterns: List[Pattern], file_patterns: List[Pattern],
+                 use_inotify: Optional[bool] = None, poll_interval: float = POLL_INTERVAL_SECONDS,
+                 idle_seconds: float = WATCHER_IDLE_SECONDS):
+        self.root = os.path.abspath(root)
+        self.dir_patterns = dir_patterns
+        self.file_patterns = file_patterns
+        self.poll_interval = poll_interval
+        self.idle_seconds = idle_seconds
+        self.last_used = time.monotonic()
+
+        # Directory path -> filtered, sorted subdirectory names
+        self._dirs: Dict[str, List[str]] = {}
+        # Directory path -> {file name: (mtime_ns, size, lines)}
+        self._files: Dict[str, Dict[str, FileEntry]] = {}
+        # Directory path -> directory mtime_ns, used by the polling fallback
+        self._dir_mtimes: Dict[str, int] = {}
+        self._dirty: Set[str] = set()
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        # Written to by `stop` so a thread blocked in select wakes up immediately
+        self._wake_r, self._wake_w = os.pipe()
+
+        self._inotify: Optional[_Inotify] = None
+        self._wd_to_dir: Dict[int, str] = {}
+        self._dir_to_wd: Dict[str, int] = {}
+        if use_inotify is None:
+            use_inotify = sys.platform.startswith("linux")
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                logger.warning(f"inotify unavailable, falling back to polling: {str(e)}")
+
+        self._scan_subtree(self.root)
+        self._thread = threading.Thread(target=self._run, name=f"tree-watcher:{self.root}", daemon=True)
+        self._thread.start()
+        logger.info(f"Started {self.mode} watcher for {self.root} ({len(self._dirs)} directories)")
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    @property
+    def alive(self) -> bool:
+        return not self._stop.is_set()
+
+    def stop(self) -> None:
+        """Stop the background thread and release the inotify descriptor"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        os.write(self._wake_w, b"\0")
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.poll_interval + 1)
+        with self._lock:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+        logger.info(f"Stopped watcher for {self.root}")
+
+    def lines(self, title: str) -> List[str]:
+        """
+        Return the tree lines in the same format as `get_tree_directory_from_path`,
+        rescanning only the directories that changed since the last call.
+        """
+        self.last_used = time.monotonic()
+        with self._lock:
+            self._drain_events()
+            self._refresh_dirty()
+            tree_lines = [f"{title}/"]
+            self._render_dir(self.root, 0, tree_lines)
+        return tree_lines
+
+    def render(self, title: str) -> str:
+        """Return the tree as a single string, see `lines`"""
+        return "\n".join(self.lines(title))
+
+    def _render_dir(self, directory: str, level: int, tree_lines: List[str]) -> None:
+        indent = " " * 4 * (level + 1)
+        for name, (_mtime, _size, lines) in sorted(self._files.get(directory, {}).items()):
+            tree_lines.append(f"{indent}{name} ({lines} lines)")
+        for name in self._dirs.get(directory, []):
+            tree_lines.append(f"{indent}{name}/")
+            self._render_dir(os.path.join(directory, name), level + 1, tree_lines)
+
+    def _scan_subtree(self, directory: str) -> None:
+        """(Re)scan a directory and recursively every subdirectory not yet known"""
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            for subdir in self._scan_dir(current):
+                if subdir not in self._dirs:
+                    pending.append(subdir)
+
+    def _scan_dir(self, directory: str) -> List[str]:
+        """Rescan a single directory, returning the paths of its filtered subdirectories"""
+        try:
+            entries = list(os.scandir(directory))
+            dir_mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            self._forget_subtree(directory)
+            return []
+
+        previous = self._files.get(directory, {})
+        files: Dict[str, FileEntry] = {}
+        subdirs: List[str] = []
+        for entry in entries:
+            try:
+                # Like os.walk, symlinks to directories are neither followed nor listed
+                if entry.is_dir(follow_symlinks=False):
+                    if not _is_excluded(entry.name, self.dir_patterns):
+                        subdirs.append(entry.name)
+                elif entry.is_dir():
+                    continue
+                elif not _is_excluded(entry.name, self.file_patterns):
+                    stat = entry.stat()
+                    cached = previous.get(entry.name)
+                    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                        files[entry.name] = cached
+                    else:
+                        files[entry.name] = (stat.st_mtime_ns, stat.st_size, count_lines(entry.path))
+            except OSError:
+                continue
+
+        subdirs.sort()
+        for removed in set(self._dirs.get(directory, [])) - set(subdirs):
+            self._forget_subtree(os.path.join(directory, removed))
+        self._dirs[directory] = subdirs
+        self._files[directory] = files
+        self._dir_mtimes[directory] = dir_mtime
+        self._watch(directory)
+        return [os.path.join(directory, name) for name in subdirs]
+
+    def _forget_subtree(self, directory: str) -> None:
+        prefix = directory + os.sep
+        for known in [d for d in self._dirs if d == directory or d.startswith(prefix)]:
+            self._dirs.pop(known, None)
+            self._files.pop(known, None)
+            self._dir_mtimes.pop(known, None)
+            self._dirty.discard(known)
+            wd = self._dir_to_wd.pop(known, None)
+            if wd is not None:
+                self._wd_to_dir.pop(wd, None)
+                if self._inotify is not None:
+                    self._inotify.rm_watch(wd)
+
+    def _watch(self, directory: str) -> None:
+        if self._inotify is None or directory in self._dir_to_wd:
+            return
+        try:
+            wd = self._inotify.add_watch(directory)
+        except OSError as e:
+            # Usually ENOSPC (fs.inotify.max_user_watches reached)
+            logger.warning(f"Cannot watch {directory} ({str(e)}), falling back to polling")
+            self._inotify.close()
+            self._inotify = None
+            self._wd_to_dir.clear()
+            self._dir_to_wd.clear()
+            return
+        self._wd_to_dir[wd] = directory
+        self._dir_to_wd[directory] = wd
+
+    def _drain_events(self) -> None:
+        if self._inotify is None:
+            return
+        for wd, mask, _name in self._inotify.read_events():
+            if mask & _IN_Q_OVERFLOW:
+                logger.warning(f"inotify queue overflow for {self.root}, rescanning everything")
+                self._dirty.update(self._dirs)
+                continue
+            directory = self._wd_to_dir.get(wd)
+            if directory is None:
+                continue
+            if mask & (_IN_IGNORED | _IN_DELETE_SELF | _IN_MOVE_SELF):
+                self._wd_to_dir.pop(wd, None)
+                self._dir_to_wd.pop(directory, None)
+            self._dirty.add(directory)
+
+    def _poll(self) -> None:
+        """Compare directory and file fingerprints with the model and mark changes dirty"""
+        for directory in list(self._dirs):
+            try:
+                if os.stat(directory).st_mtime_ns != self._dir_mtimes.get(directory):
+                    self._dirty.add(directory)
+                    continue
+                for name, (mtime, size, _lines) in self._files.get(directory, {}).items():
+                    stat = os.stat(os.path.join(directory, name))
+                    if (stat.st_mtime_ns, stat.st_size) != (mtime, size):
+                        self._dirty.add(directory)
+                        break
+            except OSError:
+                self._dirty.add(directory)
+
+    def _refresh_dirty(self) -> None:
+        if self._inotify is None:
+            # The background poll may be up to poll_interval old: poll before serving
+            self._poll()
+        if not self._dirty:
+            return
+        dirty = sorted(self._dirty)
+        self._dirty.clear()
+        logger.debug(f"Refreshing {len(dirty)} changed directories under {self.root}")
+        for directory in dirty:
+            if directory == self.root or directory in self._dirs:
+                self._scan_subtree(directory)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if time.monotonic() - self.last_used > self.idle_seconds:
+                logger.info(f"Watcher for {self.root} idle for {self.idle_seconds}s, expiring")
+                self.stop()
+                return
+            inotify = self._inotify
+            if inotify is not None:
+                try:
+                    readable, _, _ = select.select([inotify.fd, self._wake_r], [], [], self.poll_interval)
+                except (OSError, ValueError):
+                    continue
+                if inotify.fd in readable and not self._stop.is_set():
+                    with self._lock:
+                        self._drain_events()
+            else:
+                self._stop.wait(self.poll_interval)
+                if not self._stop.is_set():
+                    with self._lock:
+                        self._poll()
+
+
+_watchers: "OrderedDict[Tuple[str, str], TreeWatcher]" = OrderedDict()
+_watchers_lock = threading.Lock()
+
+
+def get_watcher(root: str, profile: str, dir_patterns: List[Pattern],
+                file_patterns: List[Pattern]) -> TreeWatcher:
+    """
+    Return the live watcher for `root` and exclusion `profile`, starting one if
+    needed. At most `MAX_WATCHERS` are kept; the least recently used is stopped.
+    """
+    key = (os.path.abspath(root), profile)
+    with _watchers_lock:
+        for stale_key in [k for k, w in _watchers.items() if not w.alive]:
+            del _watchers[stale_key]
+        watcher = _watchers.get(key)
+        if watcher is not None:
+            _watchers.move_to_end(key)
+            return watcher
+        while len(_watchers) >= MAX_WATCHERS:
+            _, evicted = _watchers.popitem(last=False)
+            logger.debug(f"Evicting least recently used watcher: {evicted.root}")
+            evicted.stop()
+        watcher = TreeWatcher(root, dir_patterns, file_patterns)
+        _watchers[key] = watcher
+        return watcher
+
+
+def stop_all_watchers() -> None:
+    """Stop every running watcher"""
+    with _watchers_lock:
+        while _watchers:
+            _, watcher = _watchers.popitem()
+            watcher.stop()
@@ -0,0 +1,157 @@
+import os
+import sys
+import json
+import time
+import socket
+import subprocess
+import pytest
+from typing import Tuple
+
+# Time allowed from spawning the server to its answer to `initialize`,
+# generous enough for slow CI machines
+STARTUP_TARGET_SECONDS = 5.0
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-03-26",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-test", "version": "0"},
+    },
+}
+
+
+def _environment() -> dict:
+    source = os.path.join(os.path.dirname(__file__), "..", "..", "..", "src")
+    return {**os.environ, "PYTHONPATH": os.path.abspath(source), "CODE2POSTMAN_LOG_LEVEL": "ERROR"}
+
+
+class TestServerStartup:
+    def test_import_has_no_side_effects(self, tmp_path):
+        """Test importing the server creates no log file and loads no tool subsystem"""
+        script = (
+            "import sys, code2postman_mcp.server\n"
+            "print([name for name in sys.modules if name.startswith(('code2postman_mcp.tools', "
+            "'code2postman_mcp.exporters', 'code2postman_mcp.utils.runner', 'code2postman_mcp.utils.watcher'))])"
+        )
+        result = subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=_environment(),
+                                capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == "[]"
+        assert not (tmp_path / "logs").exists()
+
+    def test_handshake_within_target(self, tmp_path):
+        """Test the server answers `initialize` within the startup target"""
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-c", "from code2postman_mcp.server import main; main()"],
+            cwd=tmp_path, env={**_environment(), "CODE2POSTMAN_LOG_FILE": ""},
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        try:
+            process.stdin.write(json.dumps(INITIALIZE) + "\n")
+            process.stdin.flush()
+            response = json.loads(process.stdout.readline())
+            elapsed = time.perf_counter() - start
+        finally:
+            process.stdin.close()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+        assert response["id"] == 1
+        assert response["result"]["serverInfo"]["name"] == "code2postman-mcp"
+        assert elapsed < STARTUP_TARGET_SECONDS
+        assert not (tmp_path / "logs").exists()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_http_server(tmp_path, transport: str) -> Tuple[subprocess.Popen, int]:
+    """Start the server on a free localhost port and wait until it accepts connections"""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-c", "from code2postman_mcp.server import main; main()",
+         "--transport", transport, "--port", str(port), "--workers", "2"],
+        cwd=tmp_path, env={**_environment(), "CODE2POSTMAN_LOG_FILE": ""},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + STARTUP_TARGET_SECONDS * 2
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return process, port
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise AssertionError(f"{transport} server did not listen on port {port}")
+
+
+def _stop(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+class TestHttpTransports:
+    def test_parse_args_defaults_from_environment(self, monkeypatch):
+        """Test the transport options fall back to their environment variables"""
+        from code2postman_mcp.server import parse_args
+
+        monkeypatch.setenv("CODE2POSTMAN_TRANSPORT", "sse")
+        monkeypatch.setenv("CODE2POSTMAN_PORT", "9001")
+        args = parse_args([])
+        assert (args.transport, args.host, args.port, args.workers) == ("sse", "127.0.0.1", 9001, None)
+
+        with pytest.raises(SystemExit):
+            parse_args(["--workers", "0"])
+
+    @pytest.mark.asyncio
+    async def test_streamable_http_serves_several_clients(self, tmp_path):
+        """Test two clients of one streamable-HTTP server share its process and caches"""
+        from mcp import ClientSession
+        from mcp.client.streamable_http import streamablehttp_client
+
+        source = tmp_path / "module.py"
+        source.write_text("a = 1\n")
+        process, port = _start_http_server(tmp_path, "streamable-http")
+        try:
+            for _ in range(2):
+                async with streamablehttp_client(f"http://127.0.0.1:{port}/mcp") as (read, write, _):
+                    async with ClientSession(read, write) as session:
+                        await session.initialize()
+                        result = await session.call_tool("read_file", {"file_path": str(source)})
+                        assert not result.isError
+                        assert "a = 1" in result.content[0].text
+                        metrics = await session.call_tool("get_server_metrics", {"tool_name": "read_file"})
+            # The second client sees the calls of the first one
+            assert json.loads(metrics.content[0].text)["tools"]["read_file"]["calls"] == 2
+        finally:
+            _stop(process)
+
+    @pytest.mark.asyncio
+    async def test_sse(self, tmp_path):
+        """Test the SSE transport answers the handshake and lists the tools"""
+        from mcp import ClientSession
+        from mcp.client.sse import sse_client
+
+        process, port = _start_http_server(tmp_path, "sse")
+        try:
+            async with sse_client(f"http://127.0.0.1:{port}/sse") as (read, write):
+                async with ClientSession(read, write) as session:
+                    initialized = await session.initialize()
+                    tools = await session.list_tools()
+        finally:
+            _stop(process)
+
+        assert initialized.serverInfo.name == "code2postman-mcp"
+        assert "read_postman_collection" in [tool.name for tool in tools.tools]
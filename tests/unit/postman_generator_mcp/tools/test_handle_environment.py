@@ -0,0 +1,185 @@
+import json
+import pytest
+from unittest.mock import patch
+
+from code2postman_mcp.tools.handle_environment import (
+    activate_postman_environment,
+    create_postman_environment,
+    get_active_postman_environment,
+    read_postman_environment,
+    set_postman_environment_variables,
+    update_postman_environment_variable,
+)
+from code2postman_mcp.tools.handle_postman import (
+    add_postman_collection_item,
+    add_postman_collection_variable,
+    create_postman_collection,
+)
+from code2postman_mcp.tools.handle_runner import preview_postman_request
+from code2postman_mcp.utils.environments import environment_store
+
+
+@pytest.fixture(autouse=True)
+def clear_environments():
+    environment_store.clear()
+    yield
+    environment_store.clear()
+
+
+class TestCreatePostmanEnvironment:
+    @pytest.mark.asyncio
+    async def test_create_environment(self, tmp_path):
+        """Test the environment file is written in the Postman format"""
+        file_path = str(tmp_path / "dev.json")
+
+        result = await create_postman_environment(file_path, "Dev", {"base_url": "http://dev", "token": "t"})
+
+        with open(file_path) as file:
+            data = json.load(file)
+        assert data == result
+        assert data["name"] == "Dev"
+        assert data["_postman_variable_scope"] == "environment"
+        assert data["values"] == [
+            {"key": "base_url", "value": "http://dev", "type": "default", "enabled": True},
+            {"key": "token", "value": "t", "type": "default", "enabled": True},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments(self, tmp_path):
+        """Test invalid paths and values are rejected"""
+        with pytest.raises(ValueError, match="not a JSON file"):
+            await create_postman_environment(str(tmp_path / "dev.txt"), "Dev")
+        with pytest.raises(TypeError):
+            await create_postman_environment(str(tmp_path / "dev.json"), "Dev", {"port": 8080})
+
+
+class TestEnvironmentVariables:
+    @pytest.mark.asyncio
+    async def test_set_variables_upserts_in_order(self, tmp_path):
+        """Test existing variables are updated in place and new ones appended"""
+        file_path = str(tmp_path / "dev.json")
+        await create_postman_environment(file_path, "Dev", {"a": "1", "b": "2"})
+
+        result = await set_postman_environment_variables(file_path, {"b": "20", "c": "3", "d": "4"})
+
+        assert result == {"added": ["c", "d"], "updated": ["b"]}
+        data = await read_postman_environment(file_path)
+        assert [(value["key"], value["value"]) for value in data["values"]] == [
+            ("a", "1"), ("b", "20"), ("c", "3"), ("d", "4"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_set_variables_writes_once(self, tmp_path):
+        """Test a bulk update writes the file a single time"""
+        file_path = str(tmp_path / "dev.json")
+        await create_postman_environment(file_path, "Dev")
+
+        with patch("json.dump", wraps=json.dump) as mock_dump:
+            await set_postman_environment_variables(file_path, {f"key{i}": str(i) for i in range(100)})
+
+        assert mock_dump.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_update_variable(self, tmp_path):
+        """Test a single variable is updated and missing ones are rejected"""
+        file_path = str(tmp_path / "dev.json")
+        await create_postman_environment(file_path, "Dev", {"base_url": "http://old"})
+
+        data = await update_postman_environment_variable(file_path, "base_url", "http://new")
+
+        assert data["values"][0]["value"] == "http://new"
+        with pytest.raises(ValueError, match="not found"):
+            await update_postman_environment_variable(file_path, "missing", "x")
+
+    @pytest.mark.asyncio
+    async def test_read_reflects_external_changes(self, tmp_path):
+        """Test the environment is parsed again when the file changes on disk"""
+        file_path = tmp_path / "dev.json"
+        file_path.write_text(json.dumps({"name": "Dev", "values": [{"key": "a", "value": "1"}]}))
+        assert (await read_postman_environment(str(file_path)))["values"][0]["value"] == "1"
+
+        file_path.write_text(json.dumps({"name": "Dev", "values": [{"key": "a", "value": "changed"}]}))
+
+        assert (await read_postman_environment(str(file_path)))["values"][0]["value"] == "changed"
+
+    @pytest.mark.asyncio
+    async def test_read_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            await read_postman_environment(str(tmp_path / "missing.json"))
+
+
+class TestActiveEnvironment:
+    @pytest.mark.asyncio
+    async def test_activate_and_deactivate(self, tmp_path):
+        """Test the active environment is reported until it is deactivated"""
+        file_path = str(tmp_path / "dev.json")
+        await create_postman_environment(file_path, "Dev", {"base_url": "http://dev"})
+        assert await get_active_postman_environment() == {"active": None}
+
+        result = await activate_postman_environment(file_path)
+
+        assert result["active"]["name"] == "Dev"
+        assert result["active"]["variables"] == {"base_url": "http://dev"}
+        assert (await get_active_postman_environment())["active"]["name"] == "Dev"
+        assert await activate_postman_environment() == {"active": None}
+        assert await get_active_postman_environment() == {"active": None}
+
+    @pytest.mark.asyncio
+    async def test_switching_does_not_reparse(self, tmp_path):
+        """Test switching between environments uses the in-memory copies"""
+        collection_path = str(tmp_path / "collection.json")
+        await create_postman_collection(collection_path, "Test API", "Description")
+        await add_postman_collection_variable(collection_path, {"key": "base_url", "value": "http://collection"})
+        await add_postman_collection_item(collection_path, {"name": "Health", "request": "{{base_url}}/health"})
+        dev = str(tmp_path / "dev.json")
+        prod = str(tmp_path / "prod.json")
+        await create_postman_environment(dev, "Dev", {"base_url": "http://dev"})
+        await create_postman_environment(prod, "Prod", {"base_url": "http://prod"})
+
+        with patch("json.load", wraps=json.load) as mock_load:
+            await activate_postman_environment(dev)
+            assert (await preview_postman_request(collection_path, "Health"))["url"] == "http://dev/health"
+            await activate_postman_environment(prod)
+            assert (await preview_postman_request(collection_path, "Health"))["url"] == "http://prod/health"
+            await activate_postman_environment(dev)
+            assert (await preview_postman_request(collection_path, "Health"))["url"] == "http://dev/health"
+
+        mock_load.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_updates_apply_to_active_environment(self, tmp_path):
+        """Test variables set through the tools are used by the next resolution"""
+        collection_path = str(tmp_path / "collection.json")
+        await create_postman_collection(collection_path, "Test API", "Description")
+        await add_postman_collection_item(collection_path, {"name": "Health", "request": "{{base_url}}/health"})
+        dev = str(tmp_path / "dev.json")
+        await create_postman_environment(dev, "Dev", {"base_url": "http://old"})
+        await activate_postman_environment(dev)
+        assert (await preview_postman_request(collection_path, "Health"))["url"] == "http://old/health"
+
+        await set_postman_environment_variables(dev, {"base_url": "http://new"})
+
+        assert (await preview_postman_request(collection_path, "Health"))["url"] == "http://new/health"
+        assert (await get_active_postman_environment())["active"]["variables"] == {"base_url": "http://new"}
+
+    @pytest.mark.asyncio
+    async def test_disabled_variables_are_not_resolved(self, tmp_path):
+        """Test updating disabled variables keeps them out of the resolution"""
+        collection_path = str(tmp_path / "collection.json")
+        await create_postman_collection(collection_path, "Test API", "Description")
+        await add_postman_collection_variable(collection_path, {"key": "base_url", "value": "http://collection"})
+        await add_postman_collection_item(collection_path, {"name": "Health", "request": "{{base_url}}/{{path}}"})
+        dev = tmp_path / "dev.json"
+        dev.write_text(json.dumps({"name": "Dev", "values": [
+            {"key": "base_url", "value": "http://dev", "enabled": False},
+            {"key": "path", "value": "health", "disabled": True},
+        ]}))
+        await activate_postman_environment(str(dev))
+        assert (await preview_postman_request(collection_path, "Health"))["undefined_variables"] == ["path"]
+
+        await set_postman_environment_variables(str(dev), {"base_url": "http://new", "path": "status"})
+
+        preview = await preview_postman_request(collection_path, "Health")
+        assert preview["url"] == "http://collection/{{path}}"
+        assert preview["undefined_variables"] == ["path"]
+        assert (await get_active_postman_environment())["active"]["variables"] == {}
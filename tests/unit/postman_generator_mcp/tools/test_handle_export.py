@@ -0,0 +1,183 @@
+import json
+import shlex
+import asyncio
+import pytest
+
+from code2postman_mcp.exporters import Exporter, available_formats, register_exporter
+from code2postman_mcp.tools.handle_export import export_postman_collection
+from code2postman_mcp.utils.collection_cache import collection_cache
+
+COLLECTION = {
+    "info": {"name": "Test API", "description": "Test API Collection"},
+    "variable": [{"key": "base_url", "value": "https://api.example.com"}],
+    "item": [
+        {"name": "Users", "item": [
+            {"name": "Get User", "request": {
+                "method": "GET",
+                "url": {"raw": "{{base_url}}/users/:id?expand=roles"},
+                "header": [{"key": "Accept", "value": "application/json"}],
+            }},
+            {"name": "Create User", "request": {
+                "method": "POST",
+                "url": "{{base_url}}/users",
+                "body": {"mode": "raw", "raw": "{\"name\": \"O'Brien\"}", "options": {"raw": {"language": "json"}}},
+            }},
+        ]},
+        {"name": "Health", "request": "https://status.example.com/health"},
+    ],
+}
+
+
+@pytest.fixture
+def collection_path(tmp_path):
+    collection_cache.clear()
+    file_path = tmp_path / "api.json"
+    file_path.write_text(json.dumps(COLLECTION))
+    yield str(file_path)
+    collection_cache.clear()
+
+
+class TestExportPostmanCollection:
+    @pytest.mark.asyncio
+    async def test_export_all_formats(self, collection_path, tmp_path):
+        """Test every built-in format is written next to the collection"""
+        result = await export_postman_collection(collection_path, ["openapi", "har", "curl", "http"])
+
+        assert result["requests"] == {"openapi": 3, "har": 3, "curl": 3, "http": 3}
+        assert result["files"] == {
+            "openapi": str(tmp_path / "api.openapi.json"),
+            "har": str(tmp_path / "api.har"),
+            "curl": str(tmp_path / "api.sh"),
+            "http": str(tmp_path / "api.http"),
+        }
+        assert not [path for path in tmp_path.iterdir() if path.suffix == ".tmp"]
+
+    @pytest.mark.asyncio
+    async def test_openapi(self, collection_path, tmp_path):
+        """Test requests are grouped by path with their parameters and examples"""
+        await export_postman_collection(collection_path, ["openapi"])
+
+        document = json.loads((tmp_path / "api.openapi.json").read_text())
+
+        assert document["info"] == {"title": "Test API", "version": "1.0.0", "description": "Test API Collection"}
+        assert document["servers"] == [{"url": "https://api.example.com"}, {"url": "https://status.example.com"}]
+        get_user = document["paths"]["/users/{id}"]["get"]
+        assert get_user["tags"] == ["Users"]
+        assert {"name": "id", "in": "path", "required": True, "schema": {"type": "string"}} in get_user["parameters"]
+        assert {"name": "expand", "in": "query", "schema": {"type": "string"}, "example": "roles"} in get_user["parameters"]
+        create_user = document["paths"]["/users"]["post"]
+        assert create_user["requestBody"]["content"]["application/json"]["example"] == {"name": "O'Brien"}
+        assert "get" in document["paths"]["/health"]
+
+    @pytest.mark.asyncio
+    async def test_har(self, collection_path, tmp_path):
+        """Test the HAR file is valid JSON with variables resolved"""
+        await export_postman_collection(collection_path, ["har"])
+
+        entries = json.loads((tmp_path / "api.har").read_text())["log"]["entries"]
+
+        assert [entry["request"]["url"] for entry in entries] == [
+            "https://api.example.com/users/:id?expand=roles",
+            "https://api.example.com/users",
+            "https://status.example.com/health",
+        ]
+        assert entries[0]["request"]["queryString"] == [{"name": "expand", "value": "roles"}]
+        assert entries[1]["request"]["postData"]["mimeType"] == "application/json"
+
+    @pytest.mark.asyncio
+    async def test_curl_and_http(self, collection_path, tmp_path):
+        """Test the curl script quotes its arguments and the .http file declares variables"""
+        await export_postman_collection(collection_path, ["curl", "http"])
+
+        script = (tmp_path / "api.sh").read_text()
+        create = script.split("# Users / Create User\n")[1].split("\n\n")[0].replace(" \\\n  ", " ")
+        assert shlex.split(create) == [
+            "curl", "-X", "POST", "https://api.example.com/users",
+            "-H", "Content-Type: application/json",
+            "--data-raw", "{\"name\": \"O'Brien\"}",
+        ]
+
+        http_file = (tmp_path / "api.http").read_text()
+        assert http_file.startswith("@base_url = https://api.example.com\n\n### Users / Get User\n")
+        assert "GET {{base_url}}/users/:id?expand=roles\nAccept: application/json\n" in http_file
+
+    @pytest.mark.asyncio
+    async def test_curl_script_cannot_inject_commands(self, tmp_path):
+        """Test methods are quoted and line breaks in names cannot start a command"""
+        collection_cache.clear()
+        file_path = tmp_path / "evil.json"
+        file_path.write_text(json.dumps({
+            "info": {"name": "Evil\ntouch /tmp/pwned-collection"},
+            "item": [
+                {"name": "ok\ntouch /tmp/pwned", "request": {"method": "GET;id", "url": "https://example.com"}},
+                {"name": "carriage\r\nid", "request": {"method": "GET", "url": "https://example.com"}},
+            ],
+        }))
+
+        await export_postman_collection(str(file_path), ["curl"])
+
+        lines = (tmp_path / "evil.sh").read_text().splitlines()
+        assert lines[:2] == ["#!/bin/sh", "# Evil touch /tmp/pwned-collection"]
+        assert "# ok touch /tmp/pwned" in lines
+        assert "# carriage  id" in lines
+        commands = [line for line in lines if line and not line.startswith("#")]
+        assert [shlex.split(command) for command in commands] == [
+            ["curl", "-X", "GET;ID", "https://example.com"],
+            ["curl", "-X", "GET", "https://example.com"],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_counts_requests_written_per_format(self, tmp_path):
+        """Test requests an exporter skips are not counted for its format"""
+        collection_cache.clear()
+        file_path = tmp_path / "methods.json"
+        file_path.write_text(json.dumps({"info": {"name": "Methods"}, "item": [
+            {"name": "Get", "request": {"method": "GET", "url": "https://example.com/a"}},
+            {"name": "Get again", "request": {"method": "GET", "url": "https://example.com/a"}},
+            {"name": "Purge", "request": {"method": "PURGE", "url": "https://example.com/a"}},
+        ]}))
+
+        result = await export_postman_collection(str(file_path), ["openapi", "har"])
+
+        assert result["requests"] == {"openapi": 1, "har": 3}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_exports_to_same_path(self, collection_path, tmp_path):
+        """Test concurrent exports use their own temporary files"""
+        results = await asyncio.gather(*(export_postman_collection(collection_path, ["har"]) for _ in range(4)))
+
+        assert all(result["requests"] == {"har": 3} for result in results)
+        assert len(json.loads((tmp_path / "api.har").read_text())["log"]["entries"]) == 3
+        assert not [path for path in tmp_path.iterdir() if path.suffix == ".tmp"]
+
+    @pytest.mark.asyncio
+    async def test_custom_exporter(self, collection_path, tmp_path):
+        """Test new formats can be plugged in"""
+        class NamesExporter(Exporter):
+            name = "names"
+            suffix = ".names.txt"
+
+            def write_request(self, request):
+                self.stream.write(f"{request.title}\n")
+
+        register_exporter(NamesExporter)
+        assert "names" in available_formats()
+
+        output_dir = tmp_path / "out"
+        output_dir.mkdir()
+        result = await export_postman_collection(collection_path, ["names"], str(output_dir))
+
+        assert result["files"]["names"] == str(output_dir / "api.names.txt")
+        assert (output_dir / "api.names.txt").read_text() == "Users / Get User\nUsers / Create User\nHealth\n"
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments(self, collection_path, tmp_path):
+        """Test unknown formats and missing directories are rejected"""
+        with pytest.raises(ValueError, match="Unknown export format"):
+            await export_postman_collection(collection_path, ["pdf"])
+
+        with pytest.raises(TypeError):
+            await export_postman_collection(collection_path, [])
+
+        with pytest.raises(FileNotFoundError):
+            await export_postman_collection(collection_path, ["har"], str(tmp_path / "missing"))
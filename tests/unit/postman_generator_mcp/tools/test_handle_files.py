@@ -1,11 +1,13 @@
 import os
+import asyncio
+import threading
 import pytest
 import tempfile
 import re
 from unittest.mock import patch, mock_open, MagicMock
 
 from code2postman_mcp.consts.excluded_files import Language
-from code2postman_mcp.tools.handle_files import get_tree_directory_from_path, read_file
+from code2postman_mcp.tools.handle_files import _iter_tree_lines, get_tree_directory_from_path, read_tree_page, read_file
 
 
 class TestGetTreeDirectoryFromPath:
@@ -122,6 +124,83 @@ class TestGetTreeDirectoryFromPath:
         assert ".git" not in generic_result
         assert "node_modules" not in generic_result
 
+    @pytest.mark.asyncio
+    async def test_get_tree_directory_with_watch(self, tmp_path):
+        """Test tree generation served from a background watcher"""
+        from code2postman_mcp.utils.watcher import stop_all_watchers
+
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "app.py").write_text("print('hi')\n")
+        try:
+            first = await get_tree_directory_from_path(str(tmp_path), "python", watch=True)
+            (tmp_path / "src" / "api.py").write_text("a\nb\n")
+            second = await get_tree_directory_from_path(str(tmp_path), "python", watch=True)
+        finally:
+            stop_all_watchers()
+
+        assert "app.py (1 lines)" in first
+        assert "api.py" not in first
+        assert "api.py (2 lines)" in second
+
+    @pytest.mark.asyncio
+    async def test_get_tree_directory_auto_language(self, tmp_path):
+        """Test auto mode applies the filters of every detected language"""
+        (tmp_path / "pyproject.toml").write_text("")
+        (tmp_path / "package.json").write_text("{}")
+        (tmp_path / "app.py").write_text("")
+        (tmp_path / "__pycache__").mkdir()
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "lib.js").write_text("")
+
+        result = await get_tree_directory_from_path(str(tmp_path), "auto")
+
+        assert "app.py" in result
+        assert "__pycache__" not in result
+        assert "node_modules" not in result
+
+    @pytest.mark.asyncio
+    @patch("code2postman_mcp.utils.spool.PAGE_LINES", 10)
+    @patch("code2postman_mcp.tools.handle_files.MAX_INLINE_TREE_CHARS", 100)
+    async def test_get_tree_directory_large_tree_is_paged(self, tmp_path):
+        """Test trees above the inline limit are spooled and paged through a handle"""
+        for i in range(25):
+            (tmp_path / f"module_{i:02d}.py").write_text("")
+
+        result = await get_tree_directory_from_path(str(tmp_path), "python")
+        handle = re.search(r'handle "([0-9a-f]+)"', result).group(1)
+        last_page = await read_tree_page(handle, 2)
+
+        assert "module_00.py" in result
+        assert "module_09.py" not in result
+        assert "module_24.py (0 lines)" in last_page
+
+        with pytest.raises(ValueError):
+            await read_tree_page("unknown")
+
+    @patch("code2postman_mcp.tools.handle_files.MAX_INLINE_TREE_CHARS", 100)
+    def test_paged_tree_does_not_collect_directories(self, tmp_path):
+        """Test the walk stops collecting directories for the response cache once the tree is too large"""
+        for i in range(30):
+            (tmp_path / f"package_{i:02d}").mkdir()
+        directories = []
+        walk = _iter_tree_lines(str(tmp_path), [], [], directories)
+
+        lines = [next(walk) for _ in range(5)]
+        assert len(directories) == 5
+        lines.extend(walk)
+
+        assert len(lines) == 31
+        assert directories == []
+
+    def test_inline_tree_collects_every_directory(self, tmp_path):
+        """Test every directory of a tree small enough to be cached is collected"""
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        directories = []
+
+        list(_iter_tree_lines(str(tmp_path), [], [], directories))
+
+        assert sorted(directories) == sorted([str(tmp_path), str(tmp_path / "a"), str(tmp_path / "a" / "b")])
+
 
 class TestReadFile:
     @pytest.fixture
@@ -211,4 +290,32 @@ class TestReadFile:
         assert "3 | Line 3" in result
         assert "4 | Line 4" in result
         assert "1 | Line 1" not in result
-        assert "5 | Line 5" not in result 
\ No newline at end of file
+        assert "5 | Line 5" not in result 
+
+
+class TestConcurrentCalls:
+    @pytest.mark.asyncio
+    async def test_small_calls_stay_responsive_during_a_scan(self, tmp_path):
+        """Test a tree scan stuck on a slow file does not block other tool calls"""
+        (tmp_path / "tree").mkdir()
+        (tmp_path / "tree" / "slow.py").write_text("x = 1\n")
+        small_file = tmp_path / "small.py"
+        small_file.write_text("a = 1\nb = 2\n")
+        release = threading.Event()
+
+        def slow_count_lines(file_path):
+            release.wait(timeout=10)
+            return 1
+
+        with patch("code2postman_mcp.tools.handle_files.count_lines", side_effect=slow_count_lines):
+            scan = asyncio.create_task(get_tree_directory_from_path(str(tmp_path / "tree"), "python"))
+            try:
+                for _ in range(5):
+                    result = await asyncio.wait_for(read_file(str(small_file)), timeout=2)
+                    assert "Total lines: 2" in result
+                assert not scan.done()
+            finally:
+                release.set()
+            tree = await scan
+
+        assert "slow.py (1 lines)" in tree
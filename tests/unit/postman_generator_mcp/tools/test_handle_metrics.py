@@ -0,0 +1,62 @@
+import pytest
+
+from code2postman_mcp.tools.handle_metrics import get_server_metrics
+from code2postman_mcp.tools.handle_postman import add_postman_collection_variable, create_postman_collection
+from code2postman_mcp.utils.collection_cache import collection_cache
+from code2postman_mcp.utils.metrics import instrument, metrics
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestGetServerMetrics:
+    @pytest.mark.asyncio
+    async def test_records_collection_io(self, tmp_path):
+        """Test the JSON and byte counters of collection tools are reported"""
+        file_path = str(tmp_path / "collection.json")
+        await instrument(create_postman_collection)(file_path, "Metrics", "Test")
+        collection_cache.invalidate(file_path)
+        await instrument(add_postman_collection_variable)(file_path, {"key": "a", "value": "1"})
+
+        result = await get_server_metrics()
+
+        created = result["tools"]["create_postman_collection"]
+        assert created["calls"] == 1
+        assert created["bytes_written"] > 0
+        added = result["tools"]["add_postman_collection_variable"]
+        assert added["json_parse"]["count"] == 1
+        assert added["json_dump"]["count"] == 1
+        assert added["bytes_read"] > 0
+        assert added["bytes_written"] > 0
+
+    @pytest.mark.asyncio
+    async def test_single_tool_with_buckets(self, tmp_path):
+        """Test the report can be limited to one tool and include histogram buckets"""
+        await instrument(create_postman_collection)(str(tmp_path / "collection.json"), "Metrics", "Test")
+
+        result = await get_server_metrics("create_postman_collection", include_buckets=True)
+
+        assert list(result["tools"]) == ["create_postman_collection"]
+        assert len(result["tools"]["create_postman_collection"]["latency_ms"]["buckets"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_prometheus_file(self, tmp_path):
+        """Test the metrics are written in the Prometheus format on request"""
+        await instrument(create_postman_collection)(str(tmp_path / "collection.json"), "Metrics", "Test")
+        prometheus_file = str(tmp_path / "metrics.prom")
+
+        result = await get_server_metrics(prometheus_file=prometheus_file)
+
+        assert result["prometheus_file"] == prometheus_file
+        with open(prometheus_file) as file:
+            assert 'code2postman_tool_calls_total{tool="create_postman_collection"} 1' in file.read()
+
+    @pytest.mark.asyncio
+    async def test_prometheus_file_in_missing_directory(self, tmp_path):
+        """Test an error is raised when the directory of the metrics file does not exist"""
+        with pytest.raises(FileNotFoundError):
+            await get_server_metrics(prometheus_file=str(tmp_path / "missing" / "metrics.prom"))
@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 import pytest
 from unittest.mock import patch, mock_open, MagicMock
 import tempfile
@@ -17,9 +18,25 @@ from code2postman_mcp.tools.handle_postman import (
     add_postman_collection_protocol_behavior,
     delete_postman_collection_item,
     update_postman_collection_variable,
+    set_postman_collection_variables,
     add_postman_collection_folder,
-    add_item_to_folder
+    add_item_to_folder,
+    get_postman_collection_revision,
+    read_postman_collection_if_changed,
+    undo_postman_change,
+    redo_postman_change,
+    diff_postman_collections,
+    merge_postman_collections,
+    validate_postman_collection,
+    shard_postman_collection,
+    assemble_postman_collection,
+    store_postman_payloads,
 )
+from code2postman_mcp.tools.handle_export import export_postman_collection
+
+
+def request_item(name):
+    return {"name": name, "request": {"method": "GET", "url": "https://api.example.com"}}
 
 
 class TestValidationFunctions:
@@ -486,10 +503,9 @@ class TestDeletePostmanCollectionItem:
         
         result = await delete_postman_collection_item(file_path, item_name)
         
-        # Check that collection was unchanged
-        mock_json_dump.assert_called_once()
-        args, _ = mock_json_dump.call_args
-        assert len(args[0]["item"]) == 3
+        # Check that collection was unchanged and not rewritten
+        mock_json_dump.assert_not_called()
+        assert len(result["item"]) == 3
 
 
 class TestUpdatePostmanCollectionVariable:
@@ -540,11 +556,92 @@ class TestUpdatePostmanCollectionVariable:
         
         result = await update_postman_collection_variable(file_path, variable_key, new_value)
         
-        # Check that collection was unchanged
-        mock_json_dump.assert_called_once()
-        args, _ = mock_json_dump.call_args
-        assert len(args[0]["variable"]) == 2
-        assert all(v["key"] != variable_key for v in args[0]["variable"])
+        # Check that collection was unchanged and not rewritten
+        mock_json_dump.assert_not_called()
+        assert len(result["variable"]) == 2
+        assert all(v["key"] != variable_key for v in result["variable"])
+
+    @pytest.mark.asyncio
+    async def test_update_after_adding_and_undoing_variables(self, tmp_path):
+        """Test the variable index follows variables added and removed between updates"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        await add_postman_collection_variable(file_path, {"key": "a", "value": "1"})
+        await update_postman_collection_variable(file_path, "a", "10")
+        await add_postman_collection_variable(file_path, {"key": "b", "value": "2"})
+
+        await update_postman_collection_variable(file_path, "b", "20")
+        await undo_postman_change(file_path)
+        await undo_postman_change(file_path)
+        data = await update_postman_collection_variable(file_path, "b", "30")
+
+        assert data["variable"] == [{"key": "a", "value": "10"}]
+
+
+class TestSetPostmanCollectionVariables:
+    @pytest.mark.asyncio
+    async def test_upsert_preserves_order(self, tmp_path):
+        """Test existing variables are updated in place and new ones appended in order"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        await add_postman_collection_variable(file_path, {"key": "a", "value": "1", "type": "string"})
+        await add_postman_collection_variable(file_path, {"key": "b", "value": "2"})
+
+        result = await set_postman_collection_variables(file_path, {"c": "3", "a": "10", "b": "2", "d": "4"})
+
+        assert result["added"] == ["c", "d"]
+        assert result["updated"] == ["a"]
+        data = await read_postman_collection(file_path)
+        assert data["variable"] == [
+            {"key": "a", "value": "10", "type": "string"},
+            {"key": "b", "value": "2"},
+            {"key": "c", "value": "3"},
+            {"key": "d", "value": "4"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_writes_once_and_undoes_as_one_edit(self, tmp_path):
+        """Test many variables are set with a single write and a single history entry"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        revision = (await get_postman_collection_revision(file_path))["revision"]
+
+        with patch("json.dump", wraps=json.dump) as mock_dump:
+            result = await set_postman_collection_variables(file_path, {f"key{i}": str(i) for i in range(200)})
+
+        assert mock_dump.call_count == 1
+        assert result["revision"] > revision
+        assert len((await read_postman_collection(file_path))["variable"]) == 200
+        await undo_postman_change(file_path)
+        assert (await read_postman_collection(file_path)).get("variable", []) == []
+
+    @pytest.mark.asyncio
+    async def test_unchanged_values_do_not_write(self, tmp_path):
+        """Test setting values that are already current keeps the revision and the file"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        first = await set_postman_collection_variables(file_path, {"a": "1", "b": "2"})
+        mtime = os.stat(file_path).st_mtime_ns
+
+        with patch("json.dump", wraps=json.dump) as mock_dump:
+            second = await set_postman_collection_variables(file_path, {"a": "1", "b": "2"}, expected_revision=first["revision"])
+
+        assert mock_dump.call_count == 0
+        assert second == {"added": [], "updated": [], "revision": first["revision"]}
+        assert os.stat(file_path).st_mtime_ns == mtime
+        assert (await get_postman_collection_revision(file_path))["revision"] == first["revision"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_values(self, tmp_path):
+        """Test non-string values are rejected before anything is written"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+
+        with pytest.raises(TypeError):
+            await set_postman_collection_variables(file_path, {"port": 8080})
+        with pytest.raises(TypeError):
+            await set_postman_collection_variables(file_path, ["a"])
+        assert (await read_postman_collection(file_path)).get("variable", []) == []
 
 
 class TestAddPostmanCollectionFolder:
@@ -748,4 +845,404 @@ class TestIntegrationWithTempFile:
                     os.unlink(file_path)
             except PermissionError:
                 # On Windows, just log this rather than failing the test
-                print(f"Warning: Could not delete temporary file {file_path}") 
\ No newline at end of file
+                print(f"Warning: Could not delete temporary file {file_path}") 
+
+
+class TestCollectionRevisions:
+    @pytest.mark.asyncio
+    async def test_revision_increases_on_each_change(self, tmp_path):
+        """Test every mutation produces a higher revision"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        first = (await get_postman_collection_revision(file_path))["revision"]
+
+        await add_postman_collection_item(file_path, request_item("Get User"))
+        second = (await get_postman_collection_revision(file_path))["revision"]
+
+        assert second > first
+
+    @pytest.mark.asyncio
+    async def test_expected_revision_conflict(self, tmp_path):
+        """Test a mutation based on a stale revision is rejected"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        revision = (await get_postman_collection_revision(file_path))["revision"]
+
+        await add_postman_collection_item(file_path, request_item("First"), expected_revision=revision)
+        with pytest.raises(ValueError, match="Revision conflict"):
+            await add_postman_collection_item(file_path, request_item("Second"), expected_revision=revision)
+
+        collection = await read_postman_collection(file_path)
+        assert [item["name"] for item in collection["item"]] == ["First"]
+
+    @pytest.mark.asyncio
+    async def test_external_change_bumps_revision(self, tmp_path):
+        """Test edits made outside the server are detected as a new revision"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        revision = (await get_postman_collection_revision(file_path))["revision"]
+
+        with open(file_path, "w") as file:
+            json.dump({"info": {"name": "Edited elsewhere"}, "item": []}, file)
+        stat = os.stat(file_path)
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        with pytest.raises(ValueError):
+            await add_postman_collection_info(file_path, {"name": "Mine"}, expected_revision=revision)
+
+    @pytest.mark.asyncio
+    async def test_read_if_changed(self, tmp_path):
+        """Test readers skip the content when their revision is current"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+
+        first = await read_postman_collection_if_changed(file_path)
+        second = await read_postman_collection_if_changed(file_path, known_revision=first["revision"])
+
+        assert first["changed"] is True
+        assert first["collection"]["info"]["name"] == "Test API"
+        assert second == {"revision": first["revision"], "changed": False}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_changes_are_not_lost(self, tmp_path):
+        """Test concurrent mutations of one collection are serialized, none overwriting another"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+
+        await asyncio.gather(*(
+            add_postman_collection_variable(file_path, {"key": f"var_{index}", "value": str(index)})
+            for index in range(20)
+        ))
+
+        collection = await read_postman_collection(file_path)
+        assert sorted(variable["key"] for variable in collection["variable"]) == sorted(f"var_{index}" for index in range(20))
+        with open(file_path) as file:
+            assert len(json.load(file)["variable"]) == 20
+
+
+class TestUndoRedo:
+    @pytest.mark.asyncio
+    async def test_no_op_changes_keep_history_and_revision(self, tmp_path):
+        """Test mutations that change nothing neither write the file nor break undo"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        await add_postman_collection_item(file_path, {"name": "Item", "request": {"method": "GET", "url": "https://a"}})
+        revision = (await get_postman_collection_revision(file_path))["revision"]
+        mtime = os.stat(file_path).st_mtime_ns
+
+        await delete_postman_collection_item(file_path, "nonexistent", expected_revision=revision)
+        await update_postman_collection_variable(file_path, "missing", "value", expected_revision=revision)
+        await add_postman_collection_info(file_path, {}, expected_revision=revision)
+
+        assert os.stat(file_path).st_mtime_ns == mtime
+        assert (await get_postman_collection_revision(file_path))["revision"] == revision
+        await undo_postman_change(file_path)
+        assert (await read_postman_collection(file_path))["item"] == []
+
+    @pytest.mark.asyncio
+    async def test_undo_and_redo(self, tmp_path):
+        """Test edits can be undone and redone in order"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        await add_postman_collection_folder(file_path, "Users")
+        await add_item_to_folder(file_path, "Users", request_item("Get User"))
+        await update_postman_collection_variable(file_path, "missing", "value")
+        await add_postman_collection_info(file_path, {"name": "Renamed"})
+
+        after_undo = await undo_postman_change(file_path)
+        assert after_undo["info"]["name"] == "Test API"
+
+        after_undo = await undo_postman_change(file_path)
+        assert after_undo["item"][0]["item"] == []
+
+        after_redo = await redo_postman_change(file_path)
+        assert after_redo["item"][0]["item"] == [request_item("Get User")]
+
+        on_disk = await read_postman_collection(file_path)
+        assert on_disk["item"][0]["item"] == [request_item("Get User")]
+        assert on_disk["info"]["name"] == "Test API"
+
+    @pytest.mark.asyncio
+    async def test_undo_delete_restores_items(self, tmp_path):
+        """Test undoing a delete puts the items back at their positions"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        for name in ["A", "B", "A", "C"]:
+            await add_postman_collection_item(file_path, request_item(name))
+        await delete_postman_collection_item(file_path, "A")
+
+        result = await undo_postman_change(file_path)
+
+        assert [item["name"] for item in result["item"]] == ["A", "B", "A", "C"]
+
+    @pytest.mark.asyncio
+    async def test_new_edit_clears_redo(self, tmp_path):
+        """Test redo is no longer possible after a new edit"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        await add_postman_collection_item(file_path, request_item("A"))
+        await undo_postman_change(file_path)
+        await add_postman_collection_item(file_path, request_item("B"))
+
+        with pytest.raises(ValueError, match="Nothing to redo"):
+            await redo_postman_change(file_path)
+
+    @pytest.mark.asyncio
+    async def test_undo_after_external_change(self, tmp_path):
+        """Test history is discarded when the file was edited outside the server"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        await add_postman_collection_item(file_path, request_item("A"))
+
+        with open(file_path, "w") as file:
+            json.dump({"info": {"name": "Edited elsewhere"}}, file)
+        stat = os.stat(file_path)
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        with pytest.raises(ValueError, match="modified outside"):
+            await undo_postman_change(file_path)
+
+
+class TestDiffAndMerge:
+    @pytest.mark.asyncio
+    async def test_diff_and_merge_files(self, tmp_path):
+        """Test diffing and merging collection files on disk"""
+        base_path = str(tmp_path / "base.json")
+        ours_path = str(tmp_path / "ours.json")
+        theirs_path = str(tmp_path / "theirs.json")
+        output_path = str(tmp_path / "merged.json")
+        for path in (base_path, ours_path, theirs_path):
+            await create_postman_collection(path, "Test API", "Description")
+            await add_postman_collection_item(path, {"name": "List", "request": {"method": "GET", "url": "/users"}})
+        await add_postman_collection_item(ours_path, {"name": "Mine", "request": {"method": "GET", "url": "/me"}})
+        await add_postman_collection_item(theirs_path, {"name": "Create", "request": {"method": "POST", "url": "/users"}})
+
+        diff = await diff_postman_collections(base_path, theirs_path)
+        result = await merge_postman_collections(base_path, ours_path, theirs_path, output_path)
+
+        assert diff["added"] == ["Create [POST /users]"]
+        assert result["conflicts"] == []
+        merged = await read_postman_collection(output_path)
+        assert [item["name"] for item in merged["item"]] == ["List", "Mine", "Create"]
+
+
+class TestSchemaValidation:
+    @pytest.mark.asyncio
+    async def test_invalid_subtree_is_rejected(self, tmp_path):
+        """Test malformed values are rejected with the JSON path they would have had"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        await add_postman_collection_folder(file_path, "Users")
+
+        with pytest.raises(ValueError, match=r"\$\.item\[0\]\.item\[0\]\.request\.method: expected string"):
+            await add_item_to_folder(file_path, "Users", {"name": "Get User", "request": {"method": 1}})
+        with pytest.raises(ValueError, match=r"\$\.variable\[0\]: missing required property 'key'"):
+            await add_postman_collection_variable(file_path, {"value": "x"})
+        with pytest.raises(ValueError, match=r"\$\.auth\.type"):
+            await add_postman_collection_auth(file_path, {"type": "kerberos"})
+
+        collection = await read_postman_collection(file_path)
+        assert collection["item"][0]["item"] == []
+        assert "variable" not in collection
+
+    @pytest.mark.asyncio
+    async def test_validate_postman_collection(self, tmp_path):
+        """Test full validation of created and hand-edited collections"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        await add_postman_collection_item(file_path, request_item("Get User"))
+
+        assert await validate_postman_collection(file_path) == {"valid": True, "error_count": 0, "errors": []}
+
+        with open(file_path, "w") as file:
+            json.dump({"info": {"name": "Edited"}, "item": [{"name": "Broken"}]}, file)
+
+        result = await validate_postman_collection(file_path)
+
+        assert result["valid"] is False
+        assert result["errors"] == [
+            "$.info: missing required property 'schema'",
+            "$.item[0]: missing required property 'request'",
+        ]
+
+
+class TestShardedCollections:
+    async def _sharded(self, tmp_path):
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        await add_postman_collection_item(file_path, request_item("Health"))
+        await add_postman_collection_folder(file_path, "Users", [request_item("List Users")])
+        await add_postman_collection_folder(file_path, "Orders", [request_item("List Orders")])
+        result = await shard_postman_collection(file_path, str(tmp_path / "sharded"))
+        return file_path, result
+
+    @pytest.mark.asyncio
+    async def test_shard_layout(self, tmp_path):
+        """Test the manifest keeps folder stubs and every folder gets its own file"""
+        file_path, result = await self._sharded(tmp_path)
+
+        assert result["manifest_path"] == str(tmp_path / "sharded" / "collection.json")
+        assert sorted(result["shards"]) == ["Orders", "Users"]
+        with open(result["manifest_path"]) as file:
+            manifest = json.load(file)
+        assert [item["name"] for item in manifest["item"]] == ["Health", "Users", "Orders"]
+        assert manifest["item"][1] == {"name": "Users", "item": []}
+        with open(result["shards"]["Users"]) as file:
+            assert json.load(file)["item"] == [request_item("List Users")]
+        assert await read_postman_collection(result["manifest_path"]) == await read_postman_collection(file_path)
+
+    @pytest.mark.asyncio
+    async def test_edit_loads_and_writes_only_its_shard(self, tmp_path):
+        """Test adding to a folder reads and writes that folder's shard only"""
+        _, result = await self._sharded(tmp_path)
+        manifest_path = result["manifest_path"]
+        with open(result["shards"]["Orders"]) as file:
+            orders_before = file.read()
+
+        with patch("json.load", wraps=json.load) as mock_load:
+            await add_item_to_folder(manifest_path, "Users", request_item("Get User"))
+        loaded = [call.args[0].name for call in mock_load.call_args_list]
+
+        assert result["shards"]["Orders"] not in loaded
+        with open(result["shards"]["Users"]) as file:
+            assert [item["name"] for item in json.load(file)["item"]] == ["List Users", "Get User"]
+        with open(result["shards"]["Orders"]) as file:
+            assert file.read() == orders_before
+
+    @pytest.mark.asyncio
+    async def test_new_and_deleted_folders(self, tmp_path):
+        """Test new folders get a shard and deleting a folder removes it, until undone"""
+        _, result = await self._sharded(tmp_path)
+        manifest_path = result["manifest_path"]
+
+        await add_postman_collection_folder(manifest_path, "Admin", [request_item("Stats")])
+        admin_shard = tmp_path / "sharded" / "folders" / "admin.json"
+        assert admin_shard.exists()
+        with pytest.raises(ValueError, match="already exists"):
+            await add_postman_collection_folder(manifest_path, "Admin")
+
+        await delete_postman_collection_item(manifest_path, "Users")
+        assert not os.path.exists(result["shards"]["Users"])
+        await undo_postman_change(manifest_path)
+
+        collection = await read_postman_collection(manifest_path)
+        assert [item["name"] for item in collection["item"]] == ["Health", "Users", "Orders", "Admin"]
+        assert collection["item"][1]["item"] == [request_item("List Users")]
+
+    @pytest.mark.asyncio
+    async def test_assemble(self, tmp_path):
+        """Test assembling a sharded collection gives back a single-file collection"""
+        file_path, result = await self._sharded(tmp_path)
+        await add_item_to_folder(result["manifest_path"], "Orders", request_item("Get Order"))
+        output = str(tmp_path / "assembled.json")
+
+        assembled = await assemble_postman_collection(result["manifest_path"], output)
+
+        assert assembled == {"output_file_path": output, "items": 3}
+        with open(output) as file:
+            collection = json.load(file)
+        assert "_shards" not in collection
+        assert [item["name"] for item in collection["item"][2]["item"]] == ["List Orders", "Get Order"]
+        assert (await validate_postman_collection(output))["valid"]
+
+
+def payload_item(name, body):
+    return {
+        "name": name,
+        "request": {"method": "POST", "url": "https://api.example.com", "body": {"mode": "raw", "raw": body}},
+        "response": [{"name": "OK", "code": 200, "body": body}],
+    }
+
+
+class TestPayloadBlobStore:
+    @pytest.mark.asyncio
+    async def test_store_dedupes_and_undo(self, tmp_path):
+        """Test identical large payloads become one blob, small ones stay, and the change can be undone"""
+        file_path = str(tmp_path / "collection.json")
+        large = json.dumps({"data": "x" * 2000})
+        await create_postman_collection(file_path, "Test API", "Description")
+        await add_postman_collection_item(file_path, payload_item("First", large))
+        await add_postman_collection_folder(file_path, "Users", [payload_item("Second", large), payload_item("Small", "{}")])
+        original = await read_postman_collection(file_path)
+        original_text = json.dumps(original)
+
+        result = await store_postman_payloads(file_path)
+
+        assert result["payloads"] == 4
+        assert result["distinct_payloads"] == 1 and result["blobs_written"] == 1
+        assert result["blob_dir"] == str(tmp_path / "collection.blobs")
+        with open(file_path) as file:
+            stored = json.load(file)
+        assert stored["item"][0]["request"]["body"]["raw"].startswith("blob:sha256:")
+        assert stored["item"][1]["item"][1]["request"]["body"]["raw"] == "{}"
+        assert os.path.getsize(file_path) < len(large)
+
+        assert (await store_postman_payloads(file_path))["payloads"] == 0
+        await undo_postman_change(file_path)
+        assert json.dumps(await read_postman_collection(file_path)) == original_text
+
+    @pytest.mark.asyncio
+    async def test_payloads_are_inlined_on_export_and_assemble(self, tmp_path):
+        """Test exports and assembled collections contain the payloads, not the references"""
+        file_path = str(tmp_path / "collection.json")
+        large = "y" * 5000
+        await create_postman_collection(file_path, "Test API", "Description")
+        await add_postman_collection_item(file_path, payload_item("Upload", large))
+        await store_postman_payloads(file_path, min_bytes=100)
+
+        output = str(tmp_path / "assembled.json")
+        await assemble_postman_collection(file_path, output)
+        with open(output) as file:
+            assembled = json.load(file)
+        assert assembled["item"][0]["request"]["body"]["raw"] == large
+        assert assembled["item"][0]["response"][0]["body"] == large
+        assert (await read_postman_collection(file_path))["item"][0]["request"]["body"]["raw"].startswith("blob:")
+
+        exported = await export_postman_collection(file_path, ["har"], str(tmp_path))
+        with open(exported["files"]["har"]) as file:
+            assert large in file.read()
+
+    @pytest.mark.asyncio
+    async def test_shard_copies_blobs_and_merge_inlines_payloads(self, tmp_path):
+        """Test collections written to a new path keep access to their payloads"""
+        file_path = str(tmp_path / "collection.json")
+        large = "z" * 3000
+        await create_postman_collection(file_path, "Test API", "Description")
+        await add_postman_collection_folder(file_path, "Uploads", [payload_item("Upload", large)])
+        await store_postman_payloads(file_path, min_bytes=100)
+
+        sharded = await shard_postman_collection(file_path, str(tmp_path / "sharded"))
+        assert os.path.isdir(tmp_path / "sharded" / "collection.blobs")
+        output = str(tmp_path / "assembled.json")
+        await assemble_postman_collection(sharded["manifest_path"], output)
+        with open(output) as file:
+            assembled = json.load(file)
+        assert assembled["item"][0]["item"][0]["request"]["body"]["raw"] == large
+        assert "blob:sha256:" not in json.dumps(assembled)
+
+        merged = str(tmp_path / "merged.json")
+        await merge_postman_collections(file_path, file_path, file_path, merged)
+        with open(merged) as file:
+            assert "blob:sha256:" not in file.read()
+
+    @pytest.mark.asyncio
+    async def test_references_without_blob_store(self, tmp_path):
+        """Test references are not silently left in place when the blob store is missing"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        await add_postman_collection_item(file_path, payload_item("Upload", "blob:sha256:" + "0" * 64))
+
+        with pytest.raises(FileNotFoundError, match="blob store"):
+            await assemble_postman_collection(file_path, str(tmp_path / "assembled.json"))
+        assert not os.path.exists(tmp_path / "assembled.json")
+
+    @pytest.mark.asyncio
+    async def test_invalid_min_bytes(self, tmp_path):
+        """Test min_bytes must be a positive integer"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+
+        with pytest.raises(TypeError):
+            await store_postman_payloads(file_path, min_bytes="1")
+        with pytest.raises(ValueError):
+            await store_postman_payloads(file_path, min_bytes=0)
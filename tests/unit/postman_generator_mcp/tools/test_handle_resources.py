@@ -0,0 +1,92 @@
+import json
+import pytest
+import pytest_asyncio
+import anyio
+from unittest.mock import patch
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+from pydantic import AnyUrl
+
+from code2postman_mcp.tools.handle_postman import (
+    create_postman_collection,
+    add_postman_collection_folder,
+    add_item_to_folder,
+)
+from code2postman_mcp.tools.handle_resources import (
+    collection_uri,
+    read_collection_resource,
+    read_folder_resource,
+    register_resources,
+    subscriptions,
+)
+from code2postman_mcp.utils.collection_cache import collection_cache, remove_change_listener
+
+
+@pytest_asyncio.fixture
+async def collection_path(tmp_path):
+    """Create a collection with one folder on disk"""
+    collection_cache.clear()
+    file_path = str(tmp_path / "collection.json")
+    await create_postman_collection(file_path, "Test API", "Test API Collection")
+    await add_postman_collection_folder(file_path, "Users")
+    yield file_path
+    collection_cache.clear()
+
+
+class TestCollectionResources:
+    @pytest.mark.asyncio
+    async def test_read_collection_resource_from_memory(self, collection_path):
+        """Test unchanged collections are served without opening the file"""
+        first = await read_collection_resource(collection_path)
+
+        with patch("builtins.open") as mock_file:
+            second = await read_collection_resource(collection_path)
+
+        mock_file.assert_not_called()
+        assert first == second
+        assert json.loads(second)["info"]["name"] == "Test API"
+
+    @pytest.mark.asyncio
+    async def test_read_folder_resource(self, collection_path):
+        """Test a single folder can be read as a resource"""
+        await add_item_to_folder(collection_path, "Users", {"name": "Get User", "request": "https://api.example.com/users"})
+
+        result = json.loads(await read_folder_resource(collection_path, "Users"))
+
+        assert result["name"] == "Users"
+        assert result["item"] == [{"name": "Get User", "request": "https://api.example.com/users"}]
+
+        with pytest.raises(ValueError):
+            await read_folder_resource(collection_path, "Missing")
+
+    @pytest.mark.asyncio
+    async def test_subscribed_clients_are_notified(self, collection_path):
+        """Test a mutation sends resource-updated notifications to subscribers"""
+        server = FastMCP("test")
+        register_resources(server)
+        updated = []
+
+        async def message_handler(message):
+            if isinstance(message, types.ServerNotification) and \
+                    isinstance(message.root, types.ResourceUpdatedNotification):
+                updated.append(str(message.root.params.uri))
+
+        try:
+            async with create_connected_server_and_client_session(
+                server._mcp_server, message_handler=message_handler
+            ) as client:
+                folder_uri = collection_uri(collection_path, "Users")
+                await client.subscribe_resource(AnyUrl(folder_uri))
+
+                resource = await client.read_resource(AnyUrl(folder_uri))
+                assert json.loads(resource.contents[0].text)["name"] == "Users"
+
+                await add_item_to_folder(collection_path, "Users", {"name": "Get User", "request": "https://api.example.com/users"})
+                with anyio.fail_after(5):
+                    while not updated:
+                        await anyio.sleep(0.01)
+        finally:
+            remove_change_listener(subscriptions.notify)
+
+        assert updated == [folder_uri]
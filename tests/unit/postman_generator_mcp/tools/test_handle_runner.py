@@ -0,0 +1,306 @@
+import json
+import time
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from code2postman_mcp.tools.handle_postman import (
+    add_postman_collection_item,
+    add_postman_collection_variable,
+    create_postman_collection,
+    update_postman_collection_variable,
+)
+from code2postman_mcp.tools.handle_runner import (
+    load_test_postman_collection,
+    preview_postman_request,
+    run_postman_collection,
+)
+from code2postman_mcp.utils.collection_cache import collection_cache
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def _handle(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length).decode("utf-8") if length else None
+            server.received.append({"method": self.command, "path": self.path,
+                                    "token": self.headers.get("Authorization"), "body": body})
+            if self.path.startswith("/slow"):
+                time.sleep(0.05)
+            status = 404 if self.path.startswith("/missing") else 500 if self.path.startswith("/fail") else 200
+            payload = json.dumps({"ok": status == 200}).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    do_GET = do_POST = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Local HTTP server that records the requests it receives"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.received = []
+    server.in_flight = 0
+    server.max_in_flight = 0
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def write_collection(tmp_path, base_url, items, events=None):
+    collection_cache.clear()
+    collection = {
+        "info": {"name": "Stub", "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"},
+        "variable": [
+            {"key": "base_url", "value": base_url},
+            {"key": "users", "value": "{{base_url}}/users"},
+        ],
+        "item": items,
+    }
+    if events:
+        collection["event"] = events
+    file_path = tmp_path / "collection.json"
+    file_path.write_text(json.dumps(collection))
+    return str(file_path)
+
+
+class TestRunPostmanCollection:
+    @pytest.mark.asyncio
+    async def test_runs_requests_with_resolved_variables(self, stub_server, tmp_path):
+        """Test variables are resolved, bodies are sent and latencies are reported"""
+        base_url = f"http://127.0.0.1:{stub_server.server_port}"
+        file_path = write_collection(tmp_path, base_url, [
+            {"name": "Users", "item": [
+                {"name": "List", "request": {"method": "GET", "url": "{{users}}?page=1"}},
+                {"name": "Create", "request": {
+                    "method": "POST", "url": {"raw": "{{users}}"},
+                    "body": {"mode": "raw", "raw": "{\"name\": \"{{user_name}}\"}"},
+                }, "event": [{"listen": "prerequest", "script": {"exec": [
+                    "pm.collectionVariables.set('user_name', 'Ada');",
+                ]}}]},
+            ]},
+        ])
+
+        result = await run_postman_collection(file_path, iterations=3)
+
+        assert result["summary"]["requests"] == 2
+        assert result["summary"]["runs"] == 6
+        assert result["summary"]["failed"] == 0
+        listing, creation = result["requests"]
+        assert listing["name"] == "Users / List"
+        assert listing["url"] == f"{base_url}/users?page=1"
+        assert listing["status_codes"] == {"200": 3}
+        latency = listing["latency_ms"]
+        assert 0 < latency["min"] <= latency["p50"] <= latency["p90"] <= latency["p99"] <= latency["max"]
+        bodies = [r["body"] for r in stub_server.received if r["method"] == "POST"]
+        assert bodies == ['{"name": "Ada"}'] * 3
+
+    @pytest.mark.asyncio
+    async def test_status_assertions_and_errors(self, stub_server, tmp_path):
+        """Test status checks from test scripts and unresolved variables are reported as failures"""
+        base_url = f"http://127.0.0.1:{stub_server.server_port}"
+        file_path = write_collection(tmp_path, base_url, [
+            {"name": "Missing", "request": "{{base_url}}/missing"},
+            {"name": "Unresolved", "request": "{{other_host}}/users"},
+        ], events=[{"listen": "test", "script": {"exec": "pm.response.to.have.status(200);"}}])
+
+        result = await run_postman_collection(file_path)
+
+        missing, unresolved = result["requests"]
+        assert missing["status_codes"] == {"404": 1}
+        assert missing["assertions"] == {"expected_status": [200], "passed": 0, "failed": 1}
+        assert missing["ok"] is False
+        assert unresolved["errors"] == 1
+        assert unresolved["error_messages"] == ["Unresolved variables: other_host"]
+        assert result["summary"]["failed"] == 2
+
+        skipped = await run_postman_collection(file_path, scripts="skip")
+        assert "assertions" not in skipped["requests"][0]
+        assert skipped["requests"][0]["ok"] is True
+
+    @pytest.mark.asyncio
+    async def test_server_errors_are_failures(self, stub_server, tmp_path):
+        """Test 5xx responses fail requests without status checks, as in load tests"""
+        base_url = f"http://127.0.0.1:{stub_server.server_port}"
+        file_path = write_collection(tmp_path, base_url, [
+            {"name": "Fail", "request": "{{base_url}}/fail"},
+            {"name": "Expected failure", "request": "{{base_url}}/fail",
+             "event": [{"listen": "test", "script": {"exec": ["pm.response.to.have.status(500)"]}}]},
+        ])
+
+        result = await run_postman_collection(file_path, iterations=2)
+
+        failing, expected = result["requests"]
+        assert failing["status_codes"] == {"500": 2}
+        assert failing["server_errors"] == 2
+        assert failing["ok"] is False
+        assert expected["ok"] is True and "server_errors" not in expected
+        assert result["summary"]["failed"] == 1
+
+        with pytest.raises(TypeError):
+            await run_postman_collection(file_path, timeout="5")
+        with pytest.raises(ValueError):
+            await run_postman_collection(file_path, timeout=0)
+
+    @pytest.mark.asyncio
+    async def test_malformed_urls_fail_only_their_request(self, stub_server, tmp_path):
+        """Test a URL that cannot be parsed is reported as an error without aborting the run"""
+        base_url = f"http://127.0.0.1:{stub_server.server_port}"
+        file_path = write_collection(tmp_path, base_url, [
+            {"name": "Before", "request": "{{base_url}}/before"},
+            {"name": "Bracket", "request": "http://[::1/broken"},
+            {"name": "Too long", "request": "http://" + "a" * 70000 + ".example"},
+            {"name": "After", "request": "{{base_url}}/after"},
+        ])
+
+        result = await run_postman_collection(file_path, iterations=2)
+
+        before, bracket, too_long, after = result["requests"]
+        assert before["status_codes"] == after["status_codes"] == {"200": 2}
+        assert bracket["errors"] == too_long["errors"] == 2
+        assert bracket["error_messages"][0].startswith("ValueError")
+        assert too_long["error_messages"][0].startswith("InvalidURL")
+        assert result["summary"]["failed"] == 2
+
+        load = await load_test_postman_collection(file_path, iterations=2, workers=2)
+        assert load["total"]["count"] == 8
+        assert load["total"]["errors"] == 4
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self, stub_server, tmp_path):
+        """Test no more requests than the per-host limit are in flight at once"""
+        base_url = f"http://127.0.0.1:{stub_server.server_port}"
+        file_path = write_collection(tmp_path, base_url, [{"name": "Slow", "request": "{{base_url}}/slow"}])
+
+        result = await run_postman_collection(file_path, iterations=8, concurrency=8, per_host_limit=2)
+
+        assert result["requests"][0]["status_codes"] == {"200": 8}
+        assert stub_server.max_in_flight <= 2
+
+    @pytest.mark.asyncio
+    async def test_folder_and_invalid_arguments(self, stub_server, tmp_path):
+        """Test a single folder can be run and invalid arguments are rejected"""
+        base_url = f"http://127.0.0.1:{stub_server.server_port}"
+        file_path = write_collection(tmp_path, base_url, [
+            {"name": "Users", "item": [{"name": "List", "request": "{{users}}"}]},
+            {"name": "Health", "request": "{{base_url}}/health"},
+        ])
+
+        result = await run_postman_collection(file_path, folder="Users")
+        assert [r["name"] for r in result["requests"]] == ["Users / List"]
+
+        with pytest.raises(ValueError):
+            await run_postman_collection(file_path, folder="Missing")
+        with pytest.raises(ValueError):
+            await run_postman_collection(file_path, iterations=0)
+        with pytest.raises(TypeError):
+            await run_postman_collection(file_path, concurrency="10")
+        with pytest.raises(ValueError):
+            await run_postman_collection(file_path, scripts="all")
+
+
+class TestLoadTestPostmanCollection:
+    @pytest.mark.asyncio
+    async def test_iterations_report(self, stub_server, tmp_path):
+        """Test a fixed number of iterations is replayed and the report is written next to the collection"""
+        base_url = f"http://127.0.0.1:{stub_server.server_port}"
+        file_path = write_collection(tmp_path, base_url, [
+            {"name": "Users", "item": [{"name": "List", "request": "{{users}}"}]},
+            {"name": "Missing", "request": "{{base_url}}/missing",
+             "event": [{"listen": "test", "script": {"exec": ["pm.response.to.have.status(200)"]}}]},
+        ])
+
+        result = await load_test_postman_collection(file_path, iterations=5, workers=3)
+
+        assert result["report_path"] == str(tmp_path / "collection.loadtest.json")
+        assert result["total"]["count"] == 10
+        assert result["total"]["errors"] == 5
+        assert result["total"]["error_rate"] == 0.5
+        assert "buckets" not in result["total"]["latency_ms"]
+        assert result["folders"]["Users"]["errors"] == 0
+        assert result["folders"]["(root)"]["status_codes"] == {"404": 5}
+
+        report = json.loads((tmp_path / "collection.loadtest.json").read_text())
+        assert report["settings"]["iterations"] == 5
+        assert [request["count"] for request in report["requests"]] == [5, 5]
+        assert sum(count for _, count in report["requests"][0]["latency_ms"]["buckets"]) == 5
+        assert report["requests"][0]["throughput_rps"] > 0
+
+    @pytest.mark.asyncio
+    async def test_duration_at_target_rate(self, stub_server, tmp_path):
+        """Test the target rate paces the requests for the given duration"""
+        base_url = f"http://127.0.0.1:{stub_server.server_port}"
+        file_path = write_collection(tmp_path, base_url, [{"name": "List", "request": "{{users}}"}])
+
+        result = await load_test_postman_collection(file_path, duration=0.5, rps=40)
+
+        assert 15 <= result["total"]["count"] <= 21
+        assert result["total"]["errors"] == 0
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments(self, stub_server, tmp_path):
+        """Test a stop condition is required and unresolved requests are rejected"""
+        base_url = f"http://127.0.0.1:{stub_server.server_port}"
+        file_path = write_collection(tmp_path, base_url, [{"name": "Other", "request": "{{other}}/x"}])
+
+        with pytest.raises(ValueError, match="duration or iterations"):
+            await load_test_postman_collection(file_path)
+        with pytest.raises(ValueError, match="rps"):
+            await load_test_postman_collection(file_path, iterations=1, rps=0)
+        with pytest.raises(ValueError, match="unresolved variables"):
+            await load_test_postman_collection(file_path, iterations=1)
+
+
+class TestPreviewPostmanRequest:
+    @pytest.mark.asyncio
+    async def test_preview_with_environment_and_overrides(self, tmp_path):
+        """Test environment files and overrides take precedence over collection variables"""
+        file_path = write_collection(tmp_path, "http://collection", [
+            {"name": "Users", "item": [{"name": "Get", "request": {
+                "url": "{{users}}/{{id}}", "header": [{"key": "Authorization", "value": "Bearer {{token}}"}],
+            }}]},
+        ])
+        environment = tmp_path / "dev.json"
+        environment.write_text(json.dumps({"values": [{"key": "base_url", "value": "http://dev"}]}))
+
+        plain = await preview_postman_request(file_path, "Get")
+        assert plain["url"] == "http://collection/users/{{id}}"
+        assert plain["undefined_variables"] == ["id", "token"]
+
+        result = await preview_postman_request(file_path, "Users/Get", str(environment), {"id": 7, "token": "t"})
+        assert result["url"] == "http://dev/users/7"
+        assert result["headers"] == [{"key": "Authorization", "value": "Bearer t"}]
+        assert result["undefined_variables"] == []
+
+        with pytest.raises(ValueError):
+            await preview_postman_request(file_path, "Missing")
+
+    @pytest.mark.asyncio
+    async def test_preview_after_variable_update(self, tmp_path):
+        """Test updating a variable through the tools is reflected in the resolved requests"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Test API", "Description")
+        await add_postman_collection_variable(file_path, {"key": "base_url", "value": "http://old"})
+        await add_postman_collection_item(file_path, {"name": "Health", "request": "{{base_url}}/health"})
+        assert (await preview_postman_request(file_path, "Health"))["url"] == "http://old/health"
+
+        await update_postman_collection_variable(file_path, "base_url", "http://new")
+
+        assert (await preview_postman_request(file_path, "Health"))["url"] == "http://new/health"
@@ -0,0 +1,98 @@
+import copy
+import pytest
+
+from code2postman_mcp.utils.json_patch import apply_patch
+from code2postman_mcp.utils.blobs import (
+    BlobStore,
+    copy_blobs,
+    inline_payloads,
+    is_blob_reference,
+    iter_payloads,
+    store_payloads,
+)
+
+COLLECTION = {
+    "info": {"name": "Blobs"},
+    "item": [
+        {
+            "name": "Folder",
+            "item": [
+                {
+                    "name": "Upload",
+                    "request": {"method": "POST", "body": {"mode": "raw", "raw": "a" * 50}},
+                    "response": [{"body": "b" * 50, "originalRequest": {"body": {"mode": "raw", "raw": "a" * 50}}}],
+                },
+            ],
+        },
+        {"name": "Form", "request": {"method": "POST", "body": {"mode": "formdata", "formdata": []}}},
+    ],
+}
+
+
+class TestBlobStore:
+    def test_put_is_content_addressed(self, tmp_path):
+        """Test equal payloads share one blob named by their hash"""
+        store = BlobStore(str(tmp_path / "collection.json"))
+
+        first, written = store.put("payload é")
+        second, written_again = store.put("payload é")
+
+        assert first == second and written and not written_again
+        assert is_blob_reference(first)
+        assert store.get(first) == "payload é"
+        assert store.directory == str(tmp_path / "collection.blobs")
+
+    def test_missing_blob(self, tmp_path):
+        """Test a reference to a missing blob is reported"""
+        store = BlobStore(str(tmp_path / "collection.json"))
+
+        with pytest.raises(FileNotFoundError):
+            store.get("blob:sha256:" + "0" * 64)
+        with pytest.raises(ValueError):
+            store.get("not a reference")
+
+
+class TestPayloads:
+    def test_iter_payloads(self):
+        """Test request bodies, example bodies and example request bodies are found with their paths"""
+        paths = [tokens for tokens, _ in iter_payloads(COLLECTION["item"])]
+
+        assert paths == [
+            ("item", 0, "item", 0, "request", "body", "raw"),
+            ("item", 0, "item", 0, "response", 0, "body"),
+            ("item", 0, "item", 0, "response", 0, "originalRequest", "body", "raw"),
+        ]
+
+    def test_store_and_inline_round_trip(self, tmp_path):
+        """Test inlining the stored collection gives back the original without touching it"""
+        store = BlobStore(str(tmp_path / "collection.json"))
+        data = copy.deepcopy(COLLECTION)
+        operations, summary = store_payloads(data, store, min_bytes=10)
+        apply_patch(data, operations)
+        stored = copy.deepcopy(data)
+
+        assert summary == {"payloads": 3, "blobs_written": 2, "bytes_moved": 150, "distinct_payloads": 2}
+        assert inline_payloads(data, store) == COLLECTION
+        assert data == stored
+        assert inline_payloads(COLLECTION, store) is COLLECTION
+
+    def test_inline_without_store(self, tmp_path):
+        """Test references are an error when the blob store does not exist"""
+        store = BlobStore(str(tmp_path / "collection.json"))
+        data = copy.deepcopy(COLLECTION)
+        data["item"][1]["request"]["body"] = {"mode": "raw", "raw": "blob:sha256:" + "0" * 64}
+
+        with pytest.raises(FileNotFoundError, match="does not exist"):
+            inline_payloads(data, store)
+
+    def test_copy_blobs(self, tmp_path):
+        """Test the referenced blobs are copied to the store of another path"""
+        source = BlobStore(str(tmp_path / "collection.json"))
+        target = BlobStore(str(tmp_path / "copy" / "collection.json"))
+        data = copy.deepcopy(COLLECTION)
+        apply_patch(data, store_payloads(data, source, min_bytes=10)[0])
+
+        assert copy_blobs(data, source, target) == 2
+        assert copy_blobs(data, source, target) == 0
+        assert copy_blobs(data, source, source) == 0
+        assert inline_payloads(data, target) == COLLECTION
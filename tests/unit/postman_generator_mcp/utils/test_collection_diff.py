@@ -0,0 +1,158 @@
+import pytest
+
+from code2postman_mcp.utils.collection_diff import diff_collections, merge_collections, index_requests
+
+
+def request(name, method="GET", url="https://api.example.com", description=None):
+    item = {"name": name, "request": {"method": method, "url": url}}
+    if description is not None:
+        item["request"]["description"] = description
+    return item
+
+
+def folder(name, *items):
+    return {"name": name, "item": list(items)}
+
+
+class TestIndexRequests:
+    def test_keys_include_folder_path_method_and_url(self):
+        """Test requests are identified by folder path, name, method and URL"""
+        collection = {"item": [
+            folder("Users", request("Get", url={"raw": "{{base}}/users"})),
+            request("Get"),
+            request("Get"),
+        ]}
+
+        keys = list(index_requests(collection))
+
+        assert keys == [
+            "Users/Get [GET {{base}}/users]",
+            "Get [GET https://api.example.com]",
+            "Get [GET https://api.example.com] #2",
+        ]
+
+    def test_url_objects_without_raw_are_rendered(self):
+        """Test URL objects without a raw form are keyed by their full URL"""
+        url = {"protocol": "https", "host": ["api", "example", "com"], "path": ["users"]}
+        collection = {"item": [request("List", url=url), {"name": "Not a request"}]}
+
+        assert list(index_requests(collection)) == ["List [GET https://api.example.com/users]"]
+
+
+class TestDiffCollections:
+    def test_added_removed_changed(self):
+        """Test the diff reports request level changes"""
+        old = {"info": {"name": "A"}, "item": [request("Keep"), request("Remove"), request("Change")]}
+        new = {"info": {"name": "B"}, "item": [request("Keep"), request("Change", description="new"), request("Add")]}
+
+        result = diff_collections(old, new)
+
+        assert result["added"] == ["Add [GET https://api.example.com]"]
+        assert result["removed"] == ["Remove [GET https://api.example.com]"]
+        assert result["changed"] == ["Change [GET https://api.example.com]"]
+        assert result["sections"] == ["info"]
+        assert result["unchanged"] == 1
+
+
+class TestMergeCollections:
+    def test_non_conflicting_changes_from_both_sides(self):
+        """Test one-sided changes, additions and removals are all kept"""
+        base = {"info": {"name": "API"}, "item": [folder("Users", request("List"), request("Delete", "DELETE"))]}
+        ours = {"info": {"name": "API"}, "item": [
+            folder("Users", request("List", description="documented"), request("Delete", "DELETE")),
+        ]}
+        theirs = {"info": {"name": "API v2"}, "item": [
+            folder("Users", request("List"), request("Create", "POST")),
+            folder("Orders", request("List")),
+        ]}
+
+        merged, conflicts = merge_collections(base, ours, theirs)
+
+        assert conflicts == []
+        assert merged["info"] == {"name": "API v2"}
+        users, orders = merged["item"]
+        assert [item["name"] for item in users["item"]] == ["List", "Create"]
+        assert users["item"][0]["request"]["description"] == "documented"
+        assert orders == folder("Orders", request("List"))
+
+    @pytest.mark.parametrize("prefer,expected", [("ours", "mine"), ("theirs", "generated")])
+    def test_conflicts_use_preferred_side(self, prefer, expected):
+        """Test both sides changing a request is reported and resolved by preference"""
+        base = {"item": [request("List")]}
+        ours = {"item": [request("List", description="mine")]}
+        theirs = {"item": [request("List", description="generated")]}
+
+        merged, conflicts = merge_collections(base, ours, theirs, prefer=prefer)
+
+        assert conflicts == ["List [GET https://api.example.com]"]
+        assert merged["item"][0]["request"]["description"] == expected
+
+    def test_invalid_preference(self):
+        """Test an unknown preference raises ValueError"""
+        with pytest.raises(ValueError):
+            merge_collections({}, {}, {}, prefer="both")
+
+    def test_folder_metadata_from_both_sides(self):
+        """Test folder metadata changed on either side is merged like requests"""
+        base = {"item": [folder("Users", request("List")), folder("Orders", request("List"))]}
+        ours = {"item": [
+            {**folder("Users", request("List")), "description": "mine"},
+            {**folder("Orders", request("List")), "description": "mine"},
+        ]}
+        theirs = {"item": [
+            {**folder("Users", request("List")), "auth": {"type": "bearer"}},
+            {**folder("Orders", request("List")), "description": "generated"},
+        ]}
+
+        merged, conflicts = merge_collections(base, ours, theirs, prefer="theirs")
+
+        users, orders = merged["item"]
+        assert conflicts == ["Users/", "Orders/"]
+        assert users["auth"] == {"type": "bearer"} and "description" not in users
+        assert orders["description"] == "generated"
+        assert [item["name"] for item in orders["item"]] == ["List"]
+
+    def test_one_sided_folder_metadata_change(self):
+        """Test a folder changed only by theirs is taken from theirs without a conflict"""
+        base = {"item": [folder("Users", request("List"))]}
+        theirs = {"item": [{**folder("Users", request("List")), "description": "generated"}]}
+
+        merged, conflicts = merge_collections(base, base, theirs)
+
+        assert conflicts == []
+        assert merged["item"][0]["description"] == "generated"
+
+    def test_empty_folders_added_by_theirs_are_kept(self):
+        """Test folders that only theirs added are merged even when empty, with their metadata"""
+        base = {"item": [folder("Users", request("List"))]}
+        theirs = {"item": [
+            folder("Users", request("List"), folder("Admin")),
+            {**folder("Orders"), "description": "to do"},
+        ]}
+
+        merged, conflicts = merge_collections(base, base, theirs)
+
+        assert conflicts == []
+        users, orders = merged["item"]
+        assert users["item"][1] == folder("Admin")
+        assert orders == {"name": "Orders", "description": "to do", "item": []}
+
+    def test_folders_removed_by_ours_stay_removed(self):
+        """Test an empty folder ours removed is not brought back by theirs"""
+        base = {"item": [folder("Users", request("List")), folder("Legacy")]}
+        ours = {"item": [folder("Users", request("List"))]}
+
+        merged, conflicts = merge_collections(base, ours, base)
+
+        assert conflicts == []
+        assert [item["name"] for item in merged["item"]] == ["Users"]
+
+    def test_folders_removed_by_theirs_are_kept_by_ours(self):
+        """Test a folder theirs removed stays when ours has it, without the requests theirs removed"""
+        base = {"item": [folder("Users", request("List")), folder("Legacy", request("Old"))]}
+        theirs = {"item": [folder("Users", request("List"))]}
+
+        merged, conflicts = merge_collections(base, base, theirs)
+
+        assert conflicts == []
+        assert merged["item"][1] == folder("Legacy")
@@ -0,0 +1,106 @@
+import json
+import pytest
+
+from code2postman_mcp.tools.handle_postman import _load_collection
+from code2postman_mcp.utils.collection_cache import COMPACT_CACHE_ENV, CollectionCache, collection_cache
+from code2postman_mcp.utils.compact import CompactCollection, CompactItem, LazyJSON
+
+COLLECTION = {
+    "info": {"name": "Compact", "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"},
+    "item": [
+        {
+            "name": "Users",
+            "description": "User endpoints",
+            "item": [
+                {
+                    "name": "Create user",
+                    "event": [{"listen": "test", "script": {"exec": ["pm.response.to.have.status(201)"]}}],
+                    "request": {
+                        "url": {
+                            "raw": "{{base_url}}/users?verbose=1",
+                            "host": ["{{base_url}}"],
+                            "path": ["users"],
+                            "query": [{"key": "verbose", "value": "1", "disabled": False}],
+                        },
+                        "method": "POST",
+                        "header": [{"key": "Content-Type", "value": "application/json", "type": "text"}],
+                        "body": {"mode": "raw", "raw": json.dumps({"name": "x" * 400})},
+                        "auth": {"type": "noauth"},
+                    },
+                    "response": [{"name": "Created", "code": 201, "body": "é😀" * 100}],
+                },
+                {"name": "List users", "request": {"method": "GET", "url": "{{base_url}}/users", "header": []}},
+            ],
+        },
+        {"name": "Bare", "request": "{{base_url}}/bare"},
+        {"name": "Empty folder", "item": []},
+    ],
+    "variable": [{"key": "base_url", "value": "https://api.example.com", "type": "string"}],
+    "event": [],
+}
+
+
+class TestCompactCollection:
+    def test_round_trip_is_lossless(self):
+        """Test expanding gives back the same JSON, key order included"""
+        compact = CompactCollection(json.loads(json.dumps(COLLECTION)))
+
+        assert json.dumps(compact.to_dict()) == json.dumps(COLLECTION)
+
+    def test_large_payloads_are_lazy(self):
+        """Test large bodies and example responses are kept serialized, small ones as they are"""
+        items = list(CompactCollection(json.loads(json.dumps(COLLECTION))).iter_items())
+
+        assert [item.name for item in items] == ["Create user", "List users", "Bare"]
+        create, listing, bare = items
+        assert isinstance(create.request.body, LazyJSON)
+        assert isinstance(create.responses, LazyJSON)
+        assert create.load_responses() == COLLECTION["item"][0]["item"][0]["response"]
+        assert listing.request.body is None and listing.request.method == "GET"
+        assert bare.request == "{{base_url}}/bare"
+
+    def test_header_names_and_shapes_are_shared(self):
+        """Test equal header names are one string and equal key layouts one tuple"""
+        first = CompactItem({"name": "a", "request": {"method": "GET", "header": [{"key": "X-" + "Trace", "value": "1"}]}})
+        second = CompactItem({"name": "b", "request": {"method": "GET", "header": [{"key": "X-Tr" + "ace", "value": "2"}]}})
+
+        assert first.shape is second.shape
+        assert first.request.headers[0][1] is second.request.headers[0][1]
+        assert list(second.request.header_items()) == [("X-Trace", "2")]
+
+
+class TestCompactCache:
+    def test_cold_entries_are_compacted(self, tmp_path, monkeypatch):
+        """Test only entries past the most recent one are compacted, and expanded again on lookup"""
+        cache = CollectionCache()
+        paths = []
+        for name in ("first", "second"):
+            path = tmp_path / f"{name}.json"
+            path.write_text(json.dumps(COLLECTION))
+            cache.put(str(path), json.loads(json.dumps(COLLECTION)))
+            paths.append(str(path))
+
+        assert cache.compact_cold() == 0
+        monkeypatch.setenv(COMPACT_CACHE_ENV, "1")
+        assert cache.compact_cold() == 1
+        assert cache.is_compacted(paths[0]) and not cache.is_compacted(paths[1])
+
+        assert json.dumps(cache.get(paths[0])) == json.dumps(COLLECTION)
+        assert not cache.is_compacted(paths[0])
+
+    @pytest.mark.asyncio
+    async def test_tools_see_compacted_collections(self, tmp_path, monkeypatch):
+        """Test a collection compacted in the shared cache is loaded without reading the file"""
+        monkeypatch.setenv(COMPACT_CACHE_ENV, "1")
+        first, second = tmp_path / "first.json", tmp_path / "second.json"
+        for path in (first, second):
+            path.write_text(json.dumps(COLLECTION))
+        try:
+            await _load_collection(str(first))
+            await _load_collection(str(second))
+            assert collection_cache.is_compacted(str(first))
+
+            monkeypatch.setattr("code2postman_mcp.tools.handle_postman.load_json", None)
+            assert await _load_collection(str(first)) == COLLECTION
+        finally:
+            collection_cache.clear()
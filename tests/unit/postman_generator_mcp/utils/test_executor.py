@@ -0,0 +1,171 @@
+import gc
+import json
+import asyncio
+import threading
+import pytest
+
+from code2postman_mcp.utils import executor
+from code2postman_mcp.utils.executor import (
+    IO_WORKERS_ENV,
+    PROCESS_PARSE_ENV,
+    io_workers,
+    load_json,
+    locks_paths,
+    path_lock,
+    run_blocking,
+)
+from code2postman_mcp.utils.metrics import instrument, metrics, record_read
+
+
+@pytest.fixture(autouse=True)
+def fresh_executor():
+    executor.shutdown_executor()
+    yield
+    executor.shutdown_executor()
+
+
+class TestRunBlocking:
+    @pytest.mark.asyncio
+    async def test_runs_off_the_event_loop(self):
+        """Test the function runs in a pool thread and its result is returned"""
+        result = await run_blocking(lambda value: (value * 2, threading.current_thread().name), 21)
+
+        assert result[0] == 42
+        assert result[1].startswith("code2postman-io")
+
+    @pytest.mark.asyncio
+    async def test_metrics_follow_the_tool(self):
+        """Test I/O recorded in the pool is attributed to the calling tool"""
+        metrics.reset()
+
+        async def reading_tool():
+            await run_blocking(record_read, 128)
+
+        await instrument(reading_tool)()
+
+        assert metrics.snapshot()["tools"]["reading_tool"]["bytes_read"] == 128
+        metrics.reset()
+
+    def test_pool_size_from_environment(self, monkeypatch):
+        """Test the pool size comes from the environment variable and is validated"""
+        monkeypatch.setenv(IO_WORKERS_ENV, "3")
+        assert io_workers() == 3
+        assert executor.get_executor()._max_workers == 3
+
+        monkeypatch.setenv(IO_WORKERS_ENV, "0")
+        with pytest.raises(ValueError):
+            io_workers()
+
+
+class TestPathLock:
+    @pytest.mark.asyncio
+    async def test_serializes_calls_on_the_same_path(self, tmp_path):
+        """Test two holders of the same path never overlap, while other paths are free"""
+        path = str(tmp_path / "collection.json")
+        events = []
+
+        async def hold(name: str, target: str):
+            async with path_lock(target):
+                events.append(f"{name} in")
+                await asyncio.sleep(0.01)
+                events.append(f"{name} out")
+
+        await asyncio.gather(hold("a", path), hold("b", path))
+
+        assert events in (["a in", "a out", "b in", "b out"], ["b in", "b out", "a in", "a out"])
+
+        async with path_lock(path):
+            await asyncio.wait_for(hold("other", str(tmp_path / "other.json")), timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_reentrant_within_a_task(self, tmp_path):
+        """Test a task holding a path can lock it again, e.g. a tool calling another"""
+        path = str(tmp_path / "collection.json")
+
+        @locks_paths("file_path")
+        async def inner(file_path: str) -> str:
+            return file_path
+
+        @locks_paths("file_path", "other_path")
+        async def outer(file_path: str, other_path: str = None) -> str:
+            return await inner(file_path)
+
+        assert await asyncio.wait_for(outer(path, other_path=path), timeout=1) == path
+
+    @pytest.mark.asyncio
+    async def test_ignores_invalid_paths(self):
+        """Test arguments that are not strings are left for the tool to reject"""
+        @locks_paths("file_path")
+        async def tool(file_path):
+            raise TypeError("file_path must be a string")
+
+        with pytest.raises(TypeError):
+            await tool(None)
+
+
+class TestLoadJson:
+    def test_large_files_are_parsed_in_a_process(self, tmp_path, monkeypatch):
+        """Test files above the threshold are parsed by the process pool, losslessly"""
+        collection = {
+            "info": {"name": "Large"},
+            "item": [
+                {"name": "Folder", "item": [{"name": f"Request {index}", "request": {"url": "u"}} for index in range(5)]},
+                {"name": "Single", "item": [{"name": "Only"}]},
+                {"name": "Top request", "request": {"method": "GET"}},
+            ],
+            "variable": [{"key": "a", "value": "1"}],
+        }
+        file_path = tmp_path / "collection.json"
+        file_path.write_text(json.dumps(collection))
+        monkeypatch.setenv(PROCESS_PARSE_ENV, "1")
+
+        data = load_json(str(file_path), file_path.stat().st_size)
+
+        assert data == collection
+        assert json.dumps(data) == json.dumps(collection)
+        assert executor._process_pool is not None
+        assert gc.isenabled()
+
+    def test_single_folder_is_split(self, tmp_path, monkeypatch):
+        """Test a collection holding one folder is sent back as one pickle per request, not as a whole"""
+        collection = {"info": {"name": "One folder"}, "item": [
+            {"name": "Folder", "item": [{"name": f"Request {index}", "request": {"url": "u"}} for index in range(3)]},
+        ]}
+
+        shell, (folder,) = executor._encode(collection)
+        folder_shell, requests = folder
+        assert len(requests) == 3 and all(isinstance(request, bytes) for request in requests)
+        assert executor._decode((shell, [folder])) == collection
+
+        file_path = tmp_path / "collection.json"
+        file_path.write_text(json.dumps(collection))
+        monkeypatch.setenv(PROCESS_PARSE_ENV, "1")
+        assert load_json(str(file_path), file_path.stat().st_size) == collection
+
+    def test_garbage_collector_is_only_paused(self, tmp_path, monkeypatch):
+        """Test decoding leaves the collector as it was and freezes nothing"""
+        file_path = tmp_path / "collection.json"
+        file_path.write_text(json.dumps({"item": [{"name": "Request"}]}))
+        monkeypatch.setenv(PROCESS_PARSE_ENV, "1")
+        frozen = gc.get_freeze_count()
+
+        load_json(str(file_path), file_path.stat().st_size)
+        assert gc.isenabled()
+        assert gc.get_freeze_count() == frozen
+
+        gc.disable()
+        try:
+            load_json(str(file_path), file_path.stat().st_size)
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
+
+    def test_small_files_are_parsed_in_the_thread(self, tmp_path, monkeypatch):
+        """Test files below the threshold, or with the threshold disabled, never start the process pool"""
+        file_path = tmp_path / "collection.json"
+        file_path.write_text('{"item": []}')
+
+        assert load_json(str(file_path), 12) == {"item": []}
+        monkeypatch.setenv(PROCESS_PARSE_ENV, "0")
+        assert load_json(str(file_path), 10**12) == {"item": []}
+        assert executor._process_pool is None
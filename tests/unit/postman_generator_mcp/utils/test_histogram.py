@@ -0,0 +1,49 @@
+from code2postman_mcp.utils.histogram import LatencyHistogram
+
+
+class TestLatencyHistogram:
+    def test_percentiles_within_one_percent(self):
+        """Test percentiles keep a relative error below 1%"""
+        histogram = LatencyHistogram()
+        for value in range(1, 10001):
+            histogram.record(value / 10)
+
+        for percent, expected in [(50, 500.0), (90, 900.0), (99, 990.0), (99.9, 999.0)]:
+            assert abs(histogram.percentile(percent) - expected) / expected < 0.01
+        assert histogram.count == 10000
+        assert histogram.min_us == 100
+        assert histogram.percentile(100) == 1000.0
+
+    def test_memory_is_bounded(self):
+        """Test the number of buckets grows with the range of values, not their count"""
+        histogram = LatencyHistogram()
+        for value in range(200000):
+            histogram.record((value % 5000) / 7)
+
+        assert len(list(histogram.buckets())) < 1500
+
+    def test_merge_and_summary(self):
+        """Test histograms can be merged and summarized"""
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(1.0)
+        second.record(3.0)
+        second.record(5.0)
+
+        first.merge(second)
+        summary = first.to_dict()
+
+        assert summary["count"] == 3
+        assert summary["min"] == 1.0
+        assert summary["max"] == 5.0
+        assert summary["mean"] == 3.0
+        assert summary["percentiles"]["p50"] == 3.0
+        assert [count for _, count in summary["buckets"]] == [1, 1, 1]
+        assert "buckets" not in first.to_dict(include_buckets=False)
+
+    def test_empty(self):
+        """Test an empty histogram summarizes to zeros"""
+        summary = LatencyHistogram().to_dict()
+
+        assert summary["count"] == 0
+        assert summary["percentiles"]["p99"] == 0.0
+        assert summary["buckets"] == []
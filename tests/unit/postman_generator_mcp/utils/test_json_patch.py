@@ -0,0 +1,54 @@
+import copy
+import pytest
+
+from code2postman_mcp.utils.json_patch import apply_patch, pointer
+
+
+class TestApplyPatch:
+    def test_add_remove_replace_and_inverse(self):
+        """Test applying a patch and then its inverse restores the document"""
+        document = {"item": [{"name": "A"}], "info": {"name": "Old"}}
+        original = copy.deepcopy(document)
+        operations = [
+            {"op": "add", "path": "/item/-", "value": {"name": "B"}},
+            {"op": "add", "path": "/item/0", "value": {"name": "Z"}},
+            {"op": "replace", "path": "/info/name", "value": "New"},
+            {"op": "add", "path": "/auth", "value": {"type": "bearer"}},
+            {"op": "remove", "path": "/item/1"},
+        ]
+
+        inverse = apply_patch(document, operations)
+
+        assert document == {
+            "item": [{"name": "Z"}, {"name": "B"}],
+            "info": {"name": "New"},
+            "auth": {"type": "bearer"},
+        }
+        apply_patch(document, inverse)
+        assert document == original
+
+    def test_values_are_copied(self):
+        """Test the document never aliases values stored in a patch"""
+        value = {"name": "A", "item": []}
+        document = {"item": []}
+        apply_patch(document, [{"op": "add", "path": "/item/-", "value": value}])
+
+        document["item"][0]["item"].append({"name": "child"})
+
+        assert value == {"name": "A", "item": []}
+
+    def test_failed_patch_is_rolled_back(self):
+        """Test a failing operation leaves the document unchanged"""
+        document = {"item": []}
+        with pytest.raises(ValueError):
+            apply_patch(document, [
+                {"op": "add", "path": "/item/-", "value": {"name": "A"}},
+                {"op": "remove", "path": "/missing"},
+            ])
+        assert document == {"item": []}
+
+    def test_pointer_escaping(self):
+        """Test keys containing '/' and '~' are escaped"""
+        document = {"info": {}}
+        apply_patch(document, [{"op": "add", "path": pointer("info", "a/b~c"), "value": 1}])
+        assert document == {"info": {"a/b~c": 1}}
@@ -0,0 +1,88 @@
+import os
+import pytest
+from unittest.mock import patch
+
+from code2postman_mcp.consts.excluded_files import Language
+from code2postman_mcp.utils.language import (
+    build_profile,
+    clear_profile_cache,
+    detect_languages,
+    get_project_profile,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_profile_cache():
+    clear_profile_cache()
+    yield
+    clear_profile_cache()
+
+
+class TestDetectLanguages:
+    def test_detect_from_marker_files(self, tmp_path):
+        """Test marker files are enough to detect a language"""
+        (tmp_path / "pyproject.toml").write_text("")
+        (tmp_path / "web").mkdir()
+        (tmp_path / "web" / "package.json").write_text("{}")
+        (tmp_path / "Service.csproj").write_text("")
+
+        assert detect_languages(str(tmp_path)) == [Language.PYTHON, Language.JAVASCRIPT, Language.CSHARP]
+
+    def test_detect_from_extensions(self, tmp_path):
+        """Test languages are detected from source file extensions"""
+        for i in range(5):
+            (tmp_path / f"module{i}.go").write_text("")
+
+        assert detect_languages(str(tmp_path)) == [Language.GOLANG]
+
+    def test_ignores_dependency_directories(self, tmp_path):
+        """Test vendored dependencies do not count towards detection"""
+        (tmp_path / "main.rs").write_text("")
+        (tmp_path / "node_modules").mkdir()
+        for i in range(20):
+            (tmp_path / "node_modules" / f"lib{i}.js").write_text("")
+
+        assert detect_languages(str(tmp_path)) == [Language.RUST]
+
+    def test_falls_back_to_generic(self, tmp_path):
+        """Test an unrecognised project uses the generic profile"""
+        (tmp_path / "README.md").write_text("")
+
+        assert detect_languages(str(tmp_path)) == [Language.GENERIC]
+
+
+class TestProfiles:
+    def test_build_profile_unions_patterns(self):
+        """Test the profile contains every pattern of every language once"""
+        profile = build_profile([Language.PYTHON, Language.JAVASCRIPT])
+        dir_patterns = [pattern.pattern for pattern in profile.dir_patterns]
+
+        assert profile.name == "python+javascript"
+        assert r"^__pycache__$" in dir_patterns
+        assert r"^node_modules$" in dir_patterns
+        assert dir_patterns.count(r"^\.git$") == 1
+
+    def test_profile_is_cached_per_root(self, tmp_path):
+        """Test detection runs once while the root is unchanged"""
+        (tmp_path / "go.mod").write_text("")
+
+        with patch("code2postman_mcp.utils.language.detect_languages",
+                   wraps=detect_languages) as mock_detect:
+            first = get_project_profile(str(tmp_path))
+            second = get_project_profile(str(tmp_path))
+
+        assert first is second
+        mock_detect.assert_called_once()
+
+    def test_profile_is_redetected_when_root_changes(self, tmp_path):
+        """Test adding a marker at the root invalidates the cached profile"""
+        (tmp_path / "go.mod").write_text("")
+        first = get_project_profile(str(tmp_path))
+
+        (tmp_path / "Cargo.toml").write_text("")
+        stat = os.stat(tmp_path)
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        second = get_project_profile(str(tmp_path))
+
+        assert first.languages == (Language.GOLANG,)
+        assert second.languages == (Language.GOLANG, Language.RUST)
@@ -0,0 +1,91 @@
+import sys
+import pytest
+from loguru import logger
+
+from code2postman_mcp.utils import log
+from code2postman_mcp.utils.files import count_lines
+from code2postman_mcp.utils.log import LOG_LEVEL_ENV, LogSampler, configure_logging
+
+
+@pytest.fixture(autouse=True)
+def restore_logger():
+    yield
+    logger.remove()
+    log._handler_ids.clear()
+    logger.add(sys.stderr)
+
+
+class Expensive:
+    """Counts how often it is formatted"""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __format__(self, spec):
+        self.formatted += 1
+        return "expensive"
+
+
+class TestConfigureLogging:
+    def test_reconfiguring_does_not_add_sinks(self, tmp_path):
+        """Test calling it again replaces the handlers instead of adding more"""
+        configure_logging("INFO", str(tmp_path / "first.log"))
+        configure_logging("INFO", str(tmp_path / "second.log"))
+
+        assert len(log._handler_ids) == 2
+
+    def test_level_from_environment(self, monkeypatch):
+        """Test the level defaults to the environment variable"""
+        monkeypatch.setenv(LOG_LEVEL_ENV, "warning")
+
+        assert configure_logging(log_file="") == "WARNING"
+        assert len(log._handler_ids) == 1
+
+    def test_invalid_level(self):
+        """Test an unknown level is rejected"""
+        with pytest.raises(ValueError):
+            configure_logging("LOUD", "")
+
+    def test_file_sink_is_enqueued(self, tmp_path):
+        """Test records reach the file sink once the queue is flushed"""
+        file_path = tmp_path / "server.log"
+        configure_logging("INFO", str(file_path))
+
+        logger.info("written {}", "lazily")
+        logger.complete()
+
+        assert "written lazily" in file_path.read_text()
+
+    def test_disabled_debug_is_not_formatted(self, tmp_path):
+        """Test debug arguments are not formatted when the level is above debug"""
+        configure_logging("INFO", "")
+        value = Expensive()
+
+        logger.debug("Details: {}", value)
+        assert value.formatted == 0
+
+        configure_logging("DEBUG", "")
+        logger.debug("Details: {}", value)
+        assert value.formatted == 1
+
+
+class TestLogSampler:
+    def test_lets_one_call_in_n_through(self):
+        """Test the first call and then one call in `every` are let through"""
+        sampler = LogSampler(10)
+
+        assert [sampler() for _ in range(25)].count(True) == 3
+
+    def test_count_lines_logs_are_sampled(self, tmp_path, monkeypatch):
+        """Test scanning many files only logs a sample of per-file messages"""
+        monkeypatch.setattr("code2postman_mcp.utils.files._line_count_log", LogSampler(10))
+        messages = []
+        logger.remove()
+        logger.add(messages.append, level="DEBUG", format="{message}")
+        file_path = tmp_path / "module.py"
+        file_path.write_text("a = 1\nb = 2\n")
+
+        for _ in range(30):
+            assert count_lines(str(file_path)) == 2
+
+        assert len([message for message in messages if "Counted 2 lines" in message]) == 3
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import pytest
+
+from code2postman_mcp.utils.metrics import (
+    BACKGROUND,
+    METRICS_FILE_ENV,
+    instrument,
+    json_timer,
+    metrics,
+    record_read,
+    record_write,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+async def sample_tool(payload: str) -> int:
+    """Reads in a worker thread, like the file tools"""
+    def work():
+        record_read(len(payload))
+        with json_timer("parse"):
+            pass
+        return len(payload)
+    return await asyncio.to_thread(work)
+
+
+async def failing_tool() -> None:
+    raise ValueError("boom")
+
+
+class TestInstrument:
+    @pytest.mark.asyncio
+    async def test_counts_calls_latency_and_io(self):
+        """Test calls, latency and the I/O of worker threads are recorded under the tool"""
+        tool = instrument(sample_tool)
+
+        assert await tool("abcd") == 4
+        await tool("ef")
+
+        recorded = metrics.snapshot()["tools"]["sample_tool"]
+        assert recorded["calls"] == 2
+        assert recorded["errors"] == 0
+        assert recorded["latency_ms"]["count"] == 2
+        assert recorded["bytes_read"] == 6
+        assert recorded["json_parse"]["count"] == 2
+        assert BACKGROUND not in metrics.snapshot()["tools"]
+
+    @pytest.mark.asyncio
+    async def test_counts_errors(self):
+        """Test a tool that raises is counted as an error and the exception propagates"""
+        tool = instrument(failing_tool)
+
+        with pytest.raises(ValueError):
+            await tool()
+
+        recorded = metrics.snapshot()["tools"]["failing_tool"]
+        assert recorded["calls"] == 1
+        assert recorded["errors"] == 1
+
+    def test_keeps_the_signature(self):
+        """Test the wrapper exposes the tool's name, docstring and parameters"""
+        tool = instrument(sample_tool)
+
+        assert tool.__name__ == "sample_tool"
+        assert tool.__doc__ == sample_tool.__doc__
+        assert tool.__wrapped__ is sample_tool
+
+    def test_io_outside_tools_is_background(self):
+        """Test I/O outside a tool call is recorded under the background name"""
+        record_write(10)
+
+        assert metrics.snapshot()["tools"][BACKGROUND]["bytes_written"] == 10
+
+
+class TestPrometheus:
+    @pytest.mark.asyncio
+    async def test_text_format(self):
+        """Test counters and a cumulative latency histogram are exposed per tool"""
+        await instrument(sample_tool)("abc")
+
+        text = metrics.prometheus()
+
+        assert '# TYPE code2postman_tool_calls_total counter' in text
+        assert 'code2postman_tool_calls_total{tool="sample_tool"} 1' in text
+        assert 'code2postman_bytes_read_total{tool="sample_tool"} 3' in text
+        assert 'code2postman_tool_latency_seconds_bucket{tool="sample_tool",le="+Inf"} 1' in text
+        assert 'code2postman_tool_latency_seconds_count{tool="sample_tool"} 1' in text
+        assert text.endswith("\n")
+
+    @pytest.mark.asyncio
+    async def test_dump_from_environment(self, tmp_path, monkeypatch):
+        """Test tool calls write the metrics file named by the environment variable"""
+        file_path = tmp_path / "code2postman.prom"
+        monkeypatch.setenv(METRICS_FILE_ENV, str(file_path))
+        monkeypatch.setattr(metrics, "_last_dump", float("-inf"))
+
+        await instrument(sample_tool)("abc")
+
+        assert 'code2postman_tool_calls_total{tool="sample_tool"} 1' in file_path.read_text()
+        assert not (tmp_path / "code2postman.prom.tmp").exists()
+
+    @pytest.mark.asyncio
+    async def test_dump_runs_off_the_event_loop(self, tmp_path, monkeypatch):
+        """Test the metrics file is written on the I/O thread pool"""
+        monkeypatch.setenv(METRICS_FILE_ENV, str(tmp_path / "code2postman.prom"))
+        monkeypatch.setattr(metrics, "_last_dump", float("-inf"))
+        threads = []
+        monkeypatch.setattr(metrics, "dump", lambda file_path: threads.append(threading.current_thread()))
+
+        await instrument(sample_tool)("abc")
+
+        assert len(threads) == 1 and threads[0] is not threading.main_thread()
@@ -0,0 +1,130 @@
+import pytest
+from unittest.mock import patch
+
+from code2postman_mcp.tools.handle_files import get_tree_directory_from_path, read_file
+from code2postman_mcp.tools.handle_postman import (
+    add_postman_collection_item,
+    create_postman_collection,
+    read_postman_collection,
+)
+from code2postman_mcp.utils.collection_cache import notify_change
+from code2postman_mcp.utils.response_cache import ENTRIES_ENV, ResponseCache, response_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_response_cache():
+    response_cache.clear()
+    response_cache.reset_stats()
+    yield
+    response_cache.clear()
+    response_cache.reset_stats()
+
+
+def write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+class TestResponseCache:
+    def test_hit_until_the_file_changes(self, tmp_path):
+        """Test a response is served while its file is unchanged, and counted"""
+        cache = ResponseCache(max_entries=8, ttl=60)
+        file_path = write(tmp_path / "a.txt", "one")
+
+        cache.put(("read_file", file_path), "one", [file_path], 3)
+        assert cache.get(("read_file", file_path)) == "one"
+
+        write(tmp_path / "a.txt", "three")
+        assert cache.get(("read_file", file_path)) is None
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 0)
+        assert stats["tools"]["read_file"] == {"hits": 1, "misses": 1}
+
+    def test_ttl_and_lru_eviction(self, tmp_path):
+        """Test responses expire after the TTL and the least recently used are evicted past the bounds"""
+        file_path = write(tmp_path / "a.txt", "a")
+        cache = ResponseCache(max_entries=2, ttl=60, max_bytes=100)
+        cache.put("a", 1, [file_path], 10)
+        cache.put("b", 2, [file_path], 10)
+        cache.get("a")
+        cache.put("c", 3, [file_path], 10)
+        assert cache.get("b") is None and cache.get("a") == 1
+
+        cache.put("large", 4, [file_path], 95)
+        assert cache.stats()["entries"] == 1
+        assert cache.stats()["evictions"] == 3
+
+        expired = ResponseCache(max_entries=2, ttl=0)
+        expired.put("a", 1, [file_path], 1)
+        assert expired.get("a") is None
+        assert expired.stats()["expirations"] == 1
+
+    def test_invalidate_file_and_parent_directories(self, tmp_path):
+        """Test a change drops the responses of the file and of the trees containing it"""
+        cache = ResponseCache(max_entries=8, ttl=60)
+        file_path = write(tmp_path / "a.txt", "a")
+        other = write(tmp_path / "b.txt", "b")
+        cache.put("file", 1, [file_path], 1)
+        cache.put("tree", 2, [str(tmp_path)], 1)
+        cache.put("other", 3, [other], 1)
+
+        assert cache.invalidate_path(file_path) == 2
+        assert cache.get("other") == 3
+
+    def test_missing_paths_and_disabled_cache(self, tmp_path, monkeypatch):
+        """Test responses of missing files are not cached, and 0 entries disables the cache"""
+        cache = ResponseCache(max_entries=8, ttl=60)
+        cache.put("missing", 1, [str(tmp_path / "missing.txt")], 1)
+        assert cache.stats()["entries"] == 0
+
+        monkeypatch.setenv(ENTRIES_ENV, "0")
+        disabled = ResponseCache()
+        disabled.put("a", 1, [write(tmp_path / "a.txt", "a")], 1)
+        assert not disabled.enabled and disabled.get("a") is None
+
+
+class TestCachedTools:
+    @pytest.mark.asyncio
+    async def test_read_file_is_served_from_cache(self, tmp_path):
+        """Test repeated reads of an unchanged file do not read it again"""
+        file_path = write(tmp_path / "module.py", "a = 1\nb = 2\n")
+        first = await read_file(file_path)
+
+        with patch("code2postman_mcp.tools.handle_files._read_lines") as read_lines:
+            assert await read_file(file_path) == first
+        read_lines.assert_not_called()
+
+        write(tmp_path / "module.py", "a = 10\nb = 2\n")
+        assert "a = 10" in await read_file(file_path)
+
+    @pytest.mark.asyncio
+    async def test_tree_is_rebuilt_when_a_directory_changes(self, tmp_path):
+        """Test a cached tree is served until a file is added to one of its directories"""
+        package = tmp_path / "project" / "pkg"
+        package.mkdir(parents=True)
+        write(package / "a.py", "a = 1\n")
+        root = str(tmp_path / "project")
+
+        first = await get_tree_directory_from_path(root, "python")
+        assert await get_tree_directory_from_path(root, "python") == first
+        assert response_cache.stats()["tools"]["get_tree_directory_from_path"]["hits"] == 1
+
+        write(package / "b.py", "b = 1\n")
+        assert "b.py (1 lines)" in await get_tree_directory_from_path(root, "python")
+
+    @pytest.mark.asyncio
+    async def test_collection_mutators_invalidate_immediately(self, tmp_path):
+        """Test a collection read after a tool changed it is never served from the cache"""
+        file_path = str(tmp_path / "collection.json")
+        await create_postman_collection(file_path, "Cached", "Test")
+        await read_postman_collection(file_path)
+        assert response_cache.stats()["entries"] == 1
+
+        # Dropped by the change notification of the write, before any lookup
+        await add_postman_collection_item(file_path, {"name": "Health", "request": {"url": "u"}})
+        assert response_cache.stats()["entries"] == 0
+        assert [item["name"] for item in (await read_postman_collection(file_path))["item"]] == ["Health"]
+
+        await notify_change(file_path, [])
+        assert response_cache.stats()["invalidations"] == 2
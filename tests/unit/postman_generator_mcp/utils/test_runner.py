@@ -0,0 +1,70 @@
+import copy
+
+from code2postman_mcp.utils.runner import percentile, prepare_requests
+from code2postman_mcp.utils.variables import Resolver, VariableScope
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        """Test percentiles use the nearest-rank method"""
+        values = [float(v) for v in range(1, 101)]
+
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile(values, 100) == 100.0
+        assert percentile([7.0], 90) == 7.0
+        assert percentile([], 50) == 0.0
+
+
+class TestPrepareRequests:
+    def test_nested_variables_and_defaults(self):
+        """Test nested variables are resolved and URLs without scheme default to http"""
+        collection = {
+            "variable": [{"key": "host", "value": "api.local"}, {"key": "base", "value": "{{host}}/v1"}],
+            "item": [{"name": "Get", "request": {
+                "url": "{{base}}/items",
+                "header": [{"key": "X-Host", "value": "{{host}}"}, {"key": "X-Off", "value": "1", "disabled": True}],
+            }}],
+        }
+
+        plan, = prepare_requests(collection)
+
+        assert plan.method == "GET"
+        assert plan.url == "http://api.local/v1/items"
+        assert plan.headers == [("X-Host", "api.local")]
+        assert plan.unresolved == []
+
+    def test_safe_scripts_are_inherited_from_folders(self):
+        """Test folder pre-request scripts apply to the requests inside them"""
+        collection = {
+            "item": [{"name": "Auth", "event": [{"listen": "prerequest", "script": {
+                "exec": ["pm.environment.set(\"token\", \"abc\");", "console.log('ignored');"],
+            }}], "item": [{"name": "Me", "request": {
+                "url": "http://api.local/me", "header": [{"key": "Authorization", "value": "Bearer {{token}}"}],
+            }}]}],
+        }
+
+        assert prepare_requests(collection)[0].headers == [("Authorization", "Bearer abc")]
+        assert prepare_requests(collection, scripts="skip")[0].unresolved == ["token"]
+
+    def test_resolver_cache_is_reused_for_copies(self):
+        """Test fresh copies of the collection, as made when payloads are inlined, reuse the resolved requests"""
+        collection = {
+            "variable": [{"key": "base", "value": "http://api.local"}],
+            "item": [{"name": "Users", "item": [
+                {"name": "List", "request": {"url": "{{base}}/users"}},
+                {"name": "Create", "request": {"method": "POST", "url": "{{base}}/users",
+                                               "body": {"mode": "raw", "raw": "x" * 100}}},
+            ]}],
+        }
+        resolver = Resolver(VariableScope({"base": "http://api.local"}))
+
+        prepare_requests(copy.deepcopy(collection), resolver=resolver)
+        cached = dict(resolver._resolved)
+        plans = prepare_requests(copy.deepcopy(collection), folder="Users", resolver=resolver)
+
+        assert resolver._resolved.keys() == cached.keys()
+        assert all(resolver._resolved[key] is resolved for key, resolved in cached.items())
+        assert sorted(resolver._templates) == [(0, 0), (0, 1)]
+        assert [plan.url for plan in plans] == ["http://api.local/users"] * 2
+
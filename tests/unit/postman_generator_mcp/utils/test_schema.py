@@ -0,0 +1,82 @@
+import pytest
+
+from code2postman_mcp.utils.schema import get_validator, validate
+
+VALID_COLLECTION = {
+    "info": {
+        "name": "Test API",
+        "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json",
+    },
+    "item": [
+        {"name": "Users", "item": [
+            {"name": "Get User", "request": {
+                "method": "GET",
+                "url": {"raw": "{{base_url}}/users/1", "host": ["{{base_url}}"], "path": ["users", "1"]},
+                "header": [{"key": "Accept", "value": "application/json"}],
+                "body": {"mode": "raw", "raw": "{}"},
+            }},
+        ]},
+        {"name": "Health", "request": "https://api.example.com/health"},
+    ],
+    "variable": [{"key": "base_url", "value": "https://api.example.com", "type": "string"}],
+    "auth": {"type": "bearer", "bearer": [{"key": "token", "value": "{{token}}", "type": "string"}]},
+    "event": [{"listen": "test", "script": {"type": "text/javascript", "exec": ["pm.test()"]}}],
+}
+
+
+class TestValidate:
+    def test_valid_collection(self):
+        """Test a complete collection has no errors"""
+        assert validate(VALID_COLLECTION) == []
+
+    def test_errors_have_json_paths(self):
+        """Test errors point at the invalid value inside the collection"""
+        collection = {
+            "info": {"name": "Test API"},
+            "item": [{"name": "Users", "item": [
+                {"name": "Get User", "request": {"method": 1, "header": [{"key": "Accept"}]}},
+            ]}],
+        }
+
+        errors = validate(collection)
+
+        assert errors == [
+            "$.info: missing required property 'schema'",
+            "$.item[0].item[0].request.method: expected string, got integer",
+            "$.item[0].item[0].request.header[0]: missing required property 'value'",
+        ]
+
+    def test_item_without_request_or_items(self):
+        """Test items must be either a request or a folder"""
+        assert validate({"name": "Get User"}, "items") == ["$: missing required property 'request'"]
+
+    def test_subtree_with_root(self):
+        """Test a subtree is reported at the path it will be inserted at"""
+        errors = validate({"listen": "test", "script": {"exec": 3}}, "event", root="$.event[2]")
+
+        assert errors == ["$.event[2].script.exec: expected array or string, got integer"]
+
+    def test_partial(self):
+        """Test partial validation skips the required properties of the definition"""
+        assert validate({"name": "Renamed"}, "info") == ["$: missing required property 'schema'"]
+        assert validate({"name": "Renamed"}, "info", partial=True) == []
+        assert validate({"name": 3}, "info", partial=True) == ["$.name: expected string, got integer"]
+
+    def test_enums_and_special_keys(self):
+        """Test enum values are enforced and unusual keys are quoted in paths"""
+        errors = validate({"type": "kerberos"}, "auth")
+        assert len(errors) == 1
+        assert errors[0].startswith("$.type: 'kerberos' is not one of ['apikey'")
+
+        errors = validate({"key": "x", "description": 5}, "variable", root="$.variable['my var']")
+        assert errors == ["$.variable['my var'].description: expected object or string or null, got integer"]
+
+    def test_unknown_definition(self):
+        """Test unknown definitions are rejected"""
+        with pytest.raises(ValueError):
+            validate({}, "nope")
+
+    def test_validator_is_compiled_once(self):
+        """Test the compiled validator is cached"""
+        assert get_validator("item") is get_validator("item")
+        assert get_validator() is get_validator()
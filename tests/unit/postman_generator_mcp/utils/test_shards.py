@@ -0,0 +1,48 @@
+import json
+import pytest
+
+from code2postman_mcp.utils.shards import SHARDS_KEY, is_sharded, shard_loader, split_collection
+
+
+def folder(name, *requests):
+    return {"name": name, "item": [{"name": r, "request": "https://example.com"} for r in requests]}
+
+
+class TestSplitCollection:
+    def test_shard_file_names_are_unique(self, tmp_path):
+        """Test folder names are turned into distinct file names"""
+        collection = {"info": {"name": "API"}, "item": [folder("User Accounts", "a"), folder("user/accounts", "b")]}
+
+        shards = split_collection(collection, str(tmp_path))
+
+        assert shards == {
+            "User Accounts": str(tmp_path / "folders/user-accounts.json"),
+            "user/accounts": str(tmp_path / "folders/user-accounts-2.json"),
+        }
+        manifest = json.loads((tmp_path / "collection.json").read_text())
+        assert is_sharded(manifest)
+        assert manifest[SHARDS_KEY]["folders"]["user/accounts"] == "folders/user-accounts-2.json"
+
+    def test_duplicate_folder_names(self, tmp_path):
+        with pytest.raises(ValueError, match=r"unique.*\['Orders', 'Users'\]"):
+            split_collection({"item": [folder("Users"), folder("Orders"), folder("Users"), folder("Orders"),
+                                       folder("Items")]}, str(tmp_path))
+
+
+class TestShardLoader:
+    def test_loads_requested_folders_once(self, tmp_path):
+        """Test shards are read lazily and again only when their file changes"""
+        split_collection({"item": [folder("Users", "a"), folder("Orders", "b")]}, str(tmp_path))
+        manifest_path = str(tmp_path / "collection.json")
+        manifest = json.loads((tmp_path / "collection.json").read_text())
+        shard_loader.reset(manifest_path)
+
+        assert shard_loader.load(manifest_path, manifest, ["Users"]) == 1
+        assert manifest["item"][0]["item"][0]["name"] == "a"
+        assert manifest["item"][1]["item"] == []
+        assert shard_loader.load(manifest_path, manifest, None) == 1
+        assert shard_loader.load(manifest_path, manifest, None) == 0
+
+        (tmp_path / "folders" / "users.json").write_text(json.dumps(folder("Users", "changed", "x")))
+        assert shard_loader.load(manifest_path, manifest, None) == 1
+        assert [item["name"] for item in manifest["item"][0]["item"]] == ["changed", "x"]
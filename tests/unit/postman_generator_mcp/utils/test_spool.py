@@ -0,0 +1,47 @@
+import os
+import pytest
+from unittest.mock import patch
+
+import code2postman_mcp.utils.spool as spool_module
+from code2postman_mcp.utils.spool import LineSpool, get_spool, register_spool, close_all_spools
+
+
+@pytest.fixture(autouse=True)
+def cleanup_spools():
+    yield
+    close_all_spools()
+
+
+class TestLineSpool:
+    @patch.object(spool_module, "PAGE_LINES", 3)
+    def test_pages(self):
+        """Test lines are split into fixed-size pages"""
+        spool = LineSpool()
+        spool.write_lines(f"line {i}" for i in range(7))
+
+        assert spool.total_lines == 7
+        assert spool.total_pages == 3
+        assert spool.read_page(0) == "line 0\nline 1\nline 2"
+        assert spool.read_page(2) == "line 6"
+        spool.close()
+
+    def test_invalid_page(self):
+        """Test reading a page out of range raises ValueError"""
+        spool = LineSpool()
+        spool.write_lines(["only"])
+
+        with pytest.raises(ValueError):
+            spool.read_page(1)
+        spool.close()
+
+    @patch.object(spool_module, "MAX_SPOOLS", 1)
+    def test_registry_is_bounded(self):
+        """Test the oldest spool is deleted from disk when the limit is reached"""
+        first = LineSpool()
+        register_spool(first)
+        second = LineSpool()
+        register_spool(second)
+
+        assert get_spool(first.handle) is None
+        assert not os.path.exists(first.path)
+        assert get_spool(second.handle) is second
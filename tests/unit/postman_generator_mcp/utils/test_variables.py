@@ -0,0 +1,153 @@
+import copy
+import json
+import pytest
+
+from code2postman_mcp.utils.variables import (
+    Resolver,
+    ResolverRegistry,
+    VariableScope,
+    compile_template,
+    load_environment_file,
+)
+
+
+def request(name, url, header=None, body=None):
+    item = {"name": name, "request": {"method": "POST", "url": url}}
+    if header:
+        item["request"]["header"] = [{"key": key, "value": value} for key, value in header.items()]
+    if body:
+        item["request"]["body"] = {"mode": "raw", "raw": body}
+    return item
+
+
+class TestCompileTemplate:
+    def test_literals_and_slots(self):
+        """Test strings are split into literals and variable slots"""
+        template = compile_template("{{base}}/users/{{ id }}?q=1")
+
+        assert template.parts == (("base", "{{base}}"), "/users/", ("id", "{{ id }}"), "?q=1")
+        assert template.variables == {"base", "id"}
+        assert template.render({"base": "http://api", "id": "7"}) == "http://api/users/7?q=1"
+        assert template.render({"base": "http://api"}) == "http://api/users/{{ id }}?q=1"
+
+    def test_compiled_once(self):
+        """Test identical strings share their compiled template"""
+        assert compile_template("{{a}}-{{b}}") is compile_template("{{a}}-{{b}}")
+        assert compile_template("plain").parts == ("plain",)
+        assert compile_template("").render({}) == ""
+
+
+class TestVariableScope:
+    def test_layers_and_nested_values(self):
+        """Test later layers win and values referring to other variables are resolved"""
+        scope = VariableScope(
+            {"host": "api.local", "base": "http://{{host}}/v1", "token": "collection"},
+            {"token": "environment"},
+            {"host": "override.local"},
+        )
+
+        assert scope.value("base") == "http://override.local/v1"
+        assert scope.value("token") == "environment"
+        assert scope.value("missing") is None
+
+    def test_cycles_are_detected(self):
+        """Test variables referring to themselves raise ValueError"""
+        scope = VariableScope({"a": "{{b}}", "b": "x{{c}}", "c": "{{a}}"})
+
+        with pytest.raises(ValueError, match="Variable cycle: a -> b -> c -> a"):
+            scope.value("a")
+
+    def test_undefined(self):
+        """Test undefined variables are found through the variables referring to them"""
+        scope = VariableScope({"base": "{{scheme}}://{{host}}", "host": "api"})
+
+        assert scope.undefined(["base", "token"]) == {"scheme", "token"}
+        assert scope.value("base") == "{{scheme}}://api"
+
+    def test_set_returns_dependents(self):
+        """Test changing a variable reports the variables depending on it"""
+        scope = VariableScope({"host": "a", "base": "http://{{host}}", "users": "{{base}}/users", "other": "x"})
+        assert scope.value("users") == "http://a/users"
+
+        assert scope.set("host", "b") == {"host", "base", "users"}
+        assert scope.value("users") == "http://b/users"
+
+
+class TestResolver:
+    def test_resolves_url_headers_and_body(self):
+        """Test every templated part of a request is resolved"""
+        resolver = Resolver(VariableScope({"base": "http://api", "token": "abc", "name": "Ada"}))
+        item = request("Create", "{{base}}/users", {"Authorization": "Bearer {{token}}"}, '{"name": "{{name}}"}')
+
+        resolved = resolver.resolve(item)
+
+        assert resolved.url == "http://api/users"
+        assert resolved.headers == [("Authorization", "Bearer abc"), ("Content-Type", "text/plain")]
+        assert resolved.body == '{"name": "Ada"}'
+        assert resolved.undefined == []
+        assert resolver.resolve(item) is resolved
+
+    def test_variable_change_only_touches_dependent_requests(self):
+        """Test a variable change only invalidates the requests that use it, even indirectly"""
+        resolver = Resolver(VariableScope({"host": "a", "base": "http://{{host}}", "token": "t"}))
+        uses_host = request("Users", "{{base}}/users")
+        uses_token = request("Me", "http://fixed/me", {"Authorization": "{{token}}"})
+        first_token = resolver.resolve(uses_token)
+        resolver.resolve(uses_host)
+
+        assert resolver.set_variable("host", "b") == 1
+        assert resolver.resolve(uses_host).url == "http://b/users"
+        assert resolver.resolve(uses_token) is first_token
+
+    def test_undefined_variable_becoming_defined(self):
+        """Test requests using an undefined variable are resolved again once it is defined"""
+        resolver = Resolver(VariableScope({}))
+        item = request("Users", "{{base}}/users")
+        assert resolver.resolve(item).undefined == ["base"]
+
+        resolver.set_variable("base", "http://api", layer="overrides")
+
+        assert resolver.resolve(item).url == "http://api/users"
+
+    def test_keyed_items_are_cached_across_copies(self):
+        """Test copies of an item, e.g. with inlined payloads, share the cache entry of their key"""
+        resolver = Resolver(VariableScope({"base": "http://api"}))
+        item = request("Upload", "{{base}}/upload", body="payload")
+
+        first = resolver.resolve(copy.deepcopy(item), key=(0, 1))
+        second = resolver.resolve(copy.deepcopy(item), key=(0, 1))
+
+        assert second is first
+        assert len(resolver._templates) == 1
+        assert resolver.set_variable("base", "http://other") == 1
+        assert resolver.resolve(copy.deepcopy(item), key=(0, 1)).url == "http://other/upload"
+
+
+class TestResolverRegistry:
+    def test_reuse_and_variable_changes(self):
+        """Test resolvers are reused per revision and updated in place on variable changes"""
+        registry = ResolverRegistry()
+        collection = {"variable": [{"key": "base", "value": "http://a"}], "item": []}
+
+        resolver = registry.get("c.json", 1, collection)
+        assert registry.get("c.json", 1, collection) is resolver
+        assert registry.get("c.json", 1, collection, overrides={"x": "1"}) is not resolver
+
+        registry.variable_changed("c.json", "base", "http://b", old_revision=1, new_revision=2)
+
+        assert registry.get("c.json", 2, collection) is resolver
+        assert resolver.render("{{base}}/x") == "http://b/x"
+        assert registry.get("c.json", 3, collection) is not resolver
+
+
+class TestLoadEnvironmentFile:
+    def test_enabled_values(self, tmp_path):
+        """Test only enabled values are read from a Postman environment"""
+        file_path = tmp_path / "dev.postman_environment.json"
+        file_path.write_text(json.dumps({"name": "dev", "values": [
+            {"key": "base", "value": "http://dev", "enabled": True},
+            {"key": "off", "value": "x", "enabled": False},
+            {"key": "empty", "value": None},
+        ]}))
+
+        assert load_environment_file(str(file_path)) == {"base": "http://dev", "empty": ""}
@@ -0,0 +1,153 @@
+import os
+import re
+import sys
+import time
+import pytest
+from unittest.mock import patch
+
+import code2postman_mcp.utils.watcher as watcher_module
+from code2postman_mcp.tools.handle_files import _iter_tree_lines
+from code2postman_mcp.utils.watcher import TreeWatcher, get_watcher, stop_all_watchers
+
+
+DIR_PATTERNS = [re.compile(r"^__pycache__$")]
+FILE_PATTERNS = [re.compile(r"^.*\.pyc$")]
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a small project tree"""
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "main.py").write_text("a\nb\n")
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "__pycache__" / "main.pyc").write_text("x")
+    (tmp_path / "setup.py").write_text("x\n")
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def cleanup_watchers():
+    yield
+    stop_all_watchers()
+
+
+@pytest.mark.parametrize("use_inotify", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")),
+])
+class TestTreeWatcher:
+    def test_initial_render(self, project, use_inotify):
+        """Test the initial model matches the filtered tree"""
+        watcher = TreeWatcher(str(project), DIR_PATTERNS, FILE_PATTERNS, use_inotify=use_inotify)
+        try:
+            result = watcher.render("root")
+        finally:
+            watcher.stop()
+
+        assert result.splitlines() == [
+            "root/",
+            "    setup.py (1 lines)",
+            "    app/",
+            "        main.py (2 lines)",
+        ]
+
+    def test_render_picks_up_changes(self, project, use_inotify):
+        """Test created, modified and deleted entries are reflected on the next render"""
+        watcher = TreeWatcher(str(project), DIR_PATTERNS, FILE_PATTERNS, use_inotify=use_inotify)
+        try:
+            watcher.render("root")
+            (project / "app" / "main.py").write_text("a\nb\nc\nd\n")
+            (project / "app" / "models").mkdir()
+            (project / "app" / "models" / "user.py").write_text("u\n")
+            os.remove(project / "setup.py")
+            if not use_inotify:
+                watcher._poll()
+            result = watcher.render("root")
+        finally:
+            watcher.stop()
+
+        assert "setup.py" not in result
+        assert "main.py (4 lines)" in result
+        assert "        models/" in result
+        assert "            user.py (1 lines)" in result
+
+    def test_only_changed_directories_are_rescanned(self, project, use_inotify):
+        """Test unchanged files are not recounted"""
+        watcher = TreeWatcher(str(project), DIR_PATTERNS, FILE_PATTERNS, use_inotify=use_inotify)
+        try:
+            watcher.render("root")
+            (project / "app" / "new.py").write_text("n\n")
+            if not use_inotify:
+                watcher._poll()
+            with patch("code2postman_mcp.utils.watcher.count_lines", return_value=1) as mock_count:
+                watcher.render("root")
+        finally:
+            watcher.stop()
+
+        mock_count.assert_called_once_with(str(project / "app" / "new.py"))
+
+
+    @pytest.mark.skipif(not hasattr(os, "symlink") or sys.platform.startswith("win"), reason="needs symlinks")
+    def test_symlinks_to_directories_are_not_followed(self, project, use_inotify):
+        """Test a symlink pointing back up the tree is skipped, like os.walk does"""
+        os.symlink(project, project / "app" / "loop")
+        os.symlink(project / "setup.py", project / "app" / "link.py")
+        watcher = TreeWatcher(str(project), DIR_PATTERNS, FILE_PATTERNS, use_inotify=use_inotify)
+        try:
+            result = watcher.lines("root")
+        finally:
+            watcher.stop()
+
+        expected = list(_iter_tree_lines(str(project), DIR_PATTERNS, FILE_PATTERNS))
+        assert result == ["root/"] + expected[1:]
+        assert "        link.py (1 lines)" in result
+        assert not any("loop" in line for line in result)
+
+
+class TestPollingWatcher:
+    def test_requests_poll_before_serving(self, project):
+        """Test a change is served without waiting for the background poll"""
+        watcher = TreeWatcher(str(project), DIR_PATTERNS, FILE_PATTERNS, use_inotify=False, poll_interval=3600)
+        try:
+            watcher.render("root")
+            (project / "app" / "main.py").write_text("a\nb\nc\n")
+            (project / "app" / "new.py").write_text("n\n")
+            result = watcher.render("root")
+        finally:
+            watcher.stop()
+
+        assert "main.py (3 lines)" in result
+        assert "new.py (1 lines)" in result
+
+
+class TestWatcherRegistry:
+    def test_get_watcher_reuses_live_watcher(self, project):
+        """Test the same root and profile share one watcher"""
+        first = get_watcher(str(project), "python", DIR_PATTERNS, FILE_PATTERNS)
+        second = get_watcher(str(project), "python", DIR_PATTERNS, FILE_PATTERNS)
+        assert first is second
+
+    def test_get_watcher_is_bounded(self, tmp_path):
+        """Test the least recently used watcher is stopped when the limit is reached"""
+        roots = []
+        for i in range(3):
+            root = tmp_path / f"root{i}"
+            root.mkdir()
+            roots.append(str(root))
+
+        with patch.object(watcher_module, "MAX_WATCHERS", 2):
+            first = get_watcher(roots[0], "generic", [], [])
+            get_watcher(roots[1], "generic", [], [])
+            get_watcher(roots[2], "generic", [], [])
+
+        assert not first.alive
+        assert len(watcher_module._watchers) == 2
+
+    def test_idle_watcher_expires(self, project):
+        """Test a watcher stops itself after the idle timeout"""
+        watcher = TreeWatcher(str(project), DIR_PATTERNS, FILE_PATTERNS, use_inotify=False,
+                              poll_interval=0.01, idle_seconds=0.05)
+        deadline = time.monotonic() + 5
+        while watcher.alive and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert not watcher.alive